@@ -1311,9 +1311,13 @@ def _calculate_total_value(portfolio_obj: Portfolio) -> Decimal | None:
     currency_converter = CurrencyConverter()
     total = Decimal("0.00")
 
+    # Fetch all current market prices in one bulk request
+    prices = market_data_fetcher.get_current_prices(
+        list({holding.ticker for holding in portfolio_obj.holdings})
+    )
+
     for holding in portfolio_obj.holdings:
-        # Get current market price
-        current_price = market_data_fetcher.get_current_price(holding.ticker)
+        current_price = prices.get(holding.ticker)
 
         # Fall back to avg purchase price if market data unavailable
         if current_price is None:
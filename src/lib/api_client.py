@@ -5,6 +5,7 @@ import hashlib
 import json
 import logging
 import os
+import random
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional, cast
@@ -29,7 +30,8 @@ class APIClient:
     """Async HTTP client with built-in retry, caching, and rate limit handling.
 
     Features:
-    - Exponential backoff retry (max 3 attempts)
+    - Exponential backoff retry with jitter (max 3 attempts) on timeouts,
+      connection errors and transient 5xx responses
     - Rate limit detection (429 status)
     - Configurable timeout (default 10s)
     - JSON response caching with TTL
@@ -40,6 +42,18 @@ class APIClient:
             data = await client.get("/stocks/AAPL")
     """
 
+    # Connection pool limits and DNS cache lifetime for the HTTP session
+    CONNECTION_LIMIT = 20
+    CONNECTION_LIMIT_PER_HOST = 10
+    DNS_CACHE_TTL_SECONDS = 300
+
+    # Gateway/unavailable responses that usually succeed on a later attempt
+    TRANSIENT_STATUSES = frozenset({502, 503, 504})
+
+    # Upper bound of the random delay added to each backoff, so clients that
+    # failed together do not retry in lockstep
+    RETRY_JITTER_SECONDS = 0.25
+
     def __init__(
         self,
         base_url: Optional[str] = None,
@@ -69,11 +83,31 @@ class APIClient:
 
     async def __aenter__(self) -> "APIClient":
         """Enter async context manager."""
-        self.session = aiohttp.ClientSession()
+        self.open()
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         """Exit async context manager and cleanup session."""
+        await self.close()
+
+    def open(self) -> None:
+        """Open the HTTP session unless one is already open.
+
+        For long-lived clients that keep one connection pool across requests
+        instead of using the context manager per request; pair with close().
+        Must be called from the event loop the requests will run on.
+        """
+        if self.session is None or self.session.closed:
+            # Bounded pool; cached DNS lookups are reused across requests
+            connector = aiohttp.TCPConnector(
+                limit=self.CONNECTION_LIMIT,
+                limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_CACHE_TTL_SECONDS,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self) -> None:
+        """Close the HTTP session if it is open."""
         if self.session and not self.session.closed:
             await self.session.close()
 
@@ -190,12 +224,15 @@ class APIClient:
                 if e.status == 429:
                     # Rate limit - exponential backoff
                     if attempt < self.max_retries - 1:
-                        wait_time = 2**attempt
-                        await asyncio.sleep(wait_time)
+                        await asyncio.sleep(self._backoff_delay(attempt))
                         continue
                     raise RateLimitError(
                         f"Rate limit exceeded after {self.max_retries} attempts"
                     ) from e
+                if e.status in self.TRANSIENT_STATUSES and attempt < self.max_retries - 1:
+                    logger.debug(f"Transient HTTP {e.status} for {endpoint}, retrying")
+                    await asyncio.sleep(self._backoff_delay(attempt))
+                    continue
                 # Other HTTP errors - don't retry
                 raise APIError(f"API request failed: {e.status} {e.message}") from e
 
@@ -203,13 +240,20 @@ class APIClient:
                 last_error = e
                 if attempt < self.max_retries - 1:
                     # Exponential backoff
-                    wait_time = 2**attempt
-                    await asyncio.sleep(wait_time)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
                 raise
 
+            except aiohttp.ClientConnectionError as e:
+                # Connection refused/reset - retry, then report as a network error
+                if attempt < self.max_retries - 1:
+                    logger.debug(f"Connection error for {endpoint} ({e}), retrying")
+                    await asyncio.sleep(self._backoff_delay(attempt))
+                    continue
+                raise APIError(f"Network error: {str(e)}") from e
+
             except aiohttp.ClientError as e:
-                # Network errors - don't retry
+                # Other client errors - don't retry
                 raise APIError(f"Network error: {str(e)}") from e
 
         # Should not reach here, but just in case
@@ -217,6 +261,10 @@ class APIClient:
             raise last_error
         raise APIError("Max retries exceeded")
 
+    def _backoff_delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying after the given (0-based) attempt."""
+        return float(2**attempt) + random.uniform(0, self.RETRY_JITTER_SECONDS)
+
     async def _make_request(
         self,
         endpoint: str,
@@ -260,12 +308,17 @@ class APIClient:
             url, params=params, headers=headers, timeout=timeout_obj
         ) as response:
             response.raise_for_status()
-            data = await response.json()
+            # Decode the raw body directly: json.loads detects UTF-8 from bytes,
+            # skipping aiohttp's charset sniffing and intermediate str copy
+            body = await response.read()
+            data = json.loads(body)
 
             # Log response at DEBUG level
             logger.debug(
-                f"API response: {url} status={response.status} "
-                f"content_length={len(str(data))} bytes"
+                "API response: %s status=%s content_length=%d bytes",
+                url,
+                response.status,
+                len(body),
             )
 
             return cast(Dict[str, Any], data)
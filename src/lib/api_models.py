@@ -1,6 +1,6 @@
 """Pydantic models for API responses."""
 
-from typing import Any, Optional
+from typing import Any, Optional, cast
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -217,6 +217,36 @@ def validate_alpha_vantage_response(data: dict[str, Any]) -> AlphaVantageTimeSer
     return response
 
 
+def validate_alpha_vantage_time_series(data: dict[str, Any]) -> dict[str, dict[str, str]]:
+    """
+    Check an Alpha Vantage TIME_SERIES_DAILY response and return its raw time series.
+
+    Lighter than validate_alpha_vantage_response: only the response shape is
+    checked and no model is built per data point, so callers converting the
+    values themselves do not parse every point twice.
+
+    Args:
+        data: Raw API response
+
+    Returns:
+        Time series mapping date strings to raw data points ("1. open", ...)
+
+    Raises:
+        ValueError: If response contains errors or has no time series
+    """
+    if data.get("Error Message"):
+        raise ValueError(f"Alpha Vantage API error: {data['Error Message']}")
+
+    if data.get("Note"):
+        raise ValueError(f"Alpha Vantage rate limit: {data['Note']}")
+
+    time_series = data.get("Time Series (Daily)")
+    if not isinstance(time_series, dict) or not time_series:
+        raise ValueError("Alpha Vantage response missing time series data")
+
+    return cast(dict[str, dict[str, str]], time_series)
+
+
 def validate_alpha_vantage_overview(data: dict[str, Any]) -> AlphaVantageOverviewResponse:
     """
     Validate Alpha Vantage overview (fundamental) response.
@@ -1,27 +1,54 @@
 """Cache manager for API responses with market-hours aware TTL."""
 
 import json
+import logging
+import math
+import os
+import time
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import Any, Optional, cast
 
 from src.lib.market_hours import get_cache_ttl
 
+logger = logging.getLogger(__name__)
+
 
 class CacheManager:
     """Manages caching of API responses to JSON files.
 
     Features:
     - Market-hours aware TTL (shorter during trading hours)
+    - TTL jitter so entries written together do not all expire together
     - JSON file-based storage
+    - In-process LRU layer in front of the files
     - Automatic expiration and cleanup
     """
 
+    # Maximum number of entries kept in the in-process layer
+    MEMORY_MAX_ENTRIES = 256
+
+    # How long a computed market-hours TTL is reused before rechecking the clock
+    MARKET_TTL_REFRESH_SECONDS = 60
+
+    # Class-level LRU shared across instances:
+    # (cache dir, cache key) -> (data, stored_at as time.monotonic()). Entries
+    # mirror the JSON files, so a hit skips building the path, the disk read and
+    # the JSON parse; returned dicts must not be mutated.
+    _memory: "OrderedDict[tuple[str, str], tuple[dict[str, Any], float]]" = OrderedDict()
+
+    # Market-hours TTL per exchange: exchange -> (ttl_minutes, computed_at monotonic)
+    _market_ttl: dict[str, tuple[int, float]] = {}
+
     def __init__(
         self,
         cache_dir: Optional[Path] = None,
         use_market_hours: bool = True,
         exchange: str = "NYSE",
+        ttl_jitter: float = 0.1,
     ):
         """
         Initialize cache manager.
@@ -30,14 +57,18 @@ class CacheManager:
             cache_dir: Directory for cache files. Defaults to ~/.stocks-helper/cache/
             use_market_hours: Use market-hours aware TTL (default: True)
             exchange: Exchange for market hours (default: NYSE)
+            ttl_jitter: Fraction by which each entry's TTL is shortened or extended
+                (default: 0.1, i.e. ±10%; 0 disables jitter)
         """
         if cache_dir is None:
             cache_dir = Path.home() / ".stocks-helper" / "cache"
 
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_dir_key = str(cache_dir)
         self.use_market_hours = use_market_hours
         self.exchange = exchange
+        self.ttl_jitter = ttl_jitter
 
     def _get_cache_key(self, source: str, ticker: str, date: Optional[str] = None) -> str:
         """
@@ -80,35 +111,209 @@ class CacheManager:
             Cached data dict or None if cache miss/expired
         """
         cache_key = self._get_cache_key(source, ticker, date)
-        cache_path = self._get_cache_path(cache_key)
+        max_age_seconds = self._resolve_ttl(ttl_minutes) * 60 * self._ttl_jitter_factor(cache_key)
+        return self._lookup(cache_key, max_age_seconds)
+
+    def get_many(
+        self, source: str, tickers: list[str], ttl_minutes: Optional[int] = None
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Retrieve valid cached latest entries for several tickers.
+
+        Same expiry rules as get(), but the TTL is resolved once and entries
+        missing from the in-process layer are located with a single directory
+        scan instead of an existence check and stat per ticker.
+
+        Args:
+            source: API source
+            tickers: Stock tickers
+            ttl_minutes: Time-to-live in minutes (default as in get())
+
+        Returns:
+            Dictionary mapping ticker to cached data; misses and expired entries
+            are omitted
+        """
+        ttl_seconds = self._resolve_ttl(ttl_minutes) * 60
+        result: dict[str, dict[str, Any]] = {}
+        # File name -> (ticker, cache key, max age) for entries not held in memory
+        misses: dict[str, tuple[str, str, float]] = {}
+        for ticker in tickers:
+            cache_key = self._get_cache_key(source, ticker)
+            max_age_seconds = ttl_seconds * self._ttl_jitter_factor(cache_key)
+            data = self._lookup_memory(cache_key, max_age_seconds)
+            if data is not None:
+                result[ticker] = data
+            else:
+                misses[f"{cache_key}.json"] = (ticker, cache_key, max_age_seconds)
+
+        if not misses:
+            return result
 
+        with os.scandir(self.cache_dir) as entries:
+            found = [
+                (entry.path, entry.stat().st_mtime) for entry in entries if entry.name in misses
+            ]
+
+        for path, mtime in found:
+            ticker, cache_key, max_age_seconds = misses[os.path.basename(path)]
+            data = self._read_file(cache_key, Path(path), mtime, max_age_seconds)
+            if data is not None:
+                result[ticker] = data
+        return result
+
+    def get_stale(
+        self, source: str, ticker: str, date: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """
+        Retrieve cached data regardless of its age.
+
+        For degraded-mode reads when the upstream API is unavailable: the last
+        stored value is better than nothing, however old.
+
+        Args:
+            source: API source
+            ticker: Stock ticker
+            date: Optional date
+
+        Returns:
+            Cached data dict or None if nothing was ever cached
+        """
+        return self._lookup(self._get_cache_key(source, ticker, date), math.inf)
+
+    def expires_in(
+        self,
+        source: str,
+        ticker: str,
+        date: Optional[str] = None,
+        ttl_minutes: Optional[int] = None,
+    ) -> Optional[float]:
+        """
+        Seconds until get() with the same arguments stops returning the entry.
+
+        Lets callers refresh an entry shortly before it expires instead of
+        waiting for the miss. Only the entry's age is checked; it is not read.
+
+        Args:
+            source: API source
+            ticker: Stock ticker
+            date: Optional date
+            ttl_minutes: Time-to-live in minutes (default as in get())
+
+        Returns:
+            Remaining lifetime in seconds, or None if the entry is missing or expired
+        """
+        cache_key = self._get_cache_key(source, ticker, date)
+        max_age_seconds = self._resolve_ttl(ttl_minutes) * 60 * self._ttl_jitter_factor(cache_key)
+
+        memory_entry = self._memory.get((self._cache_dir_key, cache_key))
+        if memory_entry is not None:
+            age_seconds = time.monotonic() - memory_entry[1]
+        else:
+            try:
+                age_seconds = time.time() - self._get_cache_path(cache_key).stat().st_mtime
+            except OSError:
+                return None
+
+        remaining = max_age_seconds - age_seconds
+        return remaining if remaining > 0 else None
+
+    def _resolve_ttl(self, ttl_minutes: Optional[int]) -> int:
+        """TTL in minutes: the given one, else market-hours aware or 15 minutes."""
+        if ttl_minutes is not None:
+            return ttl_minutes
+        if self.use_market_hours:
+            return self._get_market_ttl_minutes()
+        return 15  # Default 15 minutes
+
+    def _lookup(self, cache_key: str, max_age_seconds: float) -> Optional[dict[str, Any]]:
+        """Return the entry for cache_key if it is at most max_age_seconds old."""
+        # Check the in-process layer first (no path building or disk access)
+        data = self._lookup_memory(cache_key, max_age_seconds)
+        if data is not None:
+            return data
+
+        cache_path = self._get_cache_path(cache_key)
         if not cache_path.exists():
             return None
+        return self._read_file(cache_key, cache_path, cache_path.stat().st_mtime, max_age_seconds)
 
-        # Determine TTL
-        if ttl_minutes is None:
-            if self.use_market_hours:
-                # Use market-hours aware TTL (in seconds, convert to minutes)
-                ttl_seconds = get_cache_ttl(self.exchange)
-                ttl_minutes = ttl_seconds // 60
-            else:
-                ttl_minutes = 15  # Default 15 minutes
+    def _lookup_memory(self, cache_key: str, max_age_seconds: float) -> Optional[dict[str, Any]]:
+        """Return the in-process entry for cache_key if it is fresh enough."""
+        memory_key = (self._cache_dir_key, cache_key)
+        memory_entry = self._memory.get(memory_key)
+        if memory_entry is None:
+            return None
+        memory_data, stored_at = memory_entry
+        if time.monotonic() - stored_at > max_age_seconds:
+            return None
+        self._memory.move_to_end(memory_key)
+        return memory_data
 
+    def _read_file(
+        self, cache_key: str, cache_path: Path, mtime: float, max_age_seconds: float
+    ) -> Optional[dict[str, Any]]:
+        """Read a cache file last modified at mtime unless it is expired."""
         # Check if cache is expired
-        file_mtime = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        if datetime.now() - file_mtime > timedelta(minutes=ttl_minutes):
+        age_seconds = time.time() - mtime
+        if age_seconds > max_age_seconds:
             return None
 
         # Read and return cached data
         try:
             with open(cache_path, "r") as f:
-                data = json.load(f)
-            return cast(dict[str, Any], data)
+                data = cast(dict[str, Any], json.load(f))
         except (json.JSONDecodeError, IOError):
             # Invalid cache file, remove it
             cache_path.unlink(missing_ok=True)
             return None
 
+        # Remember with the file's age so the entry expires when the file would
+        self._remember((self._cache_dir_key, cache_key), data, time.monotonic() - age_seconds)
+        return data
+
+    def _ttl_jitter_factor(self, cache_key: str) -> float:
+        """TTL multiplier for an entry, within 1 ± ttl_jitter.
+
+        Jitter spreads the expiry of entries cached in the same burst (e.g. one
+        batch update), so they are not all refetched at the same moment. The
+        offset is derived from the cache key rather than drawn per lookup, so
+        each entry expires once instead of flickering between hit and miss
+        near its TTL.
+        """
+        if not self.ttl_jitter:
+            return 1.0
+        # Map the key's CRC32 onto [-1, 1]
+        spread = zlib.crc32(cache_key.encode()) / 0xFFFFFFFF * 2 - 1
+        return 1 + spread * self.ttl_jitter
+
+    def _get_market_ttl_minutes(self) -> int:
+        """Market-hours aware TTL in minutes, recomputed at most once a minute."""
+        now = time.monotonic()
+        cached = self._market_ttl.get(self.exchange)
+        if cached is not None and now - cached[1] < self.MARKET_TTL_REFRESH_SECONDS:
+            return cached[0]
+
+        # get_cache_ttl returns seconds; convert to minutes
+        ttl_minutes = get_cache_ttl(self.exchange) // 60
+        self._market_ttl[self.exchange] = (ttl_minutes, now)
+        return ttl_minutes
+
+    def _remember(
+        self, memory_key: tuple[str, str], data: dict[str, Any], stored_at: float
+    ) -> None:
+        """Store an entry in the in-process layer, evicting the least recently used."""
+        self._memory[memory_key] = (data, stored_at)
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > self.MEMORY_MAX_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def _forget(self, pattern: str = "*.json") -> None:
+        """Drop in-process entries of this cache directory matching a file name pattern."""
+        for memory_key in list(self._memory):
+            cache_dir_key, cache_key = memory_key
+            if cache_dir_key == self._cache_dir_key and fnmatchcase(f"{cache_key}.json", pattern):
+                del self._memory[memory_key]
+
     def set(
         self, source: str, ticker: str, data: dict[str, Any], date: Optional[str] = None
     ) -> None:
@@ -124,12 +329,19 @@ class CacheManager:
         cache_key = self._get_cache_key(source, ticker, date)
         cache_path = self._get_cache_path(cache_key)
 
+        self._remember((self._cache_dir_key, cache_key), data, time.monotonic())
+
+        # Write to a temporary file and rename it into place, so other processes
+        # sharing the cache directory never read (and discard) a half-written file
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
         try:
-            with open(cache_path, "w") as f:
+            with open(tmp_path, "w") as f:
                 json.dump(data, f, indent=2)
+            os.replace(tmp_path, cache_path)
         except IOError as e:
+            tmp_path.unlink(missing_ok=True)
             # Log error but don't fail if cache write fails
-            print(f"Warning: Failed to write cache: {e}")
+            logger.warning("Failed to write cache %s: %s", cache_key, e)
 
     def cleanup(self, max_age_days: int = 7) -> None:
         """
@@ -143,10 +355,12 @@ class CacheManager:
         for cache_file in self.cache_dir.glob("*.json"):
             file_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
             if file_mtime < cutoff_time:
+                self._forget(cache_file.name)
                 cache_file.unlink(missing_ok=True)
 
     def clear(self) -> None:
         """Clear all cache files."""
+        self._forget()
         for cache_file in self.cache_dir.glob("*.json"):
             cache_file.unlink(missing_ok=True)
 
@@ -158,5 +372,6 @@ class CacheManager:
             ticker: Stock ticker to clear
         """
         pattern = f"*_{ticker}_*.json"
+        self._forget(pattern)
         for cache_file in self.cache_dir.glob(pattern):
             cache_file.unlink(missing_ok=True)
@@ -1,11 +1,20 @@
 """API quota tracker to monitor and enforce rate limits."""
 
+import asyncio
 import json
 import logging
+import os
+import sys
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
+if sys.platform != "win32":
+    import fcntl
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,6 +22,11 @@ class QuotaTracker:
     """Track API request quotas to prevent exceeding limits.
 
     Supports daily and per-minute quota tracking with persistence.
+
+    The storage file is shared by every process using the same API name.
+    Recording a request takes an exclusive lock on it and adopts the daily count
+    other processes stored, so parallel batch updates together stay within the
+    daily limit (the lock is skipped on Windows).
     """
 
     def __init__(
@@ -36,6 +50,11 @@ class QuotaTracker:
         self.storage_dir = storage_dir or (Path.home() / ".stocks-helper" / "quota")
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.storage_file = self.storage_dir / f"{api_name}_quota.json"
+        self.lock_file = self.storage_dir / f"{api_name}_quota.lock"
+        self._lock_depth = 0
+
+        # Timestamps of requests within the last minute, oldest first
+        self.minute_requests: deque[datetime] = deque()
 
         # Load existing quota data
         self._load_quota_data()
@@ -52,9 +71,10 @@ class QuotaTracker:
 
             self.current_date = date.fromisoformat(data.get("date", str(date.today())))
             self.daily_count = data.get("daily_count", 0)
-            self.minute_requests = [
-                datetime.fromisoformat(ts) for ts in data.get("minute_requests", [])
-            ]
+            # Oldest first, so expired timestamps are popped from the left
+            self.minute_requests = deque(
+                sorted(datetime.fromisoformat(ts) for ts in data.get("minute_requests", []))
+            )
 
             # Reset if it's a new day
             if self.current_date < date.today():
@@ -64,13 +84,67 @@ class QuotaTracker:
             logger.warning(f"Failed to load quota data for {self.api_name}: {e}")
             self._reset_quota()
 
+    @contextmanager
+    def _storage_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the quota storage across processes (reentrant)."""
+        if sys.platform == "win32" or self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        with open(self.lock_file, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _sync_daily_count(self) -> None:
+        """Adopt today's requests recorded by other processes since the last save.
+
+        Must be called with the storage lock held.
+        """
+        # Check if it's a new day
+        if self.current_date < date.today():
+            self._reset_quota()
+
+        try:
+            with open(self.storage_file) as f:
+                data = json.load(f)
+            stored_date = date.fromisoformat(data["date"])
+            stored_count = int(data["daily_count"])
+        except (OSError, json.JSONDecodeError, ValueError, KeyError, TypeError):
+            return
+
+        if stored_date == self.current_date:
+            self.daily_count = max(self.daily_count, stored_count)
+
     def _reset_quota(self) -> None:
         """Reset quota counters for new day."""
         self.current_date = date.today()
         self.daily_count = 0
-        self.minute_requests = []
+        self.minute_requests = deque()
         self._save_quota_data()
 
+    def _prune_minute_requests(self) -> int:
+        """Drop requests older than 60 seconds and return how many remain.
+
+        Timestamps are kept in order, so expired ones are popped from the left
+        instead of rebuilding the whole list on every check.
+
+        Returns:
+            Number of requests made within the last minute
+        """
+        cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=60)
+        while self.minute_requests and self.minute_requests[0] <= cutoff_time:
+            self.minute_requests.popleft()
+        return len(self.minute_requests)
+
     def _save_quota_data(self) -> None:
         """Save quota data to storage file."""
         try:
@@ -79,8 +153,12 @@ class QuotaTracker:
                 "daily_count": self.daily_count,
                 "minute_requests": [ts.isoformat() for ts in self.minute_requests],
             }
-            with open(self.storage_file, "w") as f:
+            # Write to a temporary file and rename it into place, so other
+            # processes never read a half-written file
+            tmp_file = self.storage_file.with_name(f".{self.storage_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
                 json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.storage_file)
         except (OSError, TypeError) as e:
             logger.error(f"Failed to save quota data for {self.api_name}: {e}")
 
@@ -104,30 +182,89 @@ class QuotaTracker:
         # Check per-minute limit if configured
         if self.per_minute_limit is not None:
             # Clean up old minute requests (older than 60 seconds)
-            cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=60)
-            self.minute_requests = [ts for ts in self.minute_requests if ts > cutoff_time]
+            minute_count = self._prune_minute_requests()
 
-            if len(self.minute_requests) >= self.per_minute_limit:
+            if minute_count >= self.per_minute_limit:
                 logger.warning(
                     f"{self.api_name} per-minute quota exceeded: "
-                    f"{len(self.minute_requests)}/{self.per_minute_limit}"
+                    f"{minute_count}/{self.per_minute_limit}"
                 )
                 return False
 
         return True
 
-    def record_request(self) -> None:
-        """Record that a request was made."""
+    async def acquire(self) -> bool:
+        """Wait until a request fits the quota, then record it.
+
+        Only waits while the per-minute window is full; an exhausted daily quota
+        returns immediately. The request is recorded before returning, so
+        concurrent callers cannot all pass the check before any of them records.
+
+        Returns:
+            True once the request is recorded, False if the daily quota is exceeded
+        """
+        while True:
+            # Check and record under one lock, so other processes cannot take
+            # the last daily slot in between
+            with self._storage_lock():
+                self._sync_daily_count()
+
+                if self.daily_count >= self.daily_limit:
+                    logger.warning(
+                        f"{self.api_name} daily quota exceeded: "
+                        f"{self.daily_count}/{self.daily_limit}"
+                    )
+                    return False
+
+                wait_seconds = self._seconds_until_minute_slot()
+                if wait_seconds <= 0:
+                    self.record_request()
+                    return True
+
+            logger.debug(f"{self.api_name} per-minute quota full, waiting {wait_seconds:.1f}s")
+            await asyncio.sleep(wait_seconds)
+
+    def retry_after_seconds(self) -> float:
+        """Seconds until the quota allows another request (0 if it does now).
+
+        An exhausted daily quota frees up at local midnight, when the count resets.
+
+        Returns:
+            Wait in seconds before a request fits both limits
+        """
         # Check if it's a new day
         if self.current_date < date.today():
             self._reset_quota()
 
-        self.daily_count += 1
+        if self.daily_count >= self.daily_limit:
+            midnight = datetime.combine(self.current_date + timedelta(days=1), datetime.min.time())
+            return max((midnight - datetime.now()).total_seconds(), 0.0)
+
+        return max(self._seconds_until_minute_slot(), 0.0)
 
-        if self.per_minute_limit is not None:
-            self.minute_requests.append(datetime.now(timezone.utc))
+    def _seconds_until_minute_slot(self) -> float:
+        """Seconds until the per-minute window has room for another request."""
+        if self.per_minute_limit is None:
+            return 0.0
 
-        self._save_quota_data()
+        minute_count = self._prune_minute_requests()
+        if minute_count < self.per_minute_limit:
+            return 0.0
+
+        # A slot opens when enough of the oldest requests have left the window
+        leaving = self.minute_requests[minute_count - self.per_minute_limit]
+        return (leaving + timedelta(seconds=60) - datetime.now(timezone.utc)).total_seconds()
+
+    def record_request(self) -> None:
+        """Record that a request was made."""
+        with self._storage_lock():
+            self._sync_daily_count()
+            self.daily_count += 1
+
+            if self.per_minute_limit is not None:
+                self.minute_requests.append(datetime.now(timezone.utc))
+
+            self._save_quota_data()
 
         logger.debug(
             f"{self.api_name} request recorded: {self.daily_count}/{self.daily_limit} daily"
@@ -153,13 +290,12 @@ class QuotaTracker:
 
         if self.per_minute_limit is not None:
             # Clean up old minute requests
-            cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=60)
-            active_minute_requests = [ts for ts in self.minute_requests if ts > cutoff_time]
+            minute_count = self._prune_minute_requests()
             result.update(
                 {
-                    "per_minute_used": len(active_minute_requests),
+                    "per_minute_used": minute_count,
                     "per_minute_limit": self.per_minute_limit,
-                    "per_minute_remaining": self.per_minute_limit - len(active_minute_requests),
+                    "per_minute_remaining": self.per_minute_limit - minute_count,
                 }
             )
 
@@ -0,0 +1,67 @@
+"""Async token bucket rate limiter for outbound API requests."""
+
+import asyncio
+import time
+from typing import Any
+
+
+class TokenBucket:
+    """Token bucket limiting how often an async operation may start.
+
+    The bucket holds up to max_tokens tokens and refills continuously so that a
+    full bucket's worth of tokens is restored every refill_interval seconds.
+    Each acquire() takes one token, waiting for the refill when the bucket is
+    empty. Bursts up to max_tokens proceed immediately.
+
+    Example:
+        limiter = TokenBucket(max_tokens=5, refill_interval=60)
+        async with limiter:
+            data = await client.get(url)
+    """
+
+    def __init__(self, max_tokens: int, refill_interval: float):
+        """Initialize token bucket.
+
+        Args:
+            max_tokens: Bucket capacity (maximum burst size)
+            refill_interval: Seconds needed to refill an empty bucket completely
+
+        Raises:
+            ValueError: If max_tokens or refill_interval is not positive
+        """
+        if max_tokens <= 0:
+            raise ValueError(f"max_tokens must be positive, got {max_tokens}")
+        if refill_interval <= 0:
+            raise ValueError(f"refill_interval must be positive, got {refill_interval}")
+
+        self.max_tokens = max_tokens
+        self.refill_interval = refill_interval
+        self._refill_rate = max_tokens / refill_interval  # Tokens per second
+        self._tokens = float(max_tokens)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill, capped at capacity."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(float(self.max_tokens), self._tokens + elapsed * self._refill_rate)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """Take one token, waiting until one is available."""
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._refill_rate)
+                self._refill()
+            self._tokens = max(self._tokens - 1, 0.0)
+
+    async def __aenter__(self) -> "TokenBucket":
+        """Acquire a token on entering the context."""
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Tokens are not returned; nothing to release."""
@@ -18,6 +18,7 @@ from src.models.insight import Insight, InsightType
 from src.models.journal import JournalEntry, JournalEntryStatus, JournalEntryType, JournalLine
 from src.models.market_data import MarketData
 from src.models.portfolio import Portfolio
+from src.models.position_summary import PositionSummary
 from src.models.recommendation import (
     ConfidenceLevel,
     RecommendationType,
@@ -63,6 +64,7 @@ __all__ = [
     "Reconciliation",
     "SecurityLot",
     "SecurityAllocation",
+    "PositionSummary",
     # Enums
     "SecurityType",
     "TransactionType",
@@ -177,6 +177,12 @@ class JournalEntry(Base):  # type: ignore[misc,valid-type]
             "portfolio_id",
             "status",
         ),
+        # Index for next entry number lookup (MAX per portfolio)
+        Index(
+            "idx_journal_entries_number",
+            "portfolio_id",
+            "entry_number",
+        ),
     )
 
     def __repr__(self) -> str:
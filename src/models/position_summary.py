@@ -0,0 +1,164 @@
+"""
+Position summary model: materialized open-lot aggregates per holding.
+
+Mark-to-market needs, for every open position, the remaining quantity and its
+cost basis in both base and security currency. Instead of aggregating all open
+security lots on every valuation run, these totals are kept in one row per
+holding and refreshed whenever the holding's lots change.
+
+The after_flush listener lives here rather than in a service, so summaries stay
+current in every process that loads the models, whichever code changes the lots.
+"""
+
+from collections.abc import Collection
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import chain
+
+from sqlalchemy import (
+    TIMESTAMP,
+    Connection,
+    ForeignKey,
+    Numeric,
+    String,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.orm import Mapped, Session, UOWTransaction, mapped_column
+
+from src.lib.db import Base
+from src.models.holding import Holding
+from src.models.security_lot import SecurityLot
+
+
+class PositionSummary(Base):  # type: ignore[misc,valid-type]
+    """
+    Aggregated open-lot totals for a holding.
+
+    Rows exist only for holdings with open lots and are rebuilt after every
+    flush that touches SecurityLot rows (and by lot_tracking_service after bulk
+    split adjustments), so they are never edited directly.
+
+    Attributes:
+        holding_id: Holding the totals belong to (primary key)
+        portfolio_id: Portfolio of the holding (denormalized for lookups)
+        security_ticker: Ticker or ISIN of the held security
+        total_quantity: Sum of remaining_quantity over open lots
+        cost_basis_base: Sum of remaining_quantity * cost_per_share_base
+        cost_basis_local: Sum of remaining_quantity * cost_per_share
+        updated_at: When the totals were last refreshed
+    """
+
+    __tablename__ = "position_summaries"
+
+    holding_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("holdings.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    portfolio_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("portfolios.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    security_ticker: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+    )
+
+    total_quantity: Mapped[Decimal] = mapped_column(
+        Numeric(20, 8),
+        nullable=False,
+    )
+
+    cost_basis_base: Mapped[Decimal] = mapped_column(
+        Numeric(20, 8),
+        nullable=False,
+    )
+
+    cost_basis_local: Mapped[Decimal] = mapped_column(
+        Numeric(20, 8),
+        nullable=False,
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of position summary."""
+        return (
+            f"<PositionSummary(holding_id={self.holding_id!r}, "
+            f"ticker={self.security_ticker!r}, quantity={self.total_quantity})>"
+        )
+
+
+def rebuild_position_summaries(connection: Connection, holding_ids: Collection[str]) -> None:
+    """Replace PositionSummary rows for holdings with freshly aggregated open lots.
+
+    Args:
+        connection: Connection of the session whose lots were changed
+        holding_ids: Holding IDs whose rows should be rebuilt
+    """
+    if not holding_ids:
+        return
+
+    ids = list(holding_ids)
+    summary = PositionSummary.__table__
+    connection.execute(delete(summary).where(summary.c.holding_id.in_(ids)))
+
+    aggregate = (
+        select(
+            SecurityLot.holding_id,
+            Holding.portfolio_id,
+            func.min(SecurityLot.security_ticker),
+            func.sum(SecurityLot.remaining_quantity),
+            func.sum(SecurityLot.remaining_quantity * SecurityLot.cost_per_share_base),
+            func.sum(SecurityLot.remaining_quantity * SecurityLot.cost_per_share),
+            literal(datetime.now(timezone.utc), TIMESTAMP),
+        )
+        .join(Holding, SecurityLot.holding_id == Holding.id)
+        .where(
+            SecurityLot.holding_id.in_(ids),
+            SecurityLot.is_closed == False,  # noqa: E712
+            SecurityLot.remaining_quantity > 0,
+        )
+        .group_by(SecurityLot.holding_id, Holding.portfolio_id)
+    )
+    connection.execute(
+        insert(summary).from_select(
+            [
+                "holding_id",
+                "portfolio_id",
+                "security_ticker",
+                "total_quantity",
+                "cost_basis_base",
+                "cost_basis_local",
+                "updated_at",
+            ],
+            aggregate,
+        )
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _rebuild_position_summaries_after_flush(
+    session: Session, flush_context: UOWTransaction
+) -> None:
+    """Keep position summaries in step with lots written by this flush."""
+    holding_ids = {
+        obj.holding_id
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, SecurityLot)
+    }
+    if holding_ids:
+        rebuild_position_summaries(session.connection(), holding_ids)
@@ -8,7 +8,7 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 from uuid import uuid4
 
-from sqlalchemy import ForeignKey, Numeric, String
+from sqlalchemy import ForeignKey, Index, Numeric, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.lib.db import Base
@@ -162,6 +162,28 @@ class SecurityLot(Base):  # type: ignore[misc,valid-type]
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        # Partial index for FIFO allocation: open lots of a holding in purchase order
+        Index(
+            "ix_security_lots_fifo",
+            "holding_id",
+            "purchase_date",
+            "created_at",
+            sqlite_where=text("is_closed = 0"),
+        ),
+        # Covering partial index for the mark-to-market aggregation over open lots
+        # (SQLite has no INCLUDE, so the summed columns are trailing key columns)
+        Index(
+            "ix_security_lots_open_cost",
+            "holding_id",
+            "security_ticker",
+            "remaining_quantity",
+            "cost_per_share",
+            "cost_per_share_base",
+            sqlite_where=text("is_closed = 0"),
+        ),
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return (
@@ -4,10 +4,11 @@ Handles recording transactions as journal entries following GAAP principles.
 """
 
 import asyncio
+from collections.abc import Sequence
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, case, func, select
 from sqlalchemy.orm import Session
 
 from src.models import (
@@ -246,7 +247,9 @@ def initialize_chart_of_accounts(session: Session, portfolio_id: str) -> dict[st
 def get_next_entry_number(session: Session, portfolio_id: str) -> int:
     """Get the next sequential entry number for a portfolio.
 
-    Uses SELECT FOR UPDATE to prevent race conditions in concurrent transactions.
+    Computes MAX(entry_number) in the database, answered from the
+    (portfolio_id, entry_number) index. Concurrent writers are serialized by
+    SQLite's database-level write lock, so no row lock is needed.
 
     Args:
         session: Database session
@@ -255,12 +258,8 @@ def get_next_entry_number(session: Session, portfolio_id: str) -> int:
     Returns:
         Next entry number (starting from 1)
     """
-    stmt = (
-        select(JournalEntry.entry_number)
-        .where(JournalEntry.portfolio_id == portfolio_id)
-        .order_by(JournalEntry.entry_number.desc())
-        .limit(1)
-        .with_for_update()  # Lock row to prevent concurrent number conflicts
+    stmt = select(func.max(JournalEntry.entry_number)).where(
+        JournalEntry.portfolio_id == portfolio_id
     )
 
     result = session.execute(stmt).scalar()
@@ -1424,6 +1423,93 @@ def get_account_balance(
         return total_credits - total_debits
 
 
+def get_account_balances(
+    session: Session,
+    account_ids: Sequence[str],
+    as_of_date: date | None = None,
+) -> dict[str, Decimal]:
+    """Calculate balances for several accounts with one aggregate query.
+
+    Equivalent to calling get_account_balance for each account, but debits and
+    credits are summed in SQL grouped by account.
+
+    Args:
+        session: Database session
+        account_ids: ChartAccount IDs
+        as_of_date: Date to calculate balances (defaults to today)
+
+    Returns:
+        Dictionary mapping account ID to balance (positive for normal balance side)
+
+    Raises:
+        ValueError: If any account is not found
+    """
+    if as_of_date is None:
+        as_of_date = date.today()
+
+    account_ids = list(dict.fromkeys(account_ids))
+    if not account_ids:
+        return {}
+
+    # Get accounts to determine normal balance
+    accounts = {
+        account.id: account
+        for account in session.execute(
+            select(ChartAccount).where(ChartAccount.id.in_(account_ids))
+        ).scalars()
+    }
+    for account_id in account_ids:
+        if account_id not in accounts:
+            raise ValueError(f"Account {account_id} not found")
+
+    # Sum journal lines for all accounts up to date
+    stmt = (
+        select(
+            JournalLine.account_id,
+            func.sum(JournalLine.debit_amount),
+            func.sum(JournalLine.credit_amount),
+        )
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .where(
+            JournalLine.account_id.in_(account_ids),
+            JournalEntry.status == JournalEntryStatus.POSTED,
+            JournalEntry.entry_date <= as_of_date,
+        )
+        .group_by(JournalLine.account_id)
+    )
+    totals = {
+        account_id: (total_debits, total_credits)
+        for account_id, total_debits, total_credits in session.execute(stmt).tuples()
+    }
+
+    balances: dict[str, Decimal] = {}
+    for account_id in account_ids:
+        total_debits, total_credits = totals.get(account_id, (Decimal("0"), Decimal("0")))
+
+        # Return based on normal balance side
+        if accounts[account_id].normal_balance == "DEBIT":
+            balances[account_id] = total_debits - total_credits
+        else:
+            balances[account_id] = total_credits - total_debits
+
+    return balances
+
+
+def signed_foreign_amount() -> ColumnElement[Decimal]:
+    """SQL expression for a journal line's signed foreign currency amount.
+
+    Debit lines add their foreign_amount to the currency position and credit
+    lines subtract it, matching get_cash_balances_by_currency.
+
+    Returns:
+        Column expression usable inside SUM()
+    """
+    return case(
+        (JournalLine.debit_amount > 0, JournalLine.foreign_amount),
+        else_=-JournalLine.foreign_amount,
+    )
+
+
 def get_cash_balances_by_currency(
     session: Session,
     account_id: str,
@@ -1451,9 +1537,10 @@ def get_cash_balances_by_currency(
     if not account:
         raise ValueError(f"Account {account_id} not found")
 
-    # Query all journal lines for this account up to date
+    # Sum foreign_amount per currency for this account up to date:
+    # debits add to the currency position, credits subtract from it
     stmt = (
-        select(JournalLine)
+        select(JournalLine.foreign_currency, func.sum(signed_foreign_amount()))
         .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
         .where(
             JournalLine.account_id == account_id,
@@ -1462,26 +1549,11 @@ def get_cash_balances_by_currency(
             JournalLine.foreign_currency.isnot(None),
             JournalLine.foreign_amount.isnot(None),
         )
+        .group_by(JournalLine.foreign_currency)
     )
-
-    lines = session.execute(stmt).scalars().all()
-
-    # Group by currency and sum foreign_amount
-    balances: dict[str, Decimal] = {}
-    for line in lines:
-        currency = line.foreign_currency
-        if currency is None:
-            continue  # Skip lines without foreign currency
-
-        if currency not in balances:
-            balances[currency] = Decimal("0")
-
-        # Add/subtract based on debit/credit
-        foreign_amount = line.foreign_amount or Decimal("0")
-        if line.debit_amount > 0:
-            balances[currency] += foreign_amount
-        else:
-            balances[currency] -= foreign_amount
+    balances: dict[str, Decimal] = {
+        currency: balance for currency, balance in session.execute(stmt).tuples() if currency
+    }
 
     # Filter out currencies with zero balance
     return {curr: bal for curr, bal in balances.items() if abs(bal) >= Decimal("0.01")}
@@ -111,6 +111,9 @@ class BatchProcessor:
                 # Rate limiting delay
                 await asyncio.sleep(1)
 
+            # Release the market data API connections kept open across tickers
+            await self.market_data_fetcher.aclose()
+
             # 2. Fetch fundamental data
             logger.info("\n📈 Fetching fundamental data...")
             fundamental_success = 0
@@ -151,8 +154,13 @@ class BatchProcessor:
             logger.info("\n🎯 Generating recommendations...")
             recommendations_generated = 0
 
+            # Stored together in one transaction
+            recommendations = await self.recommendation_engine.generate_recommendations(
+                tickers, portfolio_id
+            )
+
             for ticker in tickers:
-                rec = await self.recommendation_engine.generate_recommendation(ticker, portfolio_id)
+                rec = recommendations.get(ticker)
                 if rec:
                     logger.info(
                         f"  ✓ {ticker}: {rec.recommendation.value} "
@@ -1,10 +1,13 @@
 """Currency converter service with Yahoo Finance integration."""
 
 import logging
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Optional
 
+import yfinance as yf
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from src.lib.db import db_session
 from src.models.exchange_rate import ExchangeRate
 
@@ -36,10 +39,6 @@ class CurrencyConverter:
             Exchange rate or None if unavailable
         """
         try:
-            from datetime import timedelta
-
-            import yfinance as yf
-
             # Construct forex pair symbol
             forex_symbol = f"{from_currency}{to_currency}=X"
             ticker = yf.Ticker(forex_symbol)
@@ -63,9 +62,10 @@ class CurrencyConverter:
             hist = ticker.history(start=start_date, end=end_date)
 
             if not hist.empty and "Close" in hist.columns:
-                # Try to find rate for exact date
-                if rate_date in hist.index.date:
-                    rate = float(hist.loc[hist.index.date == rate_date, "Close"].iloc[0])
+                # Try to find rate for exact date (one vectorized date comparison)
+                exact = hist["Close"][hist.index.date == rate_date]
+                if not exact.empty:
+                    rate = float(exact.iloc[0])
                     logger.info(f"Yahoo Finance forex {forex_symbol} on {rate_date}: {rate}")
                     return rate
                 # Fallback: use closest available date
@@ -81,9 +81,6 @@ class CurrencyConverter:
             logger.warning(f"No forex data available for {forex_symbol} on {rate_date}")
             return None
 
-        except ImportError:
-            logger.error("yfinance not installed. Install with: pip install yfinance")
-            return None
         except Exception as e:
             logger.warning(
                 f"Yahoo Finance forex error for {from_currency}/{to_currency} on {rate_date}: {e}"
@@ -210,27 +207,22 @@ class CurrencyConverter:
         """
         try:
             with db_session() as session:
-                # Check if already exists
-                existing = (
-                    session.query(ExchangeRate)
-                    .filter(
-                        ExchangeRate.from_currency == from_currency,
-                        ExchangeRate.to_currency == to_currency,
-                        ExchangeRate.date == rate_date,
-                    )
-                    .first()
+                # Insert or overwrite in one statement instead of looking the row up first
+                stmt = sqlite_insert(ExchangeRate).values(
+                    from_currency=from_currency,
+                    to_currency=to_currency,
+                    date=rate_date,
+                    rate=Decimal(str(rate)),
                 )
-
-                if existing:
-                    existing.rate = Decimal(str(rate))
-                else:
-                    rate_entry = ExchangeRate(
-                        from_currency=from_currency,
-                        to_currency=to_currency,
-                        date=rate_date,
-                        rate=rate,
-                    )
-                    session.add(rate_entry)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[
+                        ExchangeRate.from_currency,
+                        ExchangeRate.to_currency,
+                        ExchangeRate.date,
+                    ],
+                    set_={"rate": stmt.excluded.rate},
+                )
+                session.execute(stmt)
 
         except Exception as e:
             # Database cache failures are non-fatal (rate is still cached in memory)
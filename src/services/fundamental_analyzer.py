@@ -12,6 +12,7 @@ from src.lib.api_client import APIClient
 from src.lib.api_models import AlphaVantageOverviewResponse, validate_alpha_vantage_overview
 from src.lib.db import db_session
 from src.models.fundamental_data import FundamentalData
+from src.models.security import Security
 
 logger = logging.getLogger(__name__)
 
@@ -165,16 +166,21 @@ class FundamentalAnalyzer:
             ticker: Stock ticker
 
         Returns:
-            FundamentalData object or None
+            FundamentalData object (detached from the session) or None
         """
         with db_session() as session:
             fundamentals = (
                 session.query(FundamentalData)
-                .filter(FundamentalData.ticker == ticker)
+                .join(Security, FundamentalData.security_id == Security.id)
+                .filter(Security.ticker == ticker)
                 .order_by(FundamentalData.timestamp.desc())
                 .first()
             )
 
+            # Keep loaded attributes readable after the session commits and closes
+            if fundamentals is not None:
+                session.expunge(fundamentals)
+
             return fundamentals
 
     def analyze_valuation(self, fundamentals: FundamentalData) -> dict[str, Any]:
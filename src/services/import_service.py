@@ -17,7 +17,7 @@ from uuid import uuid4
 
 import requests
 import yfinance as yf
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import StaleDataError
 
@@ -1740,29 +1740,39 @@ class ImportService:
         if not holdings:
             return
 
-        updated_count = 0
-
-        for holding in holdings:
-            # Get all open lots for this holding
-            lots_stmt = select(SecurityLot).where(
-                SecurityLot.holding_id == holding.id,
+        # Sum open lots (already split-adjusted) per holding in one query:
+        # total quantity and total cost basis
+        totals_stmt = (
+            select(
+                SecurityLot.holding_id,
+                func.sum(SecurityLot.remaining_quantity),
+                func.sum(SecurityLot.remaining_quantity * SecurityLot.cost_per_share_base),
+            )
+            .where(
+                SecurityLot.holding_id.in_([holding.id for holding in holdings]),
                 SecurityLot.is_closed == False,  # noqa: E712
                 SecurityLot.remaining_quantity > 0,
             )
-            lots = session.execute(lots_stmt).scalars().all()
+            .group_by(SecurityLot.holding_id)
+        )
+        lot_totals = {
+            holding_id: (total_quantity, total_cost)
+            for holding_id, total_quantity, total_cost in session.execute(totals_stmt).tuples()
+        }
 
-            if not lots:
+        updated_count = 0
+
+        for holding in holdings:
+            if holding.id not in lot_totals:
                 # No open lots - holding should be zero
                 if holding.quantity != Decimal("0"):
                     holding.quantity = Decimal("0")
                     updated_count += 1
                 continue
 
-            # Calculate total quantity from lots (already split-adjusted)
-            total_quantity = sum(lot.remaining_quantity for lot in lots)
+            total_quantity, total_cost = lot_totals[holding.id]
 
             # Calculate weighted average cost basis
-            total_cost = sum(lot.remaining_quantity * lot.cost_per_share_base for lot in lots)
             avg_price = (
                 Decimal(str(total_cost / total_quantity)) if total_quantity > 0 else Decimal("0")
             )
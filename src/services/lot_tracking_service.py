@@ -6,29 +6,95 @@ Implements:
 - Mark-to-market adjustments for securities and foreign currency
 """
 
+import asyncio
+from collections.abc import Collection, Iterable, Mapping, Sequence
 from datetime import date
 from decimal import Decimal
+from typing import cast
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Connection, event, exists, func, select, update
+from sqlalchemy.orm import Mapper, Session, SessionTransaction, object_session
 
 from src.models import (
+    Account,
     ChartAccount,
+    CurrencyLot,
     Holding,
     JournalEntry,
     JournalEntryStatus,
     JournalEntryType,
     JournalLine,
+    MarketData,
     Portfolio,
+    PositionSummary,
     Security,
     SecurityAllocation,
     SecurityLot,
     StockSplit,
     Transaction,
 )
+from src.models.position_summary import rebuild_position_summaries
+from src.services.accounting_service import (
+    get_account_balances,
+    get_next_entry_number,
+    signed_foreign_amount,
+)
 from src.services.currency_converter import CurrencyConverter
 from src.services.market_data_fetcher import MarketDataFetcher
 
+ZERO = Decimal("0")
+QUANTITY_EPSILON = Decimal("0.00000001")  # Remaining quantity treated as fully sold
+ADJUSTMENT_THRESHOLD = Decimal("0.01")  # Smallest mark-to-market adjustment worth posting
+BALANCING_TOLERANCE = Decimal("0.25")  # Max rounding imbalance absorbed into FV adjustment
+
+# Description identifying cash FX revaluations (shares the GL account with securities FX)
+CASH_FX_ENTRY_DESCRIPTION = "Mark foreign currency cash to market (IAS 21)"
+
+# Chart account names mapped to the keys used by mark-to-market
+CHART_ACCOUNT_KEYS = {
+    "Cash": "cash",
+    "Bank Accounts": "bank",
+    "Currency Exchange Clearing": "currency_clearing",
+    "Investments - Securities": "investments",
+    "Fair Value Adjustment - Investments": "fair_value_adjustment",
+    "Owner's Capital": "capital",
+    "Retained Earnings": "retained_earnings",
+    "Dividend Income": "dividend_income",
+    "Interest Income": "interest_income",
+    "Realized Capital Gains": "realized_gains",
+    "Unrealized Gain/Loss on Investments": "unrealized_investment_gl",
+    "Fees and Commissions": "fees",
+    "Tax Expense": "taxes",
+    "Realized Capital Losses": "realized_losses",
+    "Realized Currency Gains": "currency_gains",
+    "Unrealized Currency Gain/Loss": "unrealized_currency_gl",
+    "Realized Currency Losses": "currency_losses",
+}
+
+# Session.info key holding resolved chart accounts per portfolio
+CHART_ACCOUNTS_CACHE_KEY = "lot_tracking_chart_accounts"
+
+# Shared so its in-memory rate cache survives across mark-to-market calls
+_currency_converter = CurrencyConverter()
+
+
+@event.listens_for(ChartAccount, "after_insert")
+@event.listens_for(ChartAccount, "after_update")
+@event.listens_for(ChartAccount, "after_delete")
+def _invalidate_chart_accounts_cache(
+    mapper: Mapper[ChartAccount], connection: Connection, target: ChartAccount
+) -> None:
+    """Drop a portfolio's cached chart accounts when its accounts change."""
+    session = object_session(target)
+    if session is not None:
+        session.info.get(CHART_ACCOUNTS_CACHE_KEY, {}).pop(target.portfolio_id, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_chart_accounts_cache(session: Session, previous_transaction: SessionTransaction) -> None:
+    """Forget cached chart accounts when a rollback may have discarded them."""
+    session.info.pop(CHART_ACCOUNTS_CACHE_KEY, None)
+
 
 def create_security_lot(
     session: Session,
@@ -138,15 +204,29 @@ def allocate_lots_fifo(
     if not security:
         raise ValueError(f"Security {holding.security_id} not found")
 
-    # Get all open lots for this holding, ordered by purchase date (FIFO)
-    stmt = (
-        select(SecurityLot)
+    # Get open lots for this holding, ordered by purchase date (FIFO). A window
+    # sum of the quantity held in earlier lots limits the load to the lots the
+    # sale actually reaches (all open lots if there are not enough).
+    fifo_order = (SecurityLot.purchase_date, SecurityLot.created_at)
+    open_lots = (
+        select(
+            SecurityLot.id,
+            func.sum(SecurityLot.remaining_quantity)
+            .over(order_by=fifo_order, rows=(None, -1))
+            .label("quantity_before"),
+        )
         .where(
             SecurityLot.holding_id == holding_id,
             SecurityLot.is_closed == False,  # noqa: E712
             SecurityLot.remaining_quantity > 0,
         )
-        .order_by(SecurityLot.purchase_date, SecurityLot.created_at)
+        .subquery()
+    )
+    stmt = (
+        select(SecurityLot)
+        .join(open_lots, SecurityLot.id == open_lots.c.id)
+        .where(func.coalesce(open_lots.c.quantity_before, 0) < quantity_to_sell)
+        .order_by(*fifo_order)
     )
 
     lots = session.execute(stmt).scalars().all()
@@ -167,26 +247,22 @@ def allocate_lots_fifo(
         qty_to_allocate = min(available_quantity, remaining_to_sell)
 
         # Calculate cost basis for this allocation (in base currency)
-        # Use the fraction of the lot we're allocating
-        fraction_allocated = (
-            qty_to_allocate / available_quantity if available_quantity > 0 else Decimal("0")
-        )
-        cost_basis = fraction_allocated * (lot.remaining_quantity * lot.cost_per_share_base)
+        cost_basis = qty_to_allocate * lot.cost_per_share_base
 
-        # Update lot remaining quantity (split-adjusted)
-        lot_qty_to_remove = qty_to_allocate
-        lot.remaining_quantity -= lot_qty_to_remove
-
-        if lot.remaining_quantity <= Decimal("0.00000001"):  # Threshold for floating point
-            lot.remaining_quantity = Decimal("0")
+        # Update lot remaining quantity (split-adjusted) with a single write
+        new_remaining = available_quantity - qty_to_allocate
+        if new_remaining <= QUANTITY_EPSILON:  # Threshold for floating point
+            lot.remaining_quantity = ZERO
             lot.is_closed = True
+        else:
+            lot.remaining_quantity = new_remaining
 
         # Record allocation
         allocations.append((lot, qty_to_allocate, cost_basis))
         remaining_to_sell -= qty_to_allocate
 
     # Verify we allocated enough
-    if remaining_to_sell > Decimal("0.00000001"):  # Small threshold for rounding
+    if remaining_to_sell > QUANTITY_EPSILON:  # Small threshold for rounding
         raise ValueError(
             f"Insufficient lots to sell {quantity_to_sell} shares. "
             f"Only {quantity_to_sell - remaining_to_sell} available."
@@ -256,40 +332,46 @@ def apply_split_to_existing_lots(
         - 100 shares @ $10/share → 200 shares @ $5/share
         - Total cost remains $1,000
     """
-    # Find all lots for this security purchased before the split date
+    split_ratio = split.split_ratio  # e.g., 2.0 for 2:1 split, 0.5 for 1:2 reverse split
+
+    # Flush pending lots so the bulk UPDATE sees them
+    session.flush()
+
+    # Adjust all lots for this security purchased before the split date in one
+    # statement: quantities are multiplied by the ratio and cost per share divided
+    # by it. total_cost and total_cost_base remain unchanged - a split changes
+    # quantity and price, not total value.
+    holding_ids = select(Holding.id).where(Holding.security_id == security_id)
     stmt = (
-        select(SecurityLot)
-        .join(Holding, SecurityLot.holding_id == Holding.id)
-        .join(Security, Holding.security_id == Security.id)
+        update(SecurityLot)
         .where(
-            Security.id == security_id,
+            SecurityLot.holding_id.in_(holding_ids),
             SecurityLot.purchase_date < split.split_date,
         )
+        .values(
+            quantity=SecurityLot.quantity * split_ratio,
+            remaining_quantity=SecurityLot.remaining_quantity * split_ratio,
+            cost_per_share=SecurityLot.cost_per_share / split_ratio,
+            cost_per_share_base=SecurityLot.cost_per_share_base / split_ratio,
+        )
+        # Refresh any lots already loaded in this session
+        .execution_options(synchronize_session="fetch")
     )
-    lots = session.execute(stmt).scalars().all()
-
-    if not lots:
-        return 0
-
-    split_ratio = split.split_ratio  # e.g., 2.0 for 2:1 split, 0.5 for 1:2 reverse split
+    result = session.execute(stmt)
 
-    updated_count = 0
-    for lot in lots:
-        # Adjust quantities (multiply by ratio)
-        lot.quantity *= split_ratio
-        lot.remaining_quantity *= split_ratio
-
-        # Adjust cost per share (divide by ratio to maintain total cost)
-        lot.cost_per_share /= split_ratio
-        lot.cost_per_share_base /= split_ratio
+    # Bulk UPDATEs bypass the flush hook, so refresh the position summaries here
+    refresh_position_summaries(session, session.execute(holding_ids).scalars().all())
+    return int(result.rowcount)
 
-        # Note: total_cost and total_cost_base remain unchanged
-        # This is correct - a split changes quantity and price, not total value
 
-        updated_count += 1
+def refresh_position_summaries(session: Session, holding_ids: Collection[str]) -> None:
+    """Recompute materialized open-lot totals for the given holdings.
 
-    session.flush()
-    return updated_count
+    Args:
+        session: Database session
+        holding_ids: Holding IDs whose PositionSummary rows should be rebuilt
+    """
+    rebuild_position_summaries(session.connection(), holding_ids)
 
 
 def _get_chart_accounts(session: Session, portfolio_id: str) -> dict[str, ChartAccount]:
@@ -305,34 +387,35 @@ def _get_chart_accounts(session: Session, portfolio_id: str) -> dict[str, ChartA
     Raises:
         ValueError: If required accounts are not found
     """
+    # Reuse accounts already resolved in this session
+    cache = session.info.setdefault(CHART_ACCOUNTS_CACHE_KEY, {})
+    if portfolio_id in cache:
+        return cast(dict[str, ChartAccount], cache[portfolio_id])
+
     # Get all accounts for portfolio
     stmt = select(ChartAccount).where(ChartAccount.portfolio_id == portfolio_id)
     all_accounts = session.execute(stmt).scalars().all()
 
-    # Map by name to key
-    name_to_key = {
-        "Cash": "cash",
-        "Bank Accounts": "bank",
-        "Currency Exchange Clearing": "currency_clearing",
-        "Investments - Securities": "investments",
-        "Fair Value Adjustment - Investments": "fair_value_adjustment",
-        "Owner's Capital": "capital",
-        "Retained Earnings": "retained_earnings",
-        "Dividend Income": "dividend_income",
-        "Interest Income": "interest_income",
-        "Realized Capital Gains": "realized_gains",
-        "Unrealized Gain/Loss on Investments": "unrealized_investment_gl",
-        "Fees and Commissions": "fees",
-        "Tax Expense": "taxes",
-        "Realized Capital Losses": "realized_losses",
-        "Realized Currency Gains": "currency_gains",
-        "Unrealized Currency Gain/Loss": "unrealized_currency_gl",
-        "Realized Currency Losses": "currency_losses",
-    }
+    accounts = _map_chart_accounts(all_accounts)
+    cache[portfolio_id] = accounts
+    return accounts
+
+
+def _map_chart_accounts(all_accounts: Sequence[ChartAccount]) -> dict[str, ChartAccount]:
+    """Map a portfolio's chart accounts to their well-known keys.
 
+    Args:
+        all_accounts: ChartAccount rows belonging to a single portfolio
+
+    Returns:
+        Dictionary mapping account keys to ChartAccount instances
+
+    Raises:
+        ValueError: If required accounts are not found
+    """
     accounts = {}
     for account in all_accounts:
-        key = name_to_key.get(account.name)
+        key = CHART_ACCOUNT_KEYS.get(account.name)
         if key:
             accounts[key] = account
 
@@ -370,11 +453,6 @@ def mark_securities_to_market(
     Returns:
         Created JournalEntry if adjustment needed, None if no adjustment
     """
-    from src.services.accounting_service import (
-        get_account_balance,
-        get_next_entry_number,
-    )
-
     # Get portfolio
     portfolio = session.get(Portfolio, portfolio_id)
     if not portfolio:
@@ -383,164 +461,155 @@ def mark_securities_to_market(
     # Get chart of accounts (use existing, don't create)
     accounts = _get_chart_accounts(session, portfolio_id)
 
-    # Get all open lots (securities still held)
+    # Open positions (securities still held) from the materialized summaries:
+    # quantity, cost basis in base currency and cost basis in the security currency
+    # Backfill holdings whose open lots predate the summary table
+    missing_ids = (
+        session.execute(
+            select(Holding.id).where(
+                Holding.portfolio_id == portfolio_id,
+                exists().where(
+                    SecurityLot.holding_id == Holding.id,
+                    SecurityLot.is_closed == False,  # noqa: E712
+                    SecurityLot.remaining_quantity > 0,
+                ),
+                ~exists().where(PositionSummary.holding_id == Holding.id),
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if missing_ids:
+        refresh_position_summaries(session, missing_ids)
+
     stmt = (
-        select(SecurityLot)
-        .join(Holding, SecurityLot.holding_id == Holding.id)
-        .where(
-            Holding.portfolio_id == portfolio_id,
-            SecurityLot.is_closed == False,  # noqa: E712
-            SecurityLot.remaining_quantity > 0,
+        select(
+            PositionSummary.security_ticker,
+            Security.id,
+            Security.currency,
+            PositionSummary.total_quantity,
+            PositionSummary.cost_basis_base,
+            PositionSummary.cost_basis_local,
         )
+        .join(Holding, PositionSummary.holding_id == Holding.id)
+        .join(Security, Holding.security_id == Security.id)
+        .where(PositionSummary.portfolio_id == portfolio_id)
     )
-    open_lots = session.execute(stmt).scalars().all()
+    positions = session.execute(stmt).tuples().all()
 
-    if not open_lots:
+    if not positions:
         return None  # No securities to mark
 
-    # Group lots by ticker and calculate cost basis
-    lots_by_ticker: dict[str, list[SecurityLot]] = {}
-    cost_basis_by_ticker: dict[str, Decimal] = {}
-
-    for lot in open_lots:
-        ticker = lot.security_ticker
-        if ticker not in lots_by_ticker:
-            lots_by_ticker[ticker] = []
-            cost_basis_by_ticker[ticker] = Decimal("0")
-
-        lots_by_ticker[ticker].append(lot)
-        cost_basis_by_ticker[ticker] += lot.remaining_quantity * lot.cost_per_share_base
-
     # Fetch current market prices
     market_data_fetcher = MarketDataFetcher()
-    tickers = list(lots_by_ticker.keys())
+    tickers = [position[0] for position in positions]
     prices = market_data_fetcher.get_current_prices(tickers)
 
     # Calculate market values and unrealized G/L
     # Per IAS 21, separate price effects (IFRS 9) from FX effects (IAS 21)
-    currency_converter = CurrencyConverter()
-    total_market_value = Decimal("0")
-    total_cost_basis = Decimal("0")
-    total_price_unrealized_gl = Decimal("0")  # Price changes only
-    total_fx_unrealized_gl = Decimal("0")  # FX rate changes only
-
-    for ticker, lots in lots_by_ticker.items():
-        # Get security info for currency (needed for both Yahoo Finance and manual prices)
-        security_stmt = select(Security).where(Security.ticker == ticker)
-        security = session.execute(security_stmt).scalar_one_or_none()
-        if not security:
-            continue
-
-        # Get current price - try Yahoo Finance first
-        price = prices.get(ticker)
-
-        # Fallback: Check for manual price in MarketData table
-        # This handles bonds, funds, and other securities not on Yahoo Finance
-        if price is None:
-            from src.models import MarketData
-
-            manual_price_stmt = (
-                select(MarketData)
-                .where(
-                    MarketData.security_id == security.id,
-                    MarketData.is_latest == True,  # noqa: E712
-                )
-                .order_by(MarketData.timestamp.desc())
-                .limit(1)
-            )
-            manual_price_record = session.execute(manual_price_stmt).scalar_one_or_none()
-
-            if manual_price_record:
-                price = float(manual_price_record.price)
-            else:
+    total_market_value = ZERO
+    total_cost_basis = ZERO
+    total_price_unrealized_gl = ZERO  # Price changes only
+    total_fx_unrealized_gl = ZERO  # FX rate changes only
+
+    # Fallback: Check for manual prices in MarketData table
+    # This handles bonds, funds, and other securities not on Yahoo Finance
+    missing_price_ids = [
+        security_id for ticker, security_id, *_ in positions if prices.get(ticker) is None
+    ]
+    manual_prices: dict[str, Decimal] = {}
+    if missing_price_ids:
+        manual_price_stmt = select(MarketData.security_id, MarketData.price).where(
+            MarketData.security_id.in_(missing_price_ids),
+            MarketData.is_latest == True,  # noqa: E712
+        )
+        manual_prices = dict(session.execute(manual_price_stmt).tuples().all())
+
+    # Resolve each position's current price (security currency) once - Yahoo
+    # Finance first, then the manual price, which is already a Decimal
+    base_currency = portfolio.base_currency
+    priced_positions: list[tuple[str, Decimal, Decimal, Decimal, Decimal]] = []
+    for ticker, security_id, currency, total_quantity, cost_basis, total_cost_local in positions:
+        fetched_price = prices.get(ticker)
+        if fetched_price is not None:
+            price = Decimal(str(fetched_price))
+        else:
+            manual_price = manual_prices.get(security_id)
+            if manual_price is None:
                 # Skip securities without any price data
                 continue
+            price = manual_price
+        priced_positions.append((currency, total_quantity, cost_basis, total_cost_local, price))
+
+    # Fetch exchange rates for all priced foreign currency securities in one batch;
+    # the base currency converts at 1 so every position resolves its rate the same way
+    rate_by_currency = {
+        from_currency: rate
+        for (from_currency, _), rate in _fetch_rates(
+            [
+                (currency, base_currency)
+                for currency, *_ in priced_positions
+                if currency != base_currency
+            ],
+            as_of_date,
+        ).items()
+    }
+    rate_by_currency[base_currency] = Decimal("1")
 
-        # Calculate total quantity for this ticker
+    for currency, total_quantity, cost_basis, total_cost_local, price in priced_positions:
         # Lots already store split-adjusted quantities (Option B architecture)
-        total_quantity = Decimal("0")
-        for lot in lots:
-            total_quantity += lot.remaining_quantity
-
-        # Get cost basis for this ticker
-        cost_basis = cost_basis_by_ticker[ticker]
         total_cost_basis += cost_basis
 
-        # For foreign currency securities, separate price and FX effects per IAS 21
-        if security.currency != portfolio.base_currency:
-            import asyncio
-
-            # Get current exchange rate
-            current_rate_float = asyncio.run(
-                currency_converter.get_rate(
-                    from_currency=security.currency,
-                    to_currency=portfolio.base_currency,
-                    rate_date=as_of_date,
-                )
-            )
-            current_rate = (
-                Decimal(str(current_rate_float)) if current_rate_float else Decimal("1.0")
-            )
-
-            # Calculate weighted average purchase rate from lots
-            total_cost_local = Decimal("0")
-            total_cost_base_from_lots = Decimal("0")
-            for lot in lots:
-                lot_cost_local = lot.remaining_quantity * lot.cost_per_share
-                lot_cost_base = lot.remaining_quantity * lot.cost_per_share_base
-                total_cost_local += lot_cost_local
-                total_cost_base_from_lots += lot_cost_base
+        # Market value at current rate
+        current_rate = rate_by_currency[currency]
+        market_value_local = total_quantity * price
+        market_value = market_value_local * current_rate
+        total_market_value += market_value
 
-            # Weighted average purchase rate
+        # For foreign currency securities, separate price and FX effects per IAS 21
+        if currency != base_currency:
+            # Weighted average purchase rate from lots
             weighted_avg_rate = (
-                total_cost_base_from_lots / total_cost_local
-                if total_cost_local > 0
-                else current_rate
+                cost_basis / total_cost_local if total_cost_local > 0 else current_rate
             )
 
-            # Price in security currency
-            price_local = Decimal(str(price))
-
-            # Market value at current rate
-            market_value_at_current_rate = total_quantity * price_local * current_rate
-
             # Unrealized G/L breakdown per IAS 21:
             # 1. Price effect: change in price, converted at CURRENT rate
             #    This gives the capital gain in reporting currency
-            price_change_local = (total_quantity * price_local) - total_cost_local
+            price_change_local = market_value_local - total_cost_local
             price_unrealized_gl = price_change_local * current_rate
 
             # 2. FX effect (IAS 21): change in exchange rate on COST BASIS only
             #    FX gain/loss = cost_basis_local × (current_rate - purchase_rate)
             #    This measures FX impact on what we PAID, not current market value
-            cost_basis_local = total_cost_local  # Already calculated above
-            fx_unrealized_gl = cost_basis_local * (current_rate - weighted_avg_rate)
+            fx_unrealized_gl = total_cost_local * (current_rate - weighted_avg_rate)
 
             total_price_unrealized_gl += price_unrealized_gl
             total_fx_unrealized_gl += fx_unrealized_gl
-            total_market_value += market_value_at_current_rate
         else:
             # Base currency security - no FX effect, only price effect
-            price_base = Decimal(str(price))
-            market_value = total_quantity * price_base
-            price_unrealized_gl = market_value - cost_basis
-
-            total_price_unrealized_gl += price_unrealized_gl
-            total_market_value += market_value
+            total_price_unrealized_gl += market_value - cost_basis
 
     # Calculate total unrealized G/L (for Fair Value Adjustment account)
     total_unrealized_gl = total_price_unrealized_gl + total_fx_unrealized_gl
 
-    # Get existing fair value adjustment balance
-    existing_adjustment = get_account_balance(
-        session, accounts["fair_value_adjustment"].id, as_of_date
+    # Get existing fair value adjustment and unrealized G/L balances in one query
+    # (each unrealized account is net of all previous adjustments)
+    fair_value_account_id = accounts["fair_value_adjustment"].id
+    price_unrealized_account_id = accounts["unrealized_investment_gl"].id
+    fx_unrealized_account_id = accounts["unrealized_currency_gl"].id
+    balances = get_account_balances(
+        session,
+        [fair_value_account_id, price_unrealized_account_id, fx_unrealized_account_id],
+        as_of_date,
     )
+    existing_adjustment = balances[fair_value_account_id]
 
     # Calculate incremental adjustment needed
     incremental_adjustment = total_unrealized_gl - existing_adjustment
 
     # Check if adjustment is needed (use small threshold for rounding)
-    if abs(incremental_adjustment) < Decimal("0.01"):
+    if abs(incremental_adjustment) < ADJUSTMENT_THRESHOLD:
         return None
 
     # Create journal entry for incremental adjustment
@@ -555,35 +624,24 @@ def mark_securities_to_market(
         description="Mark securities to market (unrealized G/L - price & FX)",
         created_by="system",
     )
-    session.add(entry)
-    session.flush()
 
     lines = []
     line_num = 1
 
     # Calculate incremental price and FX adjustments needed
-    # Get existing balance for single unrealized account (net of all previous adjustments)
-    existing_price_unrealized = get_account_balance(
-        session, accounts["unrealized_investment_gl"].id, as_of_date
-    )
-    existing_fx_unrealized = get_account_balance(
-        session, accounts["unrealized_currency_gl"].id, as_of_date
-    )
-
-    # Calculate incremental adjustments
-    incremental_price_adjustment = total_price_unrealized_gl - existing_price_unrealized
-    incremental_fx_adjustment = total_fx_unrealized_gl - existing_fx_unrealized
+    incremental_price_adjustment = total_price_unrealized_gl - balances[price_unrealized_account_id]
+    incremental_fx_adjustment = total_fx_unrealized_gl - balances[fx_unrealized_account_id]
 
     # Fair Value Adjustment account gets the total adjustment
     if incremental_adjustment > 0:
         # Net gain: DR Fair Value Adjustment
         lines.append(
             JournalLine(
-                journal_entry_id=entry.id,
+                journal_entry=entry,
                 account_id=accounts["fair_value_adjustment"].id,
                 line_number=line_num,
                 debit_amount=incremental_adjustment,
-                credit_amount=Decimal("0"),
+                credit_amount=ZERO,
                 currency=portfolio.base_currency,
                 description="Fair value increase",
             )
@@ -593,10 +651,10 @@ def mark_securities_to_market(
         # Net loss: CR Fair Value Adjustment
         lines.append(
             JournalLine(
-                journal_entry_id=entry.id,
+                journal_entry=entry,
                 account_id=accounts["fair_value_adjustment"].id,
                 line_number=line_num,
-                debit_amount=Decimal("0"),
+                debit_amount=ZERO,
                 credit_amount=abs(incremental_adjustment),
                 currency=portfolio.base_currency,
                 description="Fair value decrease",
@@ -606,15 +664,15 @@ def mark_securities_to_market(
 
     # Price effect - Unrealized Gain/Loss on Investments (IFRS 9)
     # Single account that can be credit (gain) or debit (loss)
-    if abs(incremental_price_adjustment) >= Decimal("0.01"):
+    if abs(incremental_price_adjustment) >= ADJUSTMENT_THRESHOLD:
         if incremental_price_adjustment > 0:
             # Price gain: CR Unrealized Gain/Loss
             lines.append(
                 JournalLine(
-                    journal_entry_id=entry.id,
+                    journal_entry=entry,
                     account_id=accounts["unrealized_investment_gl"].id,
                     line_number=line_num,
-                    debit_amount=Decimal("0"),
+                    debit_amount=ZERO,
                     credit_amount=incremental_price_adjustment,
                     currency=portfolio.base_currency,
                     description="Unrealized gain on investments (price)",
@@ -625,11 +683,11 @@ def mark_securities_to_market(
             # Price loss: DR Unrealized Gain/Loss
             lines.append(
                 JournalLine(
-                    journal_entry_id=entry.id,
+                    journal_entry=entry,
                     account_id=accounts["unrealized_investment_gl"].id,
                     line_number=line_num,
                     debit_amount=abs(incremental_price_adjustment),
-                    credit_amount=Decimal("0"),
+                    credit_amount=ZERO,
                     currency=portfolio.base_currency,
                     description="Unrealized loss on investments (price)",
                 )
@@ -638,15 +696,15 @@ def mark_securities_to_market(
 
     # FX effect - Unrealized Currency Gain/Loss (IAS 21)
     # Single account that can be credit (gain) or debit (loss)
-    if abs(incremental_fx_adjustment) >= Decimal("0.01"):
+    if abs(incremental_fx_adjustment) >= ADJUSTMENT_THRESHOLD:
         if incremental_fx_adjustment > 0:
             # FX gain: CR Unrealized Currency Gain/Loss
             lines.append(
                 JournalLine(
-                    journal_entry_id=entry.id,
+                    journal_entry=entry,
                     account_id=accounts["unrealized_currency_gl"].id,
                     line_number=line_num,
-                    debit_amount=Decimal("0"),
+                    debit_amount=ZERO,
                     credit_amount=incremental_fx_adjustment,
                     currency=portfolio.base_currency,
                     description="Unrealized FX gain on investments (IAS 21)",
@@ -657,30 +715,24 @@ def mark_securities_to_market(
             # FX loss: DR Unrealized Currency Gain/Loss
             lines.append(
                 JournalLine(
-                    journal_entry_id=entry.id,
+                    journal_entry=entry,
                     account_id=accounts["unrealized_currency_gl"].id,
                     line_number=line_num,
                     debit_amount=abs(incremental_fx_adjustment),
-                    credit_amount=Decimal("0"),
+                    credit_amount=ZERO,
                     currency=portfolio.base_currency,
                     description="Unrealized FX loss on investments (IAS 21)",
                 )
             )
             line_num += 1
 
-    # Add lines to entry
-    for line in lines:
-        session.add(line)
-
-    session.flush()
-
     # Check if entry is balanced (with small tolerance for rounding)
     if not entry.is_balanced:
         # Calculate imbalance
         imbalance = entry.total_debits - entry.total_credits
 
         # If imbalance is small (<25 cents), add balancing adjustment
-        if abs(imbalance) < Decimal("0.25"):
+        if abs(imbalance) < BALANCING_TOLERANCE:
             # Find the Fair Value Adjustment line to adjust
             for line in lines:
                 if line.account_id == accounts["fair_value_adjustment"].id:
@@ -697,7 +749,6 @@ def mark_securities_to_market(
                             line.debit_amount -= imbalance
                         else:
                             line.credit_amount += imbalance
-                    session.flush()
                     break
 
         # Verify balance after adjustment
@@ -707,6 +758,11 @@ def mark_securities_to_market(
                 f"DR={entry.total_debits}, CR={entry.total_credits}"
             )
 
+    # Entry and lines are inserted together in a single flush
+    session.add(entry)
+    session.add_all(lines)
+    session.flush()
+
     return entry
 
 
@@ -730,138 +786,323 @@ def mark_currency_to_market(
     unrealized FX, similar to how mark_securities_to_market uses open security lots.
     Spent currency creates REALIZED FX gains/losses when allocated.
 
+    Single-portfolio form of bulk_mark_currency_to_market; only lots held through
+    the portfolio's own accounts are revalued.
+
     Args:
         session: Database session
         portfolio_id: Portfolio ID
-        cash_account_id: Cash account ID (unused, kept for API compatibility)
+        cash_account_id: Cash account whose foreign currency balances are revalued
+            and which receives the adjustment line
         base_currency: Portfolio base currency
         as_of_date: Date for exchange rates
 
     Returns:
         Created JournalEntry if adjustment needed, None if no adjustment
+
+    Raises:
+        ValueError: If the portfolio or its required accounts are not found
     """
-    from src.models.currency_lot import CurrencyLot
-    from src.services.accounting_service import get_next_entry_number
+    entries = _mark_currency_to_market_batch(
+        session,
+        [portfolio_id],
+        as_of_date,
+        cash_account_ids={portfolio_id: cash_account_id},
+        base_currencies={portfolio_id: base_currency},
+    )
+    return entries.get(portfolio_id)
 
-    # Get chart of accounts (use existing, don't create)
-    accounts = _get_chart_accounts(session, portfolio_id)
 
-    # Get portfolio
-    portfolio = session.get(Portfolio, portfolio_id)
-    if not portfolio:
-        raise ValueError(f"Portfolio {portfolio_id} not found")
+def bulk_mark_currency_to_market(
+    session: Session,
+    portfolio_ids: Sequence[str],
+    as_of_date: date,
+) -> dict[str, JournalEntry]:
+    """Mark foreign currency cash to market for several portfolios at once (IAS 21).
 
-    # Get actual cash balances (from journal entries)
-    # This is the ground truth - what's actually in the bank
-    from src.services.accounting_service import get_cash_balances_by_currency
+    Batch counterpart of mark_currency_to_market for end-of-day runs. Portfolios,
+    chart accounts, cash balances, open lots, previous cash FX entries and entry
+    numbers are each loaded with a single query filtered by portfolio_id IN (...),
+    exchange rates are fetched once per currency pair, and all entries are flushed
+    together. The caller commits once for the whole batch.
 
-    cash_balances = get_cash_balances_by_currency(session, cash_account_id, as_of_date)
+    Open currency lots are scoped to each portfolio through their broker account.
 
-    if not cash_balances:
-        return None  # No cash to mark
+    Args:
+        session: Database session
+        portfolio_ids: Portfolio IDs to revalue
+        as_of_date: Date for exchange rates
 
-    # Only process foreign currencies with positive balances
-    foreign_currencies_with_cash = {
-        curr: amt
-        for curr, amt in cash_balances.items()
-        if curr != base_currency
-        and amt > Decimal("0.01")  # Exclude base currency and zero balances
-    }
+    Returns:
+        Dictionary mapping portfolio ID to the created JournalEntry (portfolios
+        that need no adjustment are omitted)
 
-    if not foreign_currencies_with_cash:
-        return None  # No foreign currency cash to mark
+    Raises:
+        ValueError: If a portfolio or its required accounts are not found
+    """
+    return _mark_currency_to_market_batch(session, portfolio_ids, as_of_date)
 
-    # Get OPEN currency lots (remaining_amount > 0)
-    # With proper lot allocation, remaining amounts should match actual cash balances
-    stmt = select(CurrencyLot).where(
-        CurrencyLot.remaining_amount > 0,
-        CurrencyLot.from_currency == base_currency,
-        CurrencyLot.to_currency.in_(list(foreign_currencies_with_cash.keys())),
-        CurrencyLot.conversion_date <= as_of_date,
-    )
-    open_lots = session.execute(stmt).scalars().all()
 
-    if not open_lots:
-        return None  # No open lots to mark
+def _mark_currency_to_market_batch(
+    session: Session,
+    portfolio_ids: Sequence[str],
+    as_of_date: date,
+    cash_account_ids: Mapping[str, str] | None = None,
+    base_currencies: Mapping[str, str] | None = None,
+) -> dict[str, JournalEntry]:
+    """Revalue foreign currency cash for several portfolios (see bulk_mark_currency_to_market).
 
-    # Calculate book value and current value for each currency
-    currency_converter = CurrencyConverter()
-    total_book_value = Decimal("0")
-    total_current_value = Decimal("0")
+    Args:
+        session: Database session
+        portfolio_ids: Portfolio IDs to revalue
+        as_of_date: Date for exchange rates
+        cash_account_ids: Cash account per portfolio; defaults to the chart's Cash account
+        base_currencies: Base currency per portfolio; defaults to the portfolio's own
 
-    # Group by currency for exchange rate lookups
-    currencies_to_mark = set(lot.to_currency for lot in open_lots)
+    Returns:
+        Dictionary mapping portfolio ID to the created JournalEntry
+    """
+    portfolio_ids = list(dict.fromkeys(portfolio_ids))
+    if not portfolio_ids:
+        return {}
+
+    portfolios = {
+        portfolio.id: portfolio
+        for portfolio in session.execute(select(Portfolio).where(Portfolio.id.in_(portfolio_ids)))
+        .scalars()
+        .all()
+    }
+    missing = [pid for pid in portfolio_ids if pid not in portfolios]
+    if missing:
+        raise ValueError(f"Portfolio {missing[0]} not found")
+
+    # Chart of accounts for all portfolios, bucketed per portfolio
+    accounts_by_portfolio: dict[str, list[ChartAccount]] = {pid: [] for pid in portfolio_ids}
+    for account in (
+        session.execute(select(ChartAccount).where(ChartAccount.portfolio_id.in_(portfolio_ids)))
+        .scalars()
+        .all()
+    ):
+        accounts_by_portfolio[account.portfolio_id].append(account)
+    chart_accounts = {
+        pid: _map_chart_accounts(accounts) for pid, accounts in accounts_by_portfolio.items()
+    }
+    session.info.setdefault(CHART_ACCOUNTS_CACHE_KEY, {}).update(chart_accounts)
 
-    import asyncio
+    cash_account_by_portfolio = {
+        pid: accounts["cash"].id for pid, accounts in chart_accounts.items() if "cash" in accounts
+    }
+    cash_account_by_portfolio.update(cash_account_ids or {})
+    portfolio_by_cash_account = {cash_id: pid for pid, cash_id in cash_account_by_portfolio.items()}
+    base_currency_by_portfolio = {pid: portfolios[pid].base_currency for pid in portfolio_ids}
+    base_currency_by_portfolio.update(base_currencies or {})
+
+    # Foreign currency cash balances for every cash account (same rules as
+    # get_cash_balances_by_currency)
+    cash_balances_stmt = (
+        select(
+            JournalLine.account_id,
+            JournalLine.foreign_currency,
+            func.sum(signed_foreign_amount()),
+        )
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .where(
+            JournalLine.account_id.in_(list(portfolio_by_cash_account)),
+            JournalEntry.status == JournalEntryStatus.POSTED,
+            JournalEntry.entry_date <= as_of_date,
+            JournalLine.foreign_currency.isnot(None),
+            JournalLine.foreign_amount.isnot(None),
+        )
+        .group_by(JournalLine.account_id, JournalLine.foreign_currency)
+    )
+    cash_balances: dict[str, dict[str, Decimal]] = {pid: {} for pid in portfolio_ids}
+    for account_id, currency, balance in session.execute(cash_balances_stmt).tuples():
+        if currency:
+            cash_balances[portfolio_by_cash_account[account_id]][currency] = balance
+
+    foreign_currencies: dict[str, set[str]] = {
+        pid: {
+            curr
+            for curr, amt in cash_balances[pid].items()
+            if curr != base_currency_by_portfolio[pid] and amt > ADJUSTMENT_THRESHOLD
+        }
+        for pid in portfolio_ids
+    }
+    portfolios_with_cash = [pid for pid in portfolio_ids if foreign_currencies[pid]]
+    if not portfolios_with_cash:
+        return {}
+
+    # Open currency lots for all portfolios, bucketed by the owning portfolio
+    lots_stmt = (
+        select(CurrencyLot, Account.portfolio_id)
+        .join(Account, CurrencyLot.account_id == Account.id)
+        .where(
+            Account.portfolio_id.in_(portfolios_with_cash),
+            CurrencyLot.remaining_amount > 0,
+            CurrencyLot.conversion_date <= as_of_date,
+        )
+    )
+    open_lots: dict[str, list[CurrencyLot]] = {pid: [] for pid in portfolios_with_cash}
+    for lot, pid in session.execute(lots_stmt).all():
+        if (
+            lot.from_currency == base_currency_by_portfolio[pid]
+            and lot.to_currency in foreign_currencies[pid]
+        ):
+            open_lots[pid].append(lot)
+
+    # One rate lookup per (foreign, base) currency pair across all portfolios
+    rates = _fetch_rates(
+        [
+            (lot.to_currency, base_currency_by_portfolio[pid])
+            for pid, lots in open_lots.items()
+            for lot in lots
+        ],
+        as_of_date,
+    )
 
-    for currency in currencies_to_mark:
-        # Get current exchange rate
-        current_rate_float = asyncio.run(
-            currency_converter.get_rate(
-                from_currency=currency,
-                to_currency=base_currency,
-                rate_date=as_of_date,
-            )
+    # Previous cash FX adjustments, netted per portfolio
+    prev_cash_fx_stmt = (
+        select(
+            JournalEntry.portfolio_id,
+            func.sum(JournalLine.credit_amount - JournalLine.debit_amount),
+        )
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .where(
+            JournalEntry.portfolio_id.in_(portfolios_with_cash),
+            JournalEntry.description == CASH_FX_ENTRY_DESCRIPTION,
+            JournalEntry.status == JournalEntryStatus.POSTED,
+            JournalEntry.entry_date <= as_of_date,
+            JournalLine.account_id.in_(
+                [chart_accounts[pid]["unrealized_currency_gl"].id for pid in portfolios_with_cash]
+            ),
         )
-        current_rate = Decimal(str(current_rate_float)) if current_rate_float else Decimal("1.0")
+        .group_by(JournalEntry.portfolio_id)
+    )
+    existing_cash_fx: dict[str, Decimal] = {pid: ZERO for pid in portfolios_with_cash}
+    existing_cash_fx.update(session.execute(prev_cash_fx_stmt).tuples().all())
+
+    # Next entry number for every portfolio in one grouped aggregate
+    next_entry_numbers = {
+        pid: (max_number or 0) + 1
+        for pid, max_number in session.execute(
+            select(JournalEntry.portfolio_id, func.max(JournalEntry.entry_number))
+            .where(JournalEntry.portfolio_id.in_(portfolios_with_cash))
+            .group_by(JournalEntry.portfolio_id)
+        ).all()
+    }
 
-        # Calculate book value and current value for all lots in this currency
-        for lot in open_lots:
-            if lot.to_currency != currency:
-                continue
+    entries: dict[str, JournalEntry] = {}
+    for pid in portfolios_with_cash:
+        if not open_lots[pid]:
+            continue
 
-            # Book value = proportional cost basis for remaining amount
-            # lot.from_amount is EUR paid, lot.to_amount is USD received
-            # lot.remaining_amount is USD still held
+        base_currency = base_currency_by_portfolio[pid]
+        total_unrealized_fx_gl = ZERO
+        for lot in open_lots[pid]:
             lot_book_value = lot.from_amount * (lot.remaining_amount / lot.to_amount)
-            total_book_value += lot_book_value
+            lot_current_value = lot.remaining_amount * rates[(lot.to_currency, base_currency)]
+            total_unrealized_fx_gl += lot_current_value - lot_book_value
 
-            # Current value at current exchange rate
-            lot_current_value = lot.remaining_amount * current_rate
-            total_current_value += lot_current_value
+        unrealized_fx_gl = total_unrealized_fx_gl - existing_cash_fx[pid]
+        if abs(unrealized_fx_gl) < ADJUSTMENT_THRESHOLD:
+            continue
 
-    # Calculate unrealized FX gain/loss (IAS 21)
-    total_unrealized_fx_gl = total_current_value - total_book_value
+        entries[pid] = _build_cash_fx_entry(
+            portfolio_id=pid,
+            entry_number=next_entry_numbers.get(pid, 1),
+            as_of_date=as_of_date,
+            unrealized_fx_gl=unrealized_fx_gl,
+            cash_account_id=cash_account_by_portfolio[pid],
+            unrealized_fx_account_id=chart_accounts[pid]["unrealized_currency_gl"].id,
+            base_currency=base_currency,
+        )
 
-    # Get existing cash FX adjustment from previous mark_currency_to_market entries
-    # IMPORTANT: We must track CASH FX separately from SECURITIES FX, even though
-    # they use the same GL account. Filter by description to get only cash entries.
-    existing_cash_fx = Decimal("0")
+    if entries:
+        session.add_all(entries.values())
+        session.flush()
 
-    prev_entries_stmt = select(JournalEntry).where(
-        JournalEntry.portfolio_id == portfolio_id,
-        JournalEntry.description == "Mark foreign currency cash to market (IAS 21)",
-        JournalEntry.status == JournalEntryStatus.POSTED,
-        JournalEntry.entry_date <= as_of_date,
-    )
-    prev_cash_fx_entries = session.execute(prev_entries_stmt).scalars().all()
+    return entries
 
-    for prev_entry in prev_cash_fx_entries:
-        for line in prev_entry.lines:
-            if line.account_id == accounts["unrealized_currency_gl"].id:
-                # Net the debits and credits to this account from cash FX entries
-                existing_cash_fx += line.credit_amount - line.debit_amount
 
-    # Calculate incremental adjustment needed
-    unrealized_fx_gl = total_unrealized_fx_gl - existing_cash_fx
+def _fetch_rates(
+    currency_pairs: Iterable[tuple[str, str]],
+    as_of_date: date,
+) -> dict[tuple[str, str], Decimal]:
+    """Fetch exchange rates for several currency pairs in one event loop.
+
+    Duplicate pairs are requested once and all lookups are awaited together with
+    asyncio.gather instead of one asyncio.run per currency. The module-level
+    converter keeps its in-memory (currency, currency, date) cache across calls,
+    so securities and cash mark-to-market runs on the same date share rates.
+
+    Args:
+        currency_pairs: (from_currency, to_currency) pairs, duplicates allowed
+        as_of_date: Date for exchange rates
+
+    Returns:
+        Dictionary mapping each pair to its rate (1.0 when no rate is returned)
+    """
+    pairs = list(dict.fromkeys(currency_pairs))
+    if not pairs:
+        return {}
+
+    async def _gather_rates() -> list[float | None]:
+        return await asyncio.gather(
+            *(
+                _currency_converter.get_rate(
+                    from_currency=from_currency,
+                    to_currency=to_currency,
+                    rate_date=as_of_date,
+                )
+                for from_currency, to_currency in pairs
+            )
+        )
+
+    results = asyncio.run(_gather_rates())
+    return {
+        pair: Decimal(str(rate)) if rate else Decimal("1.0") for pair, rate in zip(pairs, results)
+    }
 
-    # Check if adjustment is needed (use small threshold for rounding)
-    if abs(unrealized_fx_gl) < Decimal("0.01"):
-        return None
 
-    # Create journal entry for unrealized FX adjustment
+def _build_cash_fx_entry(
+    portfolio_id: str,
+    entry_number: int,
+    as_of_date: date,
+    unrealized_fx_gl: Decimal,
+    cash_account_id: str,
+    unrealized_fx_account_id: str,
+    base_currency: str,
+) -> JournalEntry:
+    """Build a cash FX revaluation entry with its two balancing lines.
+
+    Lines reference the entry through the journal_entry relationship, so adding
+    the returned entry to the session inserts header and lines in a single flush.
+
+    Args:
+        portfolio_id: Portfolio ID
+        entry_number: Journal entry number to assign
+        as_of_date: Entry and posting date
+        unrealized_fx_gl: Incremental unrealized FX gain (positive) or loss (negative)
+        cash_account_id: Cash account ID
+        unrealized_fx_account_id: Unrealized Currency Gain/Loss account ID
+        base_currency: Portfolio base currency
+
+    Returns:
+        Unsaved JournalEntry with lines attached
+
+    Raises:
+        ValueError: If the lines do not balance
+    """
     entry = JournalEntry(
         portfolio_id=portfolio_id,
-        entry_number=get_next_entry_number(session, portfolio_id),
+        entry_number=entry_number,
         entry_date=as_of_date,
         posting_date=as_of_date,
         type=JournalEntryType.ADJUSTMENT,
         status=JournalEntryStatus.POSTED,
-        description="Mark foreign currency cash to market (IAS 21)",
+        description=CASH_FX_ENTRY_DESCRIPTION,
         created_by="system",
     )
-    session.add(entry)
-    session.flush()
 
     lines = []
     line_num = 1
@@ -870,11 +1111,11 @@ def mark_currency_to_market(
         # Unrealized gain: DR Cash, CR Unrealized Currency Gain/Loss
         lines.append(
             JournalLine(
-                journal_entry_id=entry.id,
+                journal_entry=entry,
                 account_id=cash_account_id,
                 line_number=line_num,
                 debit_amount=unrealized_fx_gl,
-                credit_amount=Decimal("0"),
+                credit_amount=ZERO,
                 currency=base_currency,
                 description="Foreign currency revaluation gain",
             )
@@ -883,10 +1124,10 @@ def mark_currency_to_market(
 
         lines.append(
             JournalLine(
-                journal_entry_id=entry.id,
-                account_id=accounts["unrealized_currency_gl"].id,
+                journal_entry=entry,
+                account_id=unrealized_fx_account_id,
                 line_number=line_num,
-                debit_amount=Decimal("0"),
+                debit_amount=ZERO,
                 credit_amount=unrealized_fx_gl,
                 currency=base_currency,
                 description="Unrealized FX gain (IAS 21)",
@@ -898,11 +1139,11 @@ def mark_currency_to_market(
 
         lines.append(
             JournalLine(
-                journal_entry_id=entry.id,
-                account_id=accounts["unrealized_currency_gl"].id,
+                journal_entry=entry,
+                account_id=unrealized_fx_account_id,
                 line_number=line_num,
                 debit_amount=loss_amount,
-                credit_amount=Decimal("0"),
+                credit_amount=ZERO,
                 currency=base_currency,
                 description="Unrealized FX loss (IAS 21)",
             )
@@ -911,27 +1152,23 @@ def mark_currency_to_market(
 
         lines.append(
             JournalLine(
-                journal_entry_id=entry.id,
+                journal_entry=entry,
                 account_id=cash_account_id,
                 line_number=line_num,
-                debit_amount=Decimal("0"),
+                debit_amount=ZERO,
                 credit_amount=loss_amount,
                 currency=base_currency,
                 description="Foreign currency revaluation loss",
             )
         )
 
-    # Add lines to entry
-    for line in lines:
-        session.add(line)
-
-    session.flush()
-
-    # Verify entry is balanced
-    if not entry.is_balanced:
+    # Verify balance on the in-memory lines (both sides carry the same amount,
+    # so there is no need to re-walk entry.lines after the flush)
+    total_debits = sum((line.debit_amount for line in lines), ZERO)
+    total_credits = sum((line.credit_amount for line in lines), ZERO)
+    if total_debits != total_credits:
         raise ValueError(
-            f"Currency mark-to-market entry not balanced: "
-            f"DR={entry.total_debits}, CR={entry.total_credits}"
+            f"Currency mark-to-market entry not balanced: DR={total_debits}, CR={total_credits}"
         )
 
     return entry
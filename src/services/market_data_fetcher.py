@@ -1,32 +1,98 @@
 """Market data fetcher with fallback strategy."""
 
 import asyncio
+import functools
 import logging
+import math
 import os
-from datetime import datetime, timezone
-from typing import Any, Optional
-
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Optional, cast
+
+import numpy as np
 import yfinance as yf
-from pydantic import ValidationError
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 from src.lib.api_client import APIClient
-from src.lib.api_models import validate_alpha_vantage_response
+from src.lib.api_models import validate_alpha_vantage_time_series
 from src.lib.cache import CacheManager
-from src.lib.config import API_RATE_LIMIT_DELAY, API_TIMEOUT_SECONDS
+from src.lib.config import API_TIMEOUT_SECONDS
 from src.lib.db import db_session
 from src.lib.quota_tracker import QuotaTracker
+from src.lib.rate_limiter import TokenBucket
 from src.models.market_data import MarketData
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of symbols requested from Yahoo Finance in one download
+YAHOO_BATCH_SIZE = 20
+
+# Exchange suffixes of European listings, whose tickers may contain digits
+EUROPEAN_EXCHANGE_SUFFIXES = (".HE", ".OL", ".VS", ".TL", ".AS", ".DE")
+
+# Longer tickers are ISINs or bond codes without Yahoo Finance quotes
+MAX_YAHOO_TICKER_LENGTH = 15
+
+_DIGIT_RE = re.compile(r"\d")
+
+# Fetches the raw OHLCV strings of an Alpha Vantage data point in one call
+_ALPHA_VANTAGE_FIELDS = itemgetter("1. open", "2. high", "3. low", "4. close", "5. volume")
+
+# Maximum number of tickers stored (or fetched one by one) at the same time
+BATCH_UPDATE_MAX_WORKERS = 10
+
+# Daily bars do not change once posted, so a cached history stays usable as a
+# fallback for a day (the fast path uses the shorter market-hours aware TTL)
+HISTORY_CACHE_TTL_MINUTES = 1440
+
+# A ticker whose Alpha Vantage response carried no usable data (error message,
+# rate-limit note, empty series) is not requested again for this long, so a
+# batch retry does not spend quota on the same answer
+ALPHA_VANTAGE_EMPTY_TTL_MINUTES = 5
+
+# A cached Yahoo Finance history is refreshed in the background once it expires
+# within this multiple of the recent p95 download time, so callers keep hitting
+# the cache instead of waiting for the refetch at the TTL boundary
+REFRESH_AHEAD_LATENCY_FACTOR = 1.5
+
+# Number of recent Yahoo Finance download times the p95 is taken over
+FETCH_LATENCY_SAMPLES = 20
+
+# Columns of a history payload's "columns" entry, one list per field
+HISTORY_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
 
 class MarketDataFetcher:
     """Fetches market data from APIs with fallback strategy."""
 
-    # Class-level cache shared across instances (persists between CLI calls)
-    _price_cache: dict[str, tuple[float, datetime]] = {}
+    # Current prices kept in memory, and how long each stays valid
+    PRICE_CACHE_MAX_ENTRIES = 4096
+    PRICE_CACHE_TTL_SECONDS = 900
+
+    # Class-level LRU shared across instances within one process (the
+    # "current_price" file cache shares prices between CLI processes):
+    # ticker -> (price, stored_at as time.monotonic())
+    _price_cache: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    # Worker threads for blocking yfinance calls, shared across instances and
+    # bounded so a large batch cannot crowd out the default executor. No HTTP
+    # session is passed to yfinance: it keeps one curl_cffi session (with its
+    # cookie and crumb) per process and rejects requests.Session objects
+    _yfinance_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="yfinance")
+
+    # yf.download collects its results in module globals (yfinance.shared._DFS),
+    # so concurrent calls overwrite each other's data; every call holds this lock
+    _yf_download_lock = threading.Lock()
 
     def __init__(self) -> None:
         """Initialize market data fetcher."""
@@ -40,11 +106,63 @@ class MarketDataFetcher:
                 "For better data quality, set: export ALPHA_VANTAGE_API_KEY=your-key-here"
             )
 
-        self.request_delay = API_RATE_LIMIT_DELAY  # Seconds between API requests (rate limiting)
+        # Serve cached data of any age when all sources fail (degraded mode);
+        # disable with STOCKS_HELPER_CACHE_FALLBACK=0
+        self.serve_stale_cache = os.getenv("STOCKS_HELPER_CACHE_FALLBACK", "1") != "0"
+
         # Alpha Vantage free tier: 25 requests/day, 5 per minute
         self.quota_tracker = QuotaTracker(
             api_name="alpha_vantage", daily_limit=25, per_minute_limit=5
         )
+        # Paces concurrent Alpha Vantage requests to the per-minute limit
+        # (Yahoo Finance is not throttled)
+        self.alpha_vantage_limiter = TokenBucket(max_tokens=5, refill_interval=60)
+        # time.monotonic() before which the Alpha Vantage quota is known to be
+        # used up, so the rest of a batch skips it without checking again
+        self._alpha_vantage_cooldown_until = 0.0
+        # Event loop the persistent API client session was opened on
+        self._api_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # In-flight fetches per ticker: concurrent callers share one fetch
+        self._inflight: dict[str, asyncio.Task[Optional[dict[str, Any]]]] = {}
+        # Background refreshes of soon-to-expire cached histories, per ticker
+        self._refreshing: dict[str, asyncio.Task[Optional[dict[str, Any]]]] = {}
+        # Durations in seconds of recent Yahoo Finance history downloads
+        self._yahoo_fetch_seconds: deque[float] = deque(maxlen=FETCH_LATENCY_SAMPLES)
+
+    async def __aenter__(self) -> "MarketDataFetcher":
+        """Enter async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Exit async context manager and close the API client session."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the persistent API client session (reopened on the next request)."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.api_client.close()
+        self._api_client_loop = None
+
+    def _open_api_client(self) -> APIClient:
+        """
+        Return the API client with a session open on the running event loop.
+
+        The session and its connection pool stay open across requests, so
+        repeated Alpha Vantage calls reuse connections instead of repeating the
+        TCP and TLS handshakes. aiohttp sessions are bound to their event loop,
+        so a new one is opened when called from a different loop.
+
+        Returns:
+            API client ready for requests
+        """
+        loop = asyncio.get_running_loop()
+        if self._api_client_loop is not loop:
+            # A session from an earlier (finished) event loop cannot be reused
+            self.api_client.session = None
+            self._api_client_loop = loop
+        self.api_client.open()
+        return self.api_client
 
     async def fetch_daily_data(self, ticker: str) -> Optional[dict[str, Any]]:
         """
@@ -54,6 +172,29 @@ class MarketDataFetcher:
         1. Try Yahoo Finance (primary - unlimited, free)
         2. Try Alpha Vantage (fallback - 25 requests/day limit)
         3. Try cache (if APIs fail)
+        4. Try cache of any age, flagged "stale" (unless disabled)
+
+        Concurrent calls for the same ticker are coalesced: only the first one
+        fetches, the others await its result.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Dict with market data or None if all sources fail
+        """
+        task = self._inflight.get(ticker)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_daily_data(ticker))
+            self._inflight[ticker] = task
+            task.add_done_callback(lambda _: self._inflight.pop(ticker, None))
+
+        # Shield so a cancelled caller does not cancel the fetch other callers share
+        return await asyncio.shield(task)
+
+    async def _fetch_daily_data(self, ticker: str) -> Optional[dict[str, Any]]:
+        """
+        Fetch daily market data for a ticker, trying each source in turn.
 
         Args:
             ticker: Stock ticker symbol
@@ -65,25 +206,34 @@ class MarketDataFetcher:
         try:
             data = await self._fetch_yahoo_finance(ticker)
             if data:
-                logger.info(f"Fetched {ticker} from Yahoo Finance")
+                logger.info("Fetched %s from Yahoo Finance", ticker)
                 return data
         except Exception as e:
-            logger.warning(f"Yahoo Finance failed for {ticker}: {e}")
+            logger.warning("Yahoo Finance failed for %s: %s", ticker, e)
 
         # Fallback to Alpha Vantage (preserve quota for fundamentals)
         try:
             data = await self._fetch_alpha_vantage(ticker)
             if data:
-                logger.info(f"Fetched {ticker} from Alpha Vantage (fallback)")
+                logger.info("Fetched %s from Alpha Vantage (fallback)", ticker)
                 return data
         except Exception as e:
-            logger.warning(f"Alpha Vantage failed for {ticker}: {e}")
-
-        # Try cache as last resort
-        cached = self.cache.get("market_data", ticker, ttl_minutes=1440)  # 24 hours
-        if cached:
-            logger.info(f"Using cached data for {ticker}")
-            return cached
+            logger.warning("Alpha Vantage failed for %s: %s", ticker, e)
+
+        # Try cached histories as last resort
+        for source in ("yahoo_finance", "alpha_vantage"):
+            cached = self.cache.get(source, ticker, ttl_minutes=HISTORY_CACHE_TTL_MINUTES)
+            if cached:
+                logger.info("Using cached data for %s", ticker)
+                return cached
+
+        # Degraded mode: the last known data beats none during an outage
+        if self.serve_stale_cache:
+            for source in ("yahoo_finance", "alpha_vantage"):
+                stale = self.cache.get_stale(source, ticker)
+                if stale:
+                    logger.warning("All sources failed for %s, serving stale cached data", ticker)
+                    return {**stale, "stale": True}
 
         return None
 
@@ -105,13 +255,14 @@ class MarketDataFetcher:
         if cached:
             return cached
 
-        # Check quota before making API request
-        if not self.quota_tracker.can_make_request():
-            quota_info = self.quota_tracker.get_remaining_quota()
-            logger.warning(
-                f"Alpha Vantage quota exceeded: "
-                f"{quota_info['daily_used']}/{quota_info['daily_limit']} daily"
-            )
+        # Negative entry: the last response for this ticker had no data
+        if self.cache.get(
+            "alpha_vantage_empty", ticker, ttl_minutes=ALPHA_VANTAGE_EMPTY_TTL_MINUTES
+        ):
+            logger.debug("Skipping Alpha Vantage for %s: recent response had no data", ticker)
+            return None
+
+        if time.monotonic() < self._alpha_vantage_cooldown_until:
             return None
 
         url = "https://www.alphavantage.co/query"
@@ -123,57 +274,64 @@ class MarketDataFetcher:
         }
 
         try:
-            async with self.api_client as client:
+            async with self.alpha_vantage_limiter:
+                # Waits only while the per-minute quota is full and records the
+                # request before it is sent
+                if not await self.quota_tracker.acquire():
+                    quota_info = self.quota_tracker.get_remaining_quota()
+                    logger.warning(
+                        "Alpha Vantage quota exceeded: %s/%s daily",
+                        quota_info["daily_used"],
+                        quota_info["daily_limit"],
+                    )
+                    self._alpha_vantage_cooldown_until = (
+                        time.monotonic() + self.quota_tracker.retry_after_seconds()
+                    )
+                    return None
+                client = self._open_api_client()
                 response = await client.get(url, params=params)
 
-            # Record successful request
-            self.quota_tracker.record_request()
-
-            # Validate response with Pydantic
-            try:
-                validated_response = validate_alpha_vantage_response(response)
-            except ValidationError as e:
-                logger.error(f"Alpha Vantage response validation failed: {e}")
-                return None
-
-            time_series = validated_response.time_series
-            if not time_series:
-                return None
-
-            # Return ALL historical data (for storing in DB)
-            # But also identify the latest for caching
-            latest_date = max(time_series.keys())
-
-            # Build result with all historical data
-            historical_data = []
-            for date_str, data_point in time_series.items():
-                historical_data.append(
-                    {
-                        "ticker": ticker,
-                        "timestamp": date_str,
-                        "open": float(data_point.open),
-                        "high": float(data_point.high),
-                        "low": float(data_point.low),
-                        "close": float(data_point.close),
-                        "volume": int(data_point.volume),
-                        "source": "alpha_vantage",
-                        "is_latest": date_str == latest_date,
-                    }
-                )
-
-            # Cache the latest data point
-            latest_data = next(d for d in historical_data if d["is_latest"])
-            self.cache.set("alpha_vantage", ticker, latest_data)
+            # Check for error responses; data points are converted below directly
+            # from the raw dicts instead of being parsed into models first
+            time_series = validate_alpha_vantage_time_series(response)
+
+            # Build columns with all historical data (for storing in DB), oldest first
+            # (ISO date strings sort chronologically). The numeric strings are
+            # converted by NumPy in one call per dtype instead of float()/int() per value
+            dates = sorted(time_series)
+            raw_points = [_ALPHA_VANTAGE_FIELDS(time_series[date_str]) for date_str in dates]
+            prices = np.array([point[:4] for point in raw_points], dtype=np.float64)
+            volumes = np.array([point[4] for point in raw_points], dtype=np.int64)
+
+            invalid = (prices <= 0).any(axis=1) | (volumes < 0)
+            if invalid.any():
+                raise ValueError(f"Invalid data point for {ticker} on {dates[invalid.argmax()]}")
+
+            # Plain Python values: the payload is cached as JSON
+            columns: dict[str, list[Any]] = {
+                "timestamp": dates,
+                "open": prices[:, 0].tolist(),
+                "high": prices[:, 1].tolist(),
+                "low": prices[:, 2].tolist(),
+                "close": prices[:, 3].tolist(),
+                "volume": volumes.tolist(),
+            }
+
+            # Cache the full history; it is also the fallback when both APIs fail
+            payload = self._history_payload(ticker, "alpha_vantage", columns)
+            self.cache.set("alpha_vantage", ticker, payload)
 
             # Return all historical data for database storage
-            return {"historical": historical_data, "latest": latest_data}
+            return payload
 
         except ValueError as e:
-            # API errors from validation
-            logger.error(f"Alpha Vantage API error: {e}")
+            # API errors from validation; the request used quota, so remember
+            # the empty answer instead of asking again on the next update
+            logger.error("Alpha Vantage API error: %s", e)
+            self.cache.set("alpha_vantage_empty", ticker, {"status": "empty", "error": str(e)})
             return None
         except Exception as e:
-            logger.error(f"Alpha Vantage fetch failed: {e}")
+            logger.error("Alpha Vantage fetch failed: %s", e)
             return None
 
     async def _fetch_yahoo_finance(self, ticker: str) -> Optional[dict[str, Any]]:
@@ -189,219 +347,538 @@ class MarketDataFetcher:
         # Check cache first
         cached = self.cache.get("yahoo_finance", ticker)
         if cached:
+            self._schedule_refresh(ticker)
             return cached
 
         try:
-            # Import yfinance only when needed
-            import yfinance as yf
-
-            stock = yf.Ticker(ticker)
-            # Fetch 6 months of historical data (enough for technical analysis)
-            hist = stock.history(period="6mo")
-
-            if hist.empty:
-                return None
-
-            # Get latest date
-            latest_date = hist.index[-1]
-
-            # Build historical data list
-            historical_data = []
-            for date, row in hist.iterrows():
-                date_str = date.strftime("%Y-%m-%d")
-                historical_data.append(
-                    {
-                        "ticker": ticker,
-                        "timestamp": date_str,
-                        "open": float(row["Open"]),
-                        "high": float(row["High"]),
-                        "low": float(row["Low"]),
-                        "close": float(row["Close"]),
-                        "volume": int(row["Volume"]),
-                        "source": "yahoo_finance",
-                        "is_latest": date == latest_date,
-                    }
-                )
+            return await self._download_yahoo_history(ticker)
+        except Exception as e:
+            logger.error(f"Yahoo Finance fetch failed: {e}")
+            return None
 
-            # Cache the latest data point
-            latest_data = next(d for d in historical_data if d["is_latest"])
-            self.cache.set("yahoo_finance", ticker, latest_data)
+    async def _download_yahoo_history(self, ticker: str) -> Optional[dict[str, Any]]:
+        """
+        Download a ticker's history from Yahoo Finance, bypassing the cache.
 
-            # Return all historical data for database storage
-            return {"historical": historical_data, "latest": latest_data}
+        The download time is recorded for _schedule_refresh.
+
+        Args:
+            ticker: Stock ticker
+
+        Returns:
+            Market data dict with historical data or None if Yahoo has none
+        """
+        stock = yf.Ticker(ticker)
+        started = time.monotonic()
+        # Fetch 6 months of historical data (enough for technical analysis)
+        # in a worker thread so concurrent fetches overlap their network waits
+        hist = await self._run_yfinance(stock.history, period="6mo")
+        self._yahoo_fetch_seconds.append(time.monotonic() - started)
+
+        return self._build_yahoo_payload(ticker, hist)
+
+    def _schedule_refresh(self, ticker: str) -> None:
+        """
+        Refresh a cached Yahoo Finance history in the background if it expires soon.
 
-        except ImportError:
-            logger.error("yfinance not installed. Install with: pip install yfinance")
+        "Soon" is REFRESH_AHEAD_LATENCY_FACTOR times the p95 of recent download
+        times, so the new entry is normally written before the old one expires.
+        Nothing is scheduled before the first download has been timed, or while
+        a refresh for the ticker is already running.
+
+        Args:
+            ticker: Stock ticker served from the cache
+        """
+        if ticker in self._refreshing or not self._yahoo_fetch_seconds:
+            return
+
+        # Nearest-rank p95 over the recent samples
+        samples = sorted(self._yahoo_fetch_seconds)
+        p95 = samples[math.ceil(0.95 * len(samples)) - 1]
+
+        expires_in = self.cache.expires_in("yahoo_finance", ticker)
+        if expires_in is None or expires_in > REFRESH_AHEAD_LATENCY_FACTOR * p95:
+            return
+
+        logger.debug("Refreshing %s ahead of cache expiry (%.1fs left)", ticker, expires_in)
+        task = asyncio.ensure_future(self._refresh_yahoo_finance(ticker))
+        self._refreshing[ticker] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(ticker, None))
+
+    async def _refresh_yahoo_finance(self, ticker: str) -> Optional[dict[str, Any]]:
+        """Background refresh: download and cache a history, logging failures."""
+        try:
+            return await self._download_yahoo_history(ticker)
+        except Exception as e:
+            logger.debug(f"Background refresh of {ticker} failed: {e}")
             return None
+
+    async def _run_yfinance(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking yfinance call on the shared worker pool.
+
+        The event loop stays free meanwhile, so other tickers' fetches and
+        database writes proceed while Yahoo Finance responds.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._yfinance_executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _fetch_yahoo_finance_batch(self, tickers: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Fetch historical data for several tickers with one Yahoo Finance download.
+
+        Tickers with cached data are served from the cache; the rest are requested
+        together with yf.download instead of one history request per ticker.
+
+        Args:
+            tickers: Stock tickers (at most YAHOO_BATCH_SIZE for a single request)
+
+        Returns:
+            Dictionary mapping ticker to market data dict; tickers without data are omitted
+        """
+        result: dict[str, dict[str, Any]] = {}
+        to_download: list[str] = []
+        for ticker in tickers:
+            cached = self.cache.get("yahoo_finance", ticker)
+            if cached:
+                result[ticker] = cached
+            else:
+                to_download.append(ticker)
+
+        if not to_download:
+            return result
+
+        try:
+            data = await self._run_yfinance(
+                self._yf_download,
+                to_download,
+                period="6mo",
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+            )
         except Exception as e:
-            logger.error(f"Yahoo Finance fetch failed: {e}")
+            logger.error(f"Yahoo Finance batch fetch failed: {e}")
+            return result
+
+        if data is None or data.empty:
+            return result
+
+        # Columns are (ticker, field) pairs; older yfinance versions return flat
+        # columns when a single ticker is requested
+        downloaded = set(data.columns.get_level_values(0))
+        for ticker in to_download:
+            if ticker in downloaded:
+                hist = data[ticker]
+            elif len(to_download) == 1 and "Close" in data.columns:
+                hist = data
+            else:
+                continue
+
+            # Drop dates on which only the other tickers traded; a bad frame for one
+            # ticker (e.g. NaN volume) must not abort the rest of the batch
+            try:
+                payload = self._build_yahoo_payload(ticker, hist.dropna(subset=["Close"]))
+            except Exception as e:
+                logger.warning(f"Yahoo Finance batch data unusable for {ticker}: {e}")
+                continue
+            if payload:
+                result[ticker] = payload
+
+        return result
+
+    def _build_yahoo_payload(self, ticker: str, hist: Any) -> Optional[dict[str, Any]]:
+        """
+        Convert a Yahoo Finance history DataFrame into a market data dict.
+
+        The whole payload is cached under the yahoo_finance category.
+
+        Args:
+            ticker: Stock ticker
+            hist: DataFrame indexed by date with Open/High/Low/Close/Volume columns
+
+        Returns:
+            Market data dict with historical data or None if the DataFrame is empty
+        """
+        if hist.empty:
             return None
 
-    async def update_market_data(self, ticker: str) -> bool:
+        # Convert whole columns at once (dates formatted in one vectorized call)
+        # instead of building a Series or dict per row
+        columns = {
+            "timestamp": hist.index.strftime("%Y-%m-%d").tolist(),
+            "open": hist["Open"].astype(float).tolist(),
+            "high": hist["High"].astype(float).tolist(),
+            "low": hist["Low"].astype(float).tolist(),
+            "close": hist["Close"].astype(float).tolist(),
+            "volume": hist["Volume"].astype("int64").tolist(),
+        }
+
+        # Cache the full history; it is also the fallback when both APIs fail
+        payload = self._history_payload(ticker, "yahoo_finance", columns)
+        self.cache.set("yahoo_finance", ticker, payload)
+
+        # Return all historical data for database storage
+        return payload
+
+    @staticmethod
+    def _history_payload(ticker: str, source: str, columns: dict[str, list[Any]]) -> dict[str, Any]:
+        """
+        Wrap history columns into a market data payload.
+
+        The history is kept column-wise (one list per field, oldest first) so a
+        fetch allocates a handful of lists instead of a dict per trading day;
+        per-row parameter sets are only built when writing to the database.
+
+        Args:
+            ticker: Stock ticker
+            source: Data source name
+            columns: Lists keyed by HISTORY_COLUMNS, in date order
+
+        Returns:
+            Payload with "columns", "source" and the "latest" data point dict
+        """
+        latest = {name: columns[name][-1] for name in HISTORY_COLUMNS}
+        latest.update(ticker=ticker, source=source, is_latest=True)
+        return {"ticker": ticker, "source": source, "columns": columns, "latest": latest}
+
+    @staticmethod
+    def _columns_from_points(data_points: list[dict[str, Any]]) -> dict[str, list[Any]]:
+        """
+        Convert per-row data point dicts into history columns.
+
+        Covers single cached data points and history entries cached as lists of
+        dicts before payloads became column-wise.
+
+        Args:
+            data_points: Data point dicts keyed by HISTORY_COLUMNS
+
+        Returns:
+            Lists keyed by HISTORY_COLUMNS
+        """
+        return {name: [point[name] for point in data_points] for name in HISTORY_COLUMNS}
+
+    async def update_market_data(
+        self,
+        ticker: str,
+        prefetched: Optional[dict[str, Any]] = None,
+        security_id: Optional[str] = None,
+    ) -> bool:
         """
         Fetch and store market data in database.
 
-        If Alpha Vantage returns historical data, stores all of it.
-        If Yahoo Finance returns single data point, stores just that.
+        Historical payloads (from either API) are stored in full; a single cached
+        data point is stored as the latest price.
 
         Args:
             ticker: Stock ticker
+            prefetched: Market data already fetched for the ticker (e.g. by a batch
+                download); when given, no fetch is made
+            security_id: Id of the ticker's Security if already known (e.g. looked up
+                for a whole batch); when given, no lookup is made
 
         Returns:
             True if successful, False otherwise
         """
         from src.models import Security
 
-        data = await self.fetch_daily_data(ticker)
+        data = prefetched or await self.fetch_daily_data(ticker)
         if not data:
             return False
+        if data.get("stale"):
+            # Stale data was stored when it was fresh; there is nothing new to write
+            logger.warning("Only stale cached data available for %s, not updating", ticker)
+            return False
 
         try:
             with db_session() as session:
-                # Get or create Security
-                security = session.query(Security).filter(Security.ticker == ticker).first()
-                if not security:
+                # Get or create Security (only its id is needed)
+                if security_id is None:
+                    security_id = session.execute(
+                        select(Security.id).where(Security.ticker == ticker)
+                    ).scalar_one_or_none()
+                if security_id is None:
                     # Create a basic Security entry if it doesn't exist
                     security = Security(ticker=ticker, name=ticker)
                     session.add(security)
                     session.flush()
-
-                # Check if we have historical data (Alpha Vantage format)
-                if isinstance(data, dict) and "historical" in data:
-                    # Alpha Vantage - store all historical data
-                    historical_data = data["historical"]
-
-                    # Unmark previous latest with row locking to prevent race conditions
-                    with session.begin_nested():  # Savepoint for atomicity
-                        session.query(MarketData).filter(
-                            MarketData.security_id == security.id, MarketData.is_latest
-                        ).with_for_update().update({"is_latest": False}, synchronize_session=False)
-
-                    # Store all historical data points
-                    for data_point in historical_data:
-                        # Convert timestamp string to datetime
-                        timestamp = data_point["timestamp"]
-                        if isinstance(timestamp, str):
-                            timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-
-                        # Check if this data point already exists
-                        existing = (
-                            session.query(MarketData)
-                            .filter(
-                                MarketData.security_id == security.id,
-                                MarketData.timestamp == timestamp,
-                            )
-                            .first()
-                        )
-
-                        if existing:
-                            # Update existing record
-                            existing.price = data_point["close"]
-                            existing.open = data_point["open"]
-                            existing.high = data_point["high"]
-                            existing.low = data_point["low"]
-                            existing.close = data_point["close"]
-                            existing.volume = data_point["volume"]
-                            existing.data_source = data_point["source"]
-                            existing.is_latest = data_point.get("is_latest", False)
-                        else:
-                            # Create new record
-                            market_data = MarketData(
-                                security_id=security.id,
-                                timestamp=timestamp,
-                                price=data_point["close"],
-                                volume=data_point["volume"],
-                                open=data_point["open"],
-                                high=data_point["high"],
-                                low=data_point["low"],
-                                close=data_point["close"],
-                                data_source=data_point["source"],
-                                is_latest=data_point.get("is_latest", False),
-                            )
-                            session.add(market_data)
-
-                    logger.info(f"Stored {len(historical_data)} data points for {ticker}")
-                    return True
-
+                    security_id = security.id
+
+                # Check if we have historical data
+                if "columns" in data:
+                    columns = data["columns"]
+                    source = data["source"]
+                    latest_point = data["latest"]
+                elif "historical" in data:
+                    # History cached as a list of data point dicts
+                    columns = self._columns_from_points(data["historical"])
+                    source = data["latest"]["source"]
+                    latest_point = data["latest"]
                 else:
-                    # Yahoo Finance or cached data - single data point
-                    # Unmark previous latest with row locking to prevent race conditions
-                    with session.begin_nested():  # Savepoint for atomicity
-                        session.query(MarketData).filter(
-                            MarketData.security_id == security.id, MarketData.is_latest
-                        ).with_for_update().update({"is_latest": False}, synchronize_session=False)
-
-                    # Convert timestamp string back to datetime if needed
-                    timestamp = data["timestamp"]
-                    if isinstance(timestamp, str):
-                        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-
-                    # Check if this data point already exists
-                    existing = (
-                        session.query(MarketData)
-                        .filter(
-                            MarketData.security_id == security.id, MarketData.timestamp == timestamp
-                        )
-                        .first()
-                    )
+                    # Single cached data point (latest-only cache entries)
+                    columns = self._columns_from_points([data])
+                    source = data["source"]
+                    latest_point = data
+
+                # Nothing to write when the stored latest price already matches
+                # (weekends, after hours, repeated refreshes on the same day)
+                if self._is_latest_stored(session, security_id, latest_point):
+                    logger.debug("Market data for %s is already up to date", ticker)
+                    return True
 
-                    if existing:
-                        # Update existing
-                        existing.price = data["close"]
-                        existing.open = data["open"]
-                        existing.high = data["high"]
-                        existing.low = data["low"]
-                        existing.close = data["close"]
-                        existing.volume = data["volume"]
-                        existing.data_source = data["source"]
-                        existing.is_latest = True
-                    else:
-                        # Create new
-                        market_data = MarketData(
-                            security_id=security.id,
-                            timestamp=timestamp,
-                            price=data["close"],
-                            volume=data["volume"],
-                            open=data["open"],
-                            high=data["high"],
-                            low=data["low"],
-                            close=data["close"],
-                            data_source=data["source"],
-                            is_latest=True,
-                        )
-                        session.add(market_data)
+                # Write the prices first, then move the latest flag once
+                self._upsert_market_data(session, security_id, columns, source)
+                self._mark_latest(session, security_id, latest_point["timestamp"])
+                if len(columns["timestamp"]) > 1:
+                    logger.info("Stored %d data points for %s", len(columns["timestamp"]), ticker)
 
-                    return True
+                return True
 
         except IntegrityError as e:
-            logger.warning(f"Race condition detected for {ticker}, retrying: {e}")
+            logger.warning("Race condition detected for %s, retrying: %s", ticker, e)
             # Race condition - another process marked a record as is_latest
             # The unique partial index prevents data corruption
             # Return success as the data is already stored by another process
             return True
         except Exception as e:
-            logger.error(f"Failed to store market data: {e}")
+            logger.error("Failed to store market data: %s", e)
             return False
 
-    async def batch_update(self, tickers: list[str]) -> None:
+    def _is_latest_stored(
+        self, session: Session, security_id: str, latest_point: dict[str, Any]
+    ) -> bool:
+        """
+        Check whether the security's stored latest row matches a data point.
+
+        Both the date and the close are compared, since the current day's bar
+        keeps changing while the market is open.
+
+        Args:
+            session: Database session
+            security_id: Security to check
+            latest_point: Newest fetched data point (timestamp and close)
+
+        Returns:
+            True if the stored latest row has the same timestamp and close
+        """
+        stored = session.execute(
+            select(MarketData.timestamp, MarketData.close).where(
+                MarketData.security_id == security_id,
+                MarketData.is_latest == True,  # noqa: E712
+            )
+        ).one_or_none()
+        if stored is None or stored.close is None:
+            return False
+
+        # Prices are stored with 8 decimal places
+        return stored.timestamp == self._parse_timestamp(latest_point["timestamp"]) and (
+            math.isclose(float(stored.close), float(latest_point["close"]), abs_tol=1e-8)
+        )
+
+    def _upsert_market_data(
+        self,
+        session: Session,
+        security_id: str,
+        columns: dict[str, list[Any]],
+        source: str,
+    ) -> None:
+        """
+        Insert or update market data rows for a security in one statement.
+
+        Uses INSERT ... ON CONFLICT (security_id, timestamp) DO UPDATE, executed
+        with all data points as parameter sets, instead of looking up each
+        timestamp before inserting or updating it. The is_latest flag is left to
+        _mark_latest: new rows are inserted unflagged and existing rows keep theirs.
+
+        Args:
+            session: Database session
+            security_id: Security the data points belong to
+            columns: History columns keyed by HISTORY_COLUMNS
+            source: Data source stored with every row
+        """
+        if not columns["timestamp"]:
+            return
+
+        # Bind parameter sets straight from the payload columns; no ORM objects
+        # are built, and the driver binds every row in one executemany call
+        parse_timestamp = self._parse_timestamp
+        rows = [
+            {
+                "security_id": security_id,
+                "timestamp": parse_timestamp(timestamp),
+                "price": close,
+                "volume": volume,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "data_source": source,
+                "is_latest": False,
+            }
+            for timestamp, open_, high, low, close, volume in zip(
+                *(columns[name] for name in HISTORY_COLUMNS)
+            )
+        ]
+
+        stmt = sqlite_insert(MarketData)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MarketData.security_id, MarketData.timestamp],
+            set_={
+                column.name: column
+                for column in stmt.excluded
+                if column.name not in ("security_id", "timestamp", "is_latest")
+            },
+        )
+        session.execute(stmt, rows)
+
+    def _mark_latest(self, session: Session, security_id: str, timestamp: Any) -> None:
+        """
+        Flag the row at timestamp as the security's latest price.
+
+        Clears the previous latest row first, then sets the new one, each
+        statement touching only rows whose flag actually changes (none when the
+        latest date is unchanged). A single UPDATE flipping both rows is avoided
+        because SQLite checks the unique partial index on is_latest row by row.
+
+        Args:
+            session: Database session
+            security_id: Security whose latest price moves
+            timestamp: Timestamp of the new latest row (datetime or ISO string)
+        """
+        latest_timestamp = self._parse_timestamp(timestamp)
+        session.execute(
+            update(MarketData)
+            .where(
+                MarketData.security_id == security_id,
+                MarketData.is_latest == True,  # noqa: E712
+                MarketData.timestamp != latest_timestamp,
+            )
+            .values(is_latest=False)
+        )
+        session.execute(
+            update(MarketData)
+            .where(
+                MarketData.security_id == security_id,
+                MarketData.timestamp == latest_timestamp,
+                MarketData.is_latest == False,  # noqa: E712
+            )
+            .values(is_latest=True)
+        )
+
+    @staticmethod
+    def _parse_timestamp(timestamp: Any) -> datetime:
         """
-        Update market data for multiple tickers with rate limiting.
+        Convert a data point timestamp to datetime.
+
+        fromisoformat accepts a trailing "Z" since Python 3.11; datetimes are
+        passed through unparsed.
+
+        Args:
+            timestamp: ISO date/datetime string or datetime
+
+        Returns:
+            Parsed datetime
+        """
+        if isinstance(timestamp, str):
+            return datetime.fromisoformat(timestamp)
+        return cast(datetime, timestamp)
+
+    async def batch_update(
+        self, tickers: list[str], max_workers: int = BATCH_UPDATE_MAX_WORKERS
+    ) -> None:
+        """
+        Update market data for multiple tickers concurrently.
+
+        Yahoo Finance data is downloaded in chunks of YAHOO_BATCH_SIZE tickers first;
+        tickers missing from those downloads go through the regular per-ticker
+        fallback chain. Up to max_workers tickers are updated at once; Alpha
+        Vantage requests are additionally paced by the fetcher's token bucket, so
+        only that API's per-minute limit throttles the batch.
 
         Args:
             tickers: List of stock tickers
+            max_workers: Maximum number of tickers updated concurrently
+
+        Raises:
+            ValueError: If max_workers is not positive
         """
-        for i, ticker in enumerate(tickers):
-            logger.info(f"Fetching {ticker} ({i+1}/{len(tickers)})...")
-            success = await self.update_market_data(ticker)
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+
+        logger.info("Fetching %d tickers...", len(tickers))
+        prefetched: dict[str, dict[str, Any]] = {}
+        # Chunks read the cache concurrently; their downloads take turns (_yf_download)
+        for batch in await asyncio.gather(
+            *(
+                self._fetch_yahoo_finance_batch(tickers[start : start + YAHOO_BATCH_SIZE])
+                for start in range(0, len(tickers), YAHOO_BATCH_SIZE)
+            )
+        ):
+            prefetched.update(batch)
 
-            if success:
-                logger.info(f"✓ Updated {ticker}")
+        # Look up all security ids in one query instead of one per ticker
+        from src.models import Security
+
+        with db_session() as session:
+            rows = session.execute(
+                select(Security.ticker, Security.id).where(Security.ticker.in_(tickers))
+            )
+            security_ids = {ticker: security_id for ticker, security_id in rows}
+
+        # Bound the fan-out so a large portfolio does not open a fetch (and a
+        # database session) per ticker all at once
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def update_one(ticker: str) -> bool:
+            async with semaphore:
+                return await self.update_market_data(
+                    ticker,
+                    prefetched=prefetched.get(ticker),
+                    security_id=security_ids.get(ticker),
+                )
+
+        results = await asyncio.gather(
+            *(update_one(ticker) for ticker in tickers), return_exceptions=True
+        )
+
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, BaseException):
+                logger.warning("✗ Failed %s: %s", ticker, result)
+            elif result:
+                logger.info("✓ Updated %s", ticker)
             else:
-                logger.warning(f"✗ Failed {ticker}")
+                logger.warning("✗ Failed %s", ticker)
 
-            # Rate limiting: wait between requests
-            if i < len(tickers) - 1:
-                await asyncio.sleep(self.request_delay)
+    @staticmethod
+    def _is_yahoo_ticker(ticker: str) -> bool:
+        """
+        Check whether a ticker looks like one Yahoo Finance can quote.
+
+        Bonds and ISINs are skipped: tickers longer than MAX_YAHOO_TICKER_LENGTH,
+        or with digits after the first character, unless they end with a
+        European exchange suffix.
+
+        Args:
+            ticker: Stock ticker
+
+        Returns:
+            True if the ticker should be requested from Yahoo Finance
+        """
+        if len(ticker) > MAX_YAHOO_TICKER_LENGTH:
+            return False
+        # endswith() with a tuple and a compiled search both run in C
+        return ticker.endswith(EUROPEAN_EXCHANGE_SUFFIXES) or not _DIGIT_RE.search(ticker, 1)
 
     def get_current_prices(self, tickers: list[str]) -> dict[str, float]:
         """
@@ -439,24 +916,24 @@ class MarketDataFetcher:
 
         result: dict[str, float] = {}
         tickers_to_fetch: list[str] = []
-        now = datetime.now(timezone.utc)
 
         # Check in-memory cache first (fast path)
+        not_in_memory: list[str] = []
         for ticker in tickers:
-            # Try in-memory cache
-            if ticker in self._price_cache:
-                cached_price, cached_time = self._price_cache[ticker]
-                age = now - cached_time
-                if age.total_seconds() < 900:  # 15 minutes
-                    result[ticker] = cached_price
-                    continue
+            cached_price = self._get_cached_price(ticker)
+            if cached_price is not None:
+                result[ticker] = cached_price
+            else:
+                not_in_memory.append(ticker)
 
-            # Try file cache (survives across CLI calls)
-            cached = self.cache.get("current_price", ticker, ttl_minutes=15)
+        # Then the file cache (survives across CLI calls), read in one pass
+        file_hits = self.cache.get_many("current_price", not_in_memory, ttl_minutes=15)
+        for ticker in not_in_memory:
+            cached = file_hits.get(ticker)
             if cached and isinstance(cached, dict) and "price" in cached:
                 price = float(cached["price"])
                 # Store in memory for this request
-                self._price_cache[ticker] = (price, now)
+                self._remember_price(ticker, price)
                 result[ticker] = price
             else:
                 tickers_to_fetch.append(ticker)
@@ -465,23 +942,7 @@ class MarketDataFetcher:
         if tickers_to_fetch:
             # Filter out obvious invalid tickers to speed up bulk fetch
             # (complex ISINs, etc. that won't have Yahoo Finance data)
-            valid_tickers = []
-            for ticker in tickers_to_fetch:
-                # Skip bonds/ISINs: long tickers or tickers with many digits
-                # But allow European stocks that end with exchange suffix
-                is_european_stock = any(
-                    ticker.endswith(suffix) for suffix in [".HE", ".OL", ".VS", ".TL", ".AS", ".DE"]
-                )
-
-                has_digits = any(char.isdigit() for char in ticker[1:])
-
-                # Skip if:
-                # 1. Too long (likely ISIN/bond code)
-                # 2. Has digits AND is not a European stock (bonds usually have many digits)
-                if len(ticker) > 15 or (has_digits and not is_european_stock):
-                    continue
-
-                valid_tickers.append(ticker)
+            valid_tickers = [t for t in tickers_to_fetch if self._is_yahoo_ticker(t)]
 
             # Log filtering results
             logger.info(
@@ -492,88 +953,147 @@ class MarketDataFetcher:
             if not valid_tickers:
                 return result
 
+            # Suppress yfinance errors for invalid tickers (bonds, delisted stocks, etc.)
+            logging.getLogger("yfinance").setLevel(logging.CRITICAL)
+
+            # Download in chunks of YAHOO_BATCH_SIZE on the shared yfinance pool; the
+            # downloads themselves are serialized (see _yf_download) and fetch each
+            # chunk's tickers in parallel
+            chunks = [
+                valid_tickers[i : i + YAHOO_BATCH_SIZE]
+                for i in range(0, len(valid_tickers), YAHOO_BATCH_SIZE)
+            ]
+            start = time.time()
+            futures = {
+                self._yfinance_executor.submit(self._download_current_prices, chunk): chunk
+                for chunk in chunks
+            }
+            pending = set(futures)
+            failed: list[str] = []
             try:
-                # Use yf.download() for bulk fetching (faster than individual requests)
-                # Suppress yfinance errors for invalid tickers (bonds, delisted stocks, etc.)
-                import concurrent.futures
-                import logging as yf_logging
-                import time
-
-                yf_logging.getLogger("yfinance").setLevel(yf_logging.CRITICAL)
-
-                # Use thread executor with timeout to prevent hanging
-                def download_with_timeout() -> Any:
-                    return yf.download(
-                        valid_tickers,
-                        period="1d",
-                        progress=False,
-                        auto_adjust=True,
-                        show_errors=False,
-                        threads=False,  # Single-threaded for easier timeout handling
-                    )
-
-                start = time.time()
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(download_with_timeout)
+                for future in as_completed(futures, timeout=float(API_TIMEOUT_SECONDS)):
+                    pending.discard(future)
                     try:
-                        data = future.result(timeout=float(API_TIMEOUT_SECONDS))
-                        elapsed = time.time() - start
-                        logger.info(
-                            f"yf.download took {elapsed:.2f}s for {len(valid_tickers)} tickers"
-                        )
-                    except concurrent.futures.TimeoutError:
-                        logger.warning(
-                            f"yf.download timed out after {API_TIMEOUT_SECONDS}s for "
-                            f"{len(valid_tickers)} tickers, falling back to individual requests"
+                        prices = future.result()
+                    except Exception as e:
+                        logger.debug(
+                            f"Bulk fetch failed ({e}), falling back to individual requests"
                         )
-                        raise
-
-                yf_logging.getLogger("yfinance").setLevel(yf_logging.WARNING)
-
-                # Handle single ticker vs multiple tickers (different DataFrame structure)
-                if len(valid_tickers) == 1:
-                    ticker = valid_tickers[0]
-                    if not data.empty and "Close" in data.columns:
-                        price = float(data["Close"].iloc[-1])
-                        self._price_cache[ticker] = (price, now)
+                        failed.extend(futures[future])
+                        continue
+                    for ticker, price in prices.items():
+                        self._remember_price(ticker, price)
                         self.cache.set("current_price", ticker, {"price": price})
                         result[ticker] = price
-                else:
-                    # Multiple tickers - Close is a DataFrame with ticker columns
-                    if not data.empty and "Close" in data:
-                        for ticker in valid_tickers:
-                            if ticker in data["Close"].columns:
-                                price = float(data["Close"][ticker].iloc[-1])
-                                self._price_cache[ticker] = (price, now)
-                                self.cache.set("current_price", ticker, {"price": price})
-                                result[ticker] = price
-
-            except Exception as e:
-                # Bulk fetch failed - fall back to individual fetching for valid-looking tickers
-                logger.debug(f"Bulk fetch failed ({e}), falling back to individual requests")
-                for ticker in valid_tickers:
-                    # Skip obviously invalid tickers
-                    if "/" in ticker or len(ticker) > 10:
-                        continue
+            except FuturesTimeoutError:
+                logger.warning(
+                    f"yf.download timed out after {API_TIMEOUT_SECONDS}s for "
+                    f"{len(pending)} of {len(futures)} chunks, falling back to individual requests"
+                )
+                for future in pending:
+                    failed.extend(futures[future])
+            finally:
+                logging.getLogger("yfinance").setLevel(logging.WARNING)
+            elapsed = time.time() - start
+            logger.info(f"yf.download took {elapsed:.2f}s for {len(valid_tickers)} tickers")
+
+            # Chunks that failed - fall back to individual fetching for valid-looking tickers
+            for ticker in failed:
+                # Skip obviously invalid tickers
+                if "/" in ticker or len(ticker) > 10:
+                    continue
 
-                    try:
-                        yf_ticker = yf.Ticker(ticker)
-                        info = yf_ticker.info
-                        price = (
-                            info.get("currentPrice")
-                            or info.get("regularMarketPrice")
-                            or info.get("previousClose")
-                        )
-                        if price:
-                            price_float = float(price)
-                            self._price_cache[ticker] = (price_float, now)
-                            self.cache.set("current_price", ticker, {"price": price_float})
-                            result[ticker] = price_float
-                    except Exception:
-                        pass  # Silently skip tickers that fail
+                try:
+                    yf_ticker = yf.Ticker(ticker)
+                    info = yf_ticker.info
+                    price = (
+                        info.get("currentPrice")
+                        or info.get("regularMarketPrice")
+                        or info.get("previousClose")
+                    )
+                    if price:
+                        price_float = float(price)
+                        self._remember_price(ticker, price_float)
+                        self.cache.set("current_price", ticker, {"price": price_float})
+                        result[ticker] = price_float
+                except Exception:
+                    pass  # Silently skip tickers that fail
 
         return result
 
+    @classmethod
+    def _yf_download(cls, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call yf.download while holding the download lock.
+
+        yf.download is not re-entrant, so downloads run one at a time; each call
+        still fetches its tickers in parallel when threads=True.
+
+        Args:
+            *args: Positional arguments for yf.download
+            **kwargs: Keyword arguments for yf.download
+
+        Returns:
+            Result of yf.download
+        """
+        with cls._yf_download_lock:
+            return yf.download(*args, **kwargs)
+
+    @classmethod
+    def _download_current_prices(cls, tickers: list[str]) -> dict[str, float]:
+        """
+        Download the latest close for a chunk of tickers with one yf.download call.
+
+        Args:
+            tickers: Stock tickers (at most YAHOO_BATCH_SIZE)
+
+        Returns:
+            Dictionary mapping ticker to price; tickers without a close are omitted
+        """
+        data = cls._yf_download(
+            tickers,
+            period="1d",
+            progress=False,
+            auto_adjust=True,
+            threads=True,
+        )
+        if data is None or data.empty or "Close" not in data:
+            return {}
+
+        close = data["Close"]
+        # Close is a DataFrame with ticker columns; older yfinance versions return a
+        # Series for a single ticker
+        if close.ndim == 1:
+            series_by_ticker = {tickers[0]: close}
+        else:
+            series_by_ticker = {t: close[t] for t in tickers if t in close.columns}
+
+        prices: dict[str, float] = {}
+        for ticker, series in series_by_ticker.items():
+            series = series.dropna()
+            if not series.empty:
+                prices[ticker] = float(series.iloc[-1])
+        return prices
+
+    def _get_cached_price(self, ticker: str) -> Optional[float]:
+        """Return the in-memory price for ticker unless it is older than the TTL."""
+        entry = self._price_cache.get(ticker)
+        if entry is None:
+            return None
+        price, stored_at = entry
+        if time.monotonic() - stored_at >= self.PRICE_CACHE_TTL_SECONDS:
+            del self._price_cache[ticker]
+            return None
+        self._price_cache.move_to_end(ticker)
+        return price
+
+    def _remember_price(self, ticker: str, price: float) -> None:
+        """Store a price in memory, evicting the least recently used beyond the limit."""
+        self._price_cache[ticker] = (price, time.monotonic())
+        self._price_cache.move_to_end(ticker)
+        while len(self._price_cache) > self.PRICE_CACHE_MAX_ENTRIES:
+            self._price_cache.popitem(last=False)
+
     def get_current_price(self, ticker: str) -> Optional[float]:
         """
         Get current price from Yahoo Finance with 15-minute in-memory caching.
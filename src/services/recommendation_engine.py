@@ -1,9 +1,13 @@
 """Recommendation engine for buy/sell/hold decisions."""
 
+import asyncio
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import select
+
 from src.lib.config import (
     CONFIDENCE_HIGH_THRESHOLD,
     CONFIDENCE_MEDIUM_THRESHOLD,
@@ -36,6 +40,7 @@ from src.lib.config import (
     TECHNICAL_SCORE_RSI_OVERSOLD,
 )
 from src.lib.db import db_session
+from src.models.fundamental_data import FundamentalData
 from src.models.recommendation import ConfidenceLevel, RecommendationType, StockRecommendation
 from src.services.fundamental_analyzer import FundamentalAnalyzer
 from src.services.indicator_calculator import IndicatorCalculator
@@ -46,6 +51,21 @@ logger = logging.getLogger(__name__)
 class RecommendationEngine:
     """Generates buy/sell/hold recommendations using combined analysis."""
 
+    # Fundamental scores kept in memory
+    FUNDAMENTAL_SCORE_CACHE_MAX_ENTRIES = 4096
+
+    # Maximum number of tickers generate_recommendations scores at once (each
+    # loads its indicators and fundamentals on two worker threads)
+    MAX_CONCURRENT_BUILDS = 4
+
+    # Class-level LRU shared across instances within one process:
+    # (security_id, fundamentals timestamp) -> (score, signals). Fundamental
+    # snapshots are never updated in place (a refresh adds a row with a new
+    # timestamp), so an entry stays valid for as long as it is kept
+    _fundamental_scores: "OrderedDict[tuple[str, datetime], tuple[int, tuple[str, ...]]]" = (
+        OrderedDict()
+    )
+
     def __init__(self) -> None:
         """Initialize recommendation engine."""
         self.indicator_calc = IndicatorCalculator()
@@ -155,9 +175,47 @@ class RecommendationEngine:
             Tuple of (score, signals list)
         """
         fundamentals = self.fundamental_analyzer.get_latest_fundamentals(ticker)
+        return self._fundamental_score_of(fundamentals)
+
+    def _fundamental_score_of(
+        self, fundamentals: Optional[FundamentalData]
+    ) -> tuple[int, list[str]]:
+        """
+        Fundamental score of an already loaded snapshot (see calculate_fundamental_score).
+
+        Args:
+            fundamentals: Latest fundamental data of a ticker, or None if there is none
+
+        Returns:
+            Tuple of (score, signals list)
+        """
         if not fundamentals:
             return 50, ["No fundamental data available"]
 
+        # The same snapshot always scores the same; skip the analyzers on a repeat
+        cache_key = (fundamentals.security_id, fundamentals.timestamp)
+        cached = self._fundamental_scores.get(cache_key)
+        if cached is not None:
+            self._fundamental_scores.move_to_end(cache_key)
+            return cached[0], list(cached[1])
+
+        score, signals = self._score_fundamentals(fundamentals)
+
+        self._fundamental_scores[cache_key] = (score, tuple(signals))
+        while len(self._fundamental_scores) > self.FUNDAMENTAL_SCORE_CACHE_MAX_ENTRIES:
+            self._fundamental_scores.popitem(last=False)
+        return score, signals
+
+    def _score_fundamentals(self, fundamentals: FundamentalData) -> tuple[int, list[str]]:
+        """
+        Run the fundamental analyzers on a loaded snapshot (no database access).
+
+        Args:
+            fundamentals: Latest fundamental data of a ticker
+
+        Returns:
+            Tuple of (score, signals list)
+        """
         total_score = 0
         all_signals = []
 
@@ -255,23 +313,29 @@ class RecommendationEngine:
 
         return "\n".join(rationale_parts)
 
-    async def generate_recommendation(
-        self, ticker: str, portfolio_id: str
-    ) -> Optional[StockRecommendation]:
+    async def _build_recommendation(self, ticker: str, portfolio_id: str) -> StockRecommendation:
         """
-        Generate comprehensive stock recommendation.
+        Score a ticker and build its recommendation row without storing it.
+
+        Indicators and fundamentals are independent blocking database reads, so
+        they are loaded concurrently on worker threads. The returned row has no
+        security_id yet; callers resolve it when storing.
 
         Args:
             ticker: Stock ticker
             portfolio_id: Portfolio ID
 
         Returns:
-            StockRecommendation object or None
+            Unsaved StockRecommendation
         """
-        # Calculate technical score
-        indicators: Optional[dict[str, float]] = self.indicator_calc.calculate_all_indicators(
-            ticker
+        indicators: Optional[dict[str, float]]
+        fundamentals: Optional[FundamentalData]
+        indicators, fundamentals = await asyncio.gather(
+            asyncio.to_thread(self.indicator_calc.calculate_all_indicators, ticker),
+            asyncio.to_thread(self.fundamental_analyzer.get_latest_fundamentals, ticker),
         )
+
+        # Calculate technical score
         technical_score: int
         technical_signals: list[str]
         if indicators:
@@ -282,7 +346,7 @@ class RecommendationEngine:
         # Calculate fundamental score
         fundamental_score: int
         fundamental_signals: list[str]
-        fundamental_score, fundamental_signals = self.calculate_fundamental_score(ticker)
+        fundamental_score, fundamental_signals = self._fundamental_score_of(fundamentals)
 
         # Determine recommendation and confidence
         recommendation: RecommendationType
@@ -303,42 +367,125 @@ class RecommendationEngine:
         # Combined score
         combined_score: int = int((technical_score + fundamental_score) / 2)
 
+        return StockRecommendation(
+            portfolio_id=portfolio_id,
+            timestamp=datetime.now(),
+            recommendation=recommendation,
+            confidence=confidence,
+            technical_score=technical_score,
+            fundamental_score=fundamental_score,
+            combined_score=combined_score,
+            technical_signals=technical_signals,
+            fundamental_signals=fundamental_signals,
+            rationale=rationale,
+        )
+
+    async def generate_recommendation(
+        self, ticker: str, portfolio_id: str
+    ) -> Optional[StockRecommendation]:
+        """
+        Generate comprehensive stock recommendation.
+
+        Args:
+            ticker: Stock ticker
+            portfolio_id: Portfolio ID
+
+        Returns:
+            StockRecommendation object or None
+        """
+        stock_rec = await self._build_recommendation(ticker, portfolio_id)
+
         # Store in database
         try:
             from src.models import Security
 
             with db_session() as session:
-                # Get or create Security
-                security = session.query(Security).filter(Security.ticker == ticker).first()
-                if not security:
-                    # Create a basic Security entry if it doesn't exist
-                    security = Security(ticker=ticker, name=ticker)
-                    session.add(security)
-                    session.flush()
-
-                stock_rec = StockRecommendation(
-                    security_id=security.id,
-                    portfolio_id=portfolio_id,
-                    timestamp=datetime.now(),
-                    recommendation=recommendation,
-                    confidence=confidence,
-                    technical_score=technical_score,
-                    fundamental_score=fundamental_score,
-                    combined_score=combined_score,
-                    technical_signals=technical_signals,
-                    fundamental_signals=fundamental_signals,
-                    rationale=rationale,
-                )
+                # Only the id is needed; no Security entity is loaded
+                security_id = session.scalar(select(Security.id).where(Security.ticker == ticker))
+                if security_id is None:
+                    # A Security needs a type and currency this engine does not know
+                    logger.warning(f"No security found for {ticker}, recommendation not stored")
+                    return None
+
+                stock_rec.security_id = security_id
 
                 session.add(stock_rec)
                 session.flush()
-                session.refresh(stock_rec)
+                # Every column is set client-side (id and timestamp defaults are
+                # Python callables), so nothing needs reloading. Detach the row so
+                # its values stay readable after the commit expires the session
+                session.expunge(stock_rec)
                 return stock_rec
 
         except Exception as e:
             logger.error(f"Failed to store recommendation: {e}")
             return None
 
+    async def generate_recommendations(
+        self, tickers: list[str], portfolio_id: str
+    ) -> dict[str, StockRecommendation]:
+        """
+        Generate and store recommendations for several tickers in one transaction.
+
+        All tickers are scored first, up to MAX_CONCURRENT_BUILDS at a time;
+        the rows are then stored with one
+        securities lookup and a single flush instead of a session per ticker.
+        Tickers without a Security row are skipped, since the engine does not
+        know the type and currency a new security needs.
+
+        Args:
+            tickers: Stock tickers (duplicates are scored once)
+            portfolio_id: Portfolio ID
+
+        Returns:
+            Dict mapping ticker to its stored StockRecommendation; skipped
+            tickers are omitted, and nothing is returned if storing fails
+        """
+        unique_tickers = list(dict.fromkeys(tickers))
+        if not unique_tickers:
+            return {}
+
+        # Bounded so a large portfolio does not exhaust the connection pool
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_BUILDS)
+
+        async def build(ticker: str) -> StockRecommendation:
+            async with semaphore:
+                return await self._build_recommendation(ticker, portfolio_id)
+
+        built = await asyncio.gather(*(build(ticker) for ticker in unique_tickers))
+        recommendations = dict(zip(unique_tickers, built))
+
+        try:
+            from src.models import Security
+
+            with db_session() as session:
+                security_ids = {
+                    security_ticker: security_id
+                    for security_ticker, security_id in session.query(
+                        Security.ticker, Security.id
+                    ).filter(Security.ticker.in_(recommendations))
+                }
+
+                stored: dict[str, StockRecommendation] = {}
+                for ticker, stock_rec in recommendations.items():
+                    security_id = security_ids.get(ticker)
+                    if security_id is None:
+                        logger.warning(f"No security found for {ticker}, recommendation skipped")
+                        continue
+                    stock_rec.security_id = security_id
+                    stored[ticker] = stock_rec
+
+                session.add_all(stored.values())
+                session.flush()
+                # Detach the rows so their loaded values stay readable after the
+                # commit expires everything still in the session
+                session.expunge_all()
+                return stored
+
+        except Exception as e:
+            logger.error(f"Failed to store recommendations: {e}")
+            return {}
+
     def get_latest_recommendation(
         self, ticker: str, portfolio_id: str
     ) -> Optional[StockRecommendation]:
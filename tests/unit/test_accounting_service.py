@@ -20,6 +20,7 @@ from src.models import (
 )
 from src.services.accounting_service import (
     get_account_balance,
+    get_account_balances,
     get_next_entry_number,
     initialize_chart_of_accounts,
     record_transaction_as_journal_entry,
@@ -580,3 +581,64 @@ class TestGetAccountBalance:
 
         with pytest.raises(ValueError, match="Account .* not found"):
             get_account_balance(mock_session, "invalid-id")
+
+
+class TestGetAccountBalances:
+    """Tests for get_account_balances function."""
+
+    def test_get_account_balances_uses_normal_balance_side(self, mock_session):
+        """Test aggregated balances for asset and revenue accounts."""
+        asset = ChartAccount(
+            id=str(uuid4()),
+            portfolio_id=str(uuid4()),
+            code="1000",
+            name="Cash",
+            type=AccountType.ASSET,
+            category=AccountCategory.CASH,
+            currency="EUR",
+        )
+        revenue = ChartAccount(
+            id=str(uuid4()),
+            portfolio_id=asset.portfolio_id,
+            code="4000",
+            name="Dividend Income",
+            type=AccountType.REVENUE,
+            category=AccountCategory.DIVIDEND_INCOME,
+            currency="EUR",
+        )
+        unused = ChartAccount(
+            id=str(uuid4()),
+            portfolio_id=asset.portfolio_id,
+            code="4100",
+            name="Interest Income",
+            type=AccountType.REVENUE,
+            category=AccountCategory.INTEREST_INCOME,
+            currency="EUR",
+        )
+
+        # First query loads accounts, second returns per-account totals
+        accounts_result = MagicMock()
+        accounts_result.scalars.return_value = [asset, revenue, unused]
+        totals_result = MagicMock()
+        totals_result.tuples.return_value = [
+            (asset.id, Decimal("1000.00"), Decimal("300.00")),
+            (revenue.id, Decimal("0"), Decimal("500.00")),
+        ]
+        mock_session.execute.side_effect = [accounts_result, totals_result]
+
+        balances = get_account_balances(mock_session, [asset.id, revenue.id, unused.id])
+
+        assert balances == {
+            asset.id: Decimal("700.00"),
+            revenue.id: Decimal("500.00"),
+            unused.id: Decimal("0"),
+        }
+
+    def test_get_account_balances_invalid_account(self, mock_session):
+        """Test that an unknown account raises error."""
+        accounts_result = MagicMock()
+        accounts_result.scalars.return_value = []
+        mock_session.execute.return_value = accounts_result
+
+        with pytest.raises(ValueError, match="Account .* not found"):
+            get_account_balances(mock_session, ["invalid-id"])
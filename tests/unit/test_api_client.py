@@ -45,6 +45,14 @@ class TestAPIClient:
             assert client.session is not None
             assert isinstance(client.session, aiohttp.ClientSession)
 
+    async def test_session_uses_bounded_connector(self, api_client):
+        """The session's connector pools connections and caches DNS lookups."""
+        async with api_client as client:
+            connector = client.session.connector
+            assert connector.limit == APIClient.CONNECTION_LIMIT
+            assert connector.limit_per_host == APIClient.CONNECTION_LIMIT_PER_HOST
+            assert connector.use_dns_cache
+
     async def test_context_manager_closes_session(self, api_client):
         """Session is closed when exiting context."""
         async with api_client as client:
@@ -226,6 +234,44 @@ class TestAPIClient:
             # Should only try once (no retry on 500)
             assert mock_req.call_count == 1
 
+    async def test_transient_errors_retry_with_jittered_backoff(self, api_client):
+        """Gateway errors and dropped connections are retried after a backoff."""
+        with (
+            patch.object(api_client, "_make_request", new_callable=AsyncMock) as mock_req,
+            patch("src.lib.api_client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+        ):
+            unavailable = aiohttp.ClientResponseError(
+                request_info=MagicMock(), history=(), status=503, message="Service Unavailable"
+            )
+            mock_req.side_effect = [
+                unavailable,
+                aiohttp.ServerDisconnectedError(),
+                {"data": "success"},
+            ]
+
+            async with api_client:
+                result = await api_client.get("/test", use_cache=False)
+
+        assert result == {"data": "success"}
+        assert mock_req.call_count == 3
+        delays = [call.args[0] for call in mock_sleep.await_args_list]
+        assert 1 <= delays[0] <= 1 + APIClient.RETRY_JITTER_SECONDS
+        assert 2 <= delays[1] <= 2 + APIClient.RETRY_JITTER_SECONDS
+
+    async def test_connection_error_after_max_retries(self, api_client):
+        """A connection that keeps failing is reported as a network error."""
+        with (
+            patch.object(api_client, "_make_request", new_callable=AsyncMock) as mock_req,
+            patch("src.lib.api_client.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            mock_req.side_effect = aiohttp.ClientConnectionError("Connection reset")
+
+            async with api_client:
+                with pytest.raises(APIError, match="Network error"):
+                    await api_client.get("/test", use_cache=False)
+
+        assert mock_req.call_count == api_client.max_retries
+
     async def test_network_error_no_retry(self, api_client):
         """Network errors don't retry."""
         with patch.object(api_client, "_make_request", new_callable=AsyncMock) as mock_req:
@@ -325,3 +371,20 @@ class TestAPIClient:
             # Verify custom timeout was passed
             call_args = mock_req.call_args
             assert call_args[0][3] == 30
+
+    async def test_make_request_decodes_raw_body(self, api_client):
+        """The response body is read once as bytes and decoded as JSON."""
+        response = MagicMock()
+        response.status = 200
+        response.read = AsyncMock(return_value=b'{"price": "1.25", "rows": [1, 2]}')
+        response.__aenter__ = AsyncMock(return_value=response)
+        response.__aexit__ = AsyncMock(return_value=None)
+        session = MagicMock()
+        session.get.return_value = response
+        api_client.session = session
+
+        result = await api_client._make_request("/quote", None, None, 10)
+
+        assert result == {"price": "1.25", "rows": [1, 2]}
+        response.read.assert_awaited_once()
+        response.json.assert_not_called()
@@ -65,7 +65,7 @@ class TestBatchProcessor:
                 return_value=True
             )
             batch_processor.currency_converter.update_rates = AsyncMock(return_value=True)
-            batch_processor.recommendation_engine.generate_recommendation = AsyncMock(
+            batch_processor.recommendation_engine.generate_recommendations = AsyncMock(
                 return_value=MagicMock()
             )
             batch_processor.insight_generator.generate_portfolio_insights = AsyncMock(
@@ -164,7 +164,7 @@ class TestBatchProcessor:
                 return_value=True
             )
             batch_processor.currency_converter.update_rates = AsyncMock(return_value=True)
-            batch_processor.recommendation_engine.generate_recommendation = AsyncMock(
+            batch_processor.recommendation_engine.generate_recommendations = AsyncMock(
                 return_value=MagicMock()
             )
             batch_processor.insight_generator.generate_portfolio_insights = AsyncMock(
@@ -206,7 +206,7 @@ class TestBatchProcessor:
                 return_value=True
             )
             batch_processor.currency_converter.update_rates = AsyncMock(return_value=True)
-            batch_processor.recommendation_engine.generate_recommendation = AsyncMock(
+            batch_processor.recommendation_engine.generate_recommendations = AsyncMock(
                 return_value=MagicMock()
             )
             batch_processor.insight_generator.generate_portfolio_insights = AsyncMock(
@@ -242,7 +242,7 @@ class TestBatchProcessor:
                 return_value=True
             )
             batch_processor.currency_converter.update_rates = AsyncMock(return_value=True)
-            batch_processor.recommendation_engine.generate_recommendation = AsyncMock(
+            batch_processor.recommendation_engine.generate_recommendations = AsyncMock(
                 return_value=MagicMock()
             )
             batch_processor.insight_generator.generate_portfolio_insights = AsyncMock(
@@ -282,7 +282,7 @@ class TestBatchProcessor:
                 return_value=True
             )
             batch_processor.currency_converter.update_rates = AsyncMock(return_value=True)
-            batch_processor.recommendation_engine.generate_recommendation = AsyncMock(
+            batch_processor.recommendation_engine.generate_recommendations = AsyncMock(
                 return_value=MagicMock()
             )
             batch_processor.insight_generator.generate_portfolio_insights = AsyncMock(
@@ -406,7 +406,7 @@ class TestBatchProcessor:
                 return_value=True
             )
             batch_processor.currency_converter.update_rates = AsyncMock(return_value=True)
-            batch_processor.recommendation_engine.generate_recommendation = AsyncMock(
+            batch_processor.recommendation_engine.generate_recommendations = AsyncMock(
                 return_value=MagicMock()
             )
             batch_processor.insight_generator.generate_portfolio_insights = AsyncMock(
@@ -0,0 +1,165 @@
+"""Unit tests for CacheManager."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.lib.cache import CacheManager
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Provide CacheManager with a temporary directory and fixed TTL."""
+    return CacheManager(cache_dir=tmp_path / "cache", use_market_hours=False)
+
+
+@pytest.mark.unit
+class TestCacheManager:
+    """Test suite for CacheManager."""
+
+    def test_set_then_get_round_trip(self, cache):
+        """Stored data is returned until it expires."""
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+
+        assert cache.get("yahoo_finance", "AAPL") == {"close": 150.0}
+        assert cache.get("yahoo_finance", "MSFT") is None
+
+    def test_set_replaces_file_atomically(self, cache):
+        """Writes go through a temporary file that is renamed over the entry."""
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+        cache.set("yahoo_finance", "AAPL", {"close": 151.0})
+
+        assert [p.name for p in cache.cache_dir.iterdir()] == ["yahoo_finance_AAPL_latest.json"]
+        CacheManager._memory.clear()
+        assert cache.get("yahoo_finance", "AAPL") == {"close": 151.0}
+
+    def test_memory_hit_skips_disk(self, cache):
+        """A fresh in-process entry is served without reading the file."""
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+        # Corrupt the file: only the in-process layer can still answer
+        cache._get_cache_path("yahoo_finance_AAPL_latest").write_text("not json")
+
+        assert cache.get("yahoo_finance", "AAPL") == {"close": 150.0}
+
+    def test_disk_entry_shared_with_new_instance(self, cache, tmp_path):
+        """Files written by one instance are read by another and then kept in memory."""
+        cache.set("alpha_vantage", "AAPL", {"close": 150.0})
+        CacheManager._memory.clear()
+
+        other = CacheManager(cache_dir=tmp_path / "cache", use_market_hours=False)
+        assert other.get("alpha_vantage", "AAPL") == {"close": 150.0}
+        assert (str(tmp_path / "cache"), "alpha_vantage_AAPL_latest") in CacheManager._memory
+
+    def test_expired_entries_are_not_returned(self, cache):
+        """Both layers honour the TTL requested by the caller."""
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+        path = cache._get_cache_path("yahoo_finance_AAPL_latest")
+        old = time.time() - 2 * 3600
+        os.utime(path, (old, old))
+        CacheManager._memory.clear()
+
+        assert cache.get("yahoo_finance", "AAPL", ttl_minutes=60) is None
+        assert cache.get("yahoo_finance", "AAPL", ttl_minutes=1440) == {"close": 150.0}
+
+    def test_get_stale_ignores_age(self, cache):
+        """Stale lookups return entries however old they are."""
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+        path = cache._get_cache_path("yahoo_finance_AAPL_latest")
+        old = time.time() - 30 * 24 * 3600
+        os.utime(path, (old, old))
+        CacheManager._memory.clear()
+
+        assert cache.get("yahoo_finance", "AAPL", ttl_minutes=1440) is None
+        assert cache.get_stale("yahoo_finance", "AAPL") == {"close": 150.0}
+        assert cache.get_stale("yahoo_finance", "MSFT") is None
+
+    def test_expires_in_reports_remaining_lifetime(self, tmp_path):
+        """The remaining TTL shrinks with the entry's age and is None once expired."""
+        cache = CacheManager(cache_dir=tmp_path, use_market_hours=False, ttl_jitter=0)
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+
+        assert 59 * 60 < cache.expires_in("yahoo_finance", "AAPL", ttl_minutes=60) <= 60 * 60
+        assert cache.expires_in("yahoo_finance", "MSFT") is None
+
+        path = cache._get_cache_path("yahoo_finance_AAPL_latest")
+        old = time.time() - 50 * 60
+        os.utime(path, (old, old))
+        CacheManager._memory.clear()
+
+        assert 9 * 60 < cache.expires_in("yahoo_finance", "AAPL", ttl_minutes=60) <= 10 * 60
+        assert cache.expires_in("yahoo_finance", "AAPL", ttl_minutes=30) is None
+
+    def test_get_many_combines_memory_and_disk(self, cache):
+        """Bulk lookups return fresh entries from either layer and skip the rest."""
+        cache.set("current_price", "AAPL", {"price": 150.0})
+        cache.set("current_price", "MSFT", {"price": 400.0})
+        cache.set("current_price", "OLD", {"price": 1.0})
+        old = time.time() - 2 * 3600
+        os.utime(cache._get_cache_path("current_price_OLD_latest"), (old, old))
+        CacheManager._memory.clear()
+        cache.set("current_price", "AAPL", {"price": 151.0})  # In memory again
+
+        result = cache.get_many("current_price", ["AAPL", "MSFT", "OLD", "NONE"], ttl_minutes=15)
+
+        assert result == {"AAPL": {"price": 151.0}, "MSFT": {"price": 400.0}}
+        assert cache.get_many("current_price", [], ttl_minutes=15) == {}
+
+    def test_clear_ticker_drops_memory_entries(self, cache):
+        """Clearing a ticker removes it from memory as well as disk."""
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+        cache.set("yahoo_finance", "MSFT", {"close": 400.0})
+
+        cache.clear_ticker("AAPL")
+
+        assert cache.get("yahoo_finance", "AAPL") is None
+        assert cache.get("yahoo_finance", "MSFT") == {"close": 400.0}
+
+    def test_memory_layer_is_bounded(self, cache, monkeypatch):
+        """Least recently used entries are evicted beyond the size limit."""
+        monkeypatch.setattr(CacheManager, "MEMORY_MAX_ENTRIES", 2)
+        CacheManager._memory.clear()
+
+        for ticker in ("A", "B", "C"):
+            cache.set("yahoo_finance", ticker, {"ticker": ticker})
+
+        assert len(CacheManager._memory) == 2
+        assert (str(cache.cache_dir), "yahoo_finance_A_latest") not in CacheManager._memory
+
+    def test_ttl_jitter_is_stable_per_entry(self, cache):
+        """Each entry gets a fixed TTL offset within the jitter fraction."""
+        factors = {cache._ttl_jitter_factor(f"yahoo_finance_T{i}_latest") for i in range(20)}
+
+        assert all(0.9 <= factor <= 1.1 for factor in factors)
+        assert len(factors) > 1  # Entries do not share one expiry
+        assert cache._ttl_jitter_factor("yahoo_finance_T1_latest") == cache._ttl_jitter_factor(
+            "yahoo_finance_T1_latest"
+        )
+        assert CacheManager(cache_dir=cache.cache_dir, ttl_jitter=0)._ttl_jitter_factor("x") == 1
+
+    def test_ttl_jitter_spreads_expiry(self, tmp_path):
+        """The entry's jitter stretches or shrinks the TTL by up to the jitter fraction."""
+        cache = CacheManager(cache_dir=tmp_path / "jitter", use_market_hours=False)
+        cache.set("yahoo_finance", "AAPL", {"close": 150.0})
+        path = cache._get_cache_path("yahoo_finance_AAPL_latest")
+        old = time.time() - 64 * 60
+        os.utime(path, (old, old))
+        CacheManager._memory.clear()
+
+        # 64 minutes old: fresh under a +10% TTL of 66 minutes, stale under -10%
+        with patch.object(CacheManager, "_ttl_jitter_factor", return_value=1.1):
+            assert cache.get("yahoo_finance", "AAPL", ttl_minutes=60) == {"close": 150.0}
+        CacheManager._memory.clear()
+        with patch.object(CacheManager, "_ttl_jitter_factor", return_value=0.9):
+            assert cache.get("yahoo_finance", "AAPL", ttl_minutes=60) is None
+
+    def test_market_hours_ttl_is_reused(self, tmp_path):
+        """The market-hours TTL is computed once per refresh window, not per lookup."""
+        cache = CacheManager(cache_dir=tmp_path / "market", exchange="TEST")
+
+        with patch("src.lib.cache.get_cache_ttl", return_value=300) as mock_ttl:
+            for _ in range(3):
+                cache.get("yahoo_finance", "AAPL")
+
+        mock_ttl.assert_called_once_with("TEST")
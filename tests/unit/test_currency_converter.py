@@ -0,0 +1,30 @@
+"""Unit tests for CurrencyConverter."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.lib.db import db_session
+from src.models.exchange_rate import ExchangeRate
+from src.services.currency_converter import CurrencyConverter
+
+
+@pytest.mark.unit
+class TestCurrencyConverter:
+    """Test suite for CurrencyConverter."""
+
+    def test_cache_rate_inserts_then_overwrites(self):
+        """Caching a rate twice for the same pair and date keeps one updated row."""
+        converter = CurrencyConverter()
+        rate_date = date(2025, 10, 3)
+
+        converter._cache_rate("USD", "EUR", 0.91, rate_date)
+        converter._cache_rate("USD", "EUR", 0.92, rate_date)
+
+        with db_session() as session:
+            rates = session.query(ExchangeRate).all()
+            stored = [(r.from_currency, r.to_currency, r.date, r.rate) for r in rates]
+
+        assert stored == [("USD", "EUR", rate_date, Decimal("0.92"))]
+        assert converter._get_cached_rate("USD", "EUR", rate_date) == pytest.approx(0.92)
@@ -0,0 +1,743 @@
+"""Unit tests for lot tracking service (FIFO and mark-to-market)."""
+
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import delete, event
+from sqlalchemy.orm import Session
+
+from src.lib.db import get_session
+from src.models import (
+    Account,
+    Holding,
+    JournalEntry,
+    JournalEntryStatus,
+    JournalEntryType,
+    JournalLine,
+    MarketData,
+    Portfolio,
+    PositionSummary,
+    Security,
+    SecurityLot,
+    SecurityType,
+    StockSplit,
+    Transaction,
+    TransactionType,
+)
+from src.models.currency_lot import CurrencyLot
+from src.models.position_summary import _rebuild_position_summaries_after_flush
+from src.services.accounting_service import initialize_chart_of_accounts
+from src.services.lot_tracking_service import (
+    allocate_lots_fifo,
+    apply_split_to_existing_lots,
+    bulk_mark_currency_to_market,
+    mark_currency_to_market,
+    mark_securities_to_market,
+)
+
+
+@pytest.fixture
+def session():
+    """Provide a real database session against the test database."""
+    session = get_session()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def portfolio(session):
+    """Portfolio with an initialized chart of accounts and a broker account."""
+    return _create_portfolio(session, "Lot Test")
+
+
+def _create_portfolio(session, name):
+    portfolio = Portfolio(name=name, base_currency="EUR")
+    session.add(portfolio)
+    session.flush()
+
+    account = Account(
+        portfolio_id=portfolio.id,
+        name="Broker",
+        broker_source="test_broker",
+        base_currency="EUR",
+    )
+    session.add(account)
+    session.flush()
+
+    initialize_chart_of_accounts(session, portfolio.id)
+    return portfolio
+
+
+def _broker_account(session, portfolio):
+    return session.query(Account).filter(Account.portfolio_id == portfolio.id).one()
+
+
+def _accounts(session, portfolio):
+    from src.services.lot_tracking_service import _get_chart_accounts
+
+    return _get_chart_accounts(session, portfolio.id)
+
+
+def _add_transaction(session, account, tx_type, tx_date, amount, currency="EUR", **kwargs):
+    transaction = Transaction(
+        account_id=account.id,
+        type=tx_type,
+        date=tx_date,
+        amount=amount,
+        currency=currency,
+        debit_credit="D",
+        **kwargs,
+    )
+    session.add(transaction)
+    session.flush()
+    return transaction
+
+
+def _add_holding_with_lots(session, portfolio, ticker, currency, lots):
+    """Create a security, holding and open lots.
+
+    Args:
+        lots: List of (purchase_date, quantity, cost_per_share, exchange_rate)
+    """
+    account = _broker_account(session, portfolio)
+    security = Security(
+        security_type=SecurityType.STOCK, ticker=ticker, name=ticker, currency=currency
+    )
+    session.add(security)
+    session.flush()
+
+    holding = Holding(
+        portfolio_id=portfolio.id,
+        security_id=security.id,
+        ticker=ticker,
+        quantity=sum((q for _, q, _, _ in lots), Decimal("0")),
+        avg_purchase_price=lots[0][2],
+        original_currency=currency,
+        first_purchase_date=lots[0][0],
+    )
+    session.add(holding)
+    session.flush()
+
+    for purchase_date, quantity, cost_per_share, rate in lots:
+        transaction = _add_transaction(
+            session,
+            account,
+            TransactionType.BUY,
+            purchase_date,
+            quantity * cost_per_share,
+            currency=currency,
+            holding_id=holding.id,
+            quantity=quantity,
+            price=cost_per_share,
+        )
+        session.add(
+            SecurityLot(
+                holding_id=holding.id,
+                transaction_id=transaction.id,
+                security_ticker=ticker,
+                purchase_date=purchase_date,
+                quantity=quantity,
+                remaining_quantity=quantity,
+                cost_per_share=cost_per_share,
+                total_cost=quantity * cost_per_share,
+                cost_per_share_base=cost_per_share * rate,
+                total_cost_base=quantity * cost_per_share * rate,
+                currency=currency,
+                exchange_rate=rate,
+                is_closed=False,
+            )
+        )
+    session.flush()
+    return security, holding
+
+
+def _add_foreign_cash(session, portfolio, currency, foreign_amount, base_amount, as_of):
+    """Record foreign cash on the Cash account plus the currency lot that funded it."""
+    accounts = _accounts(session, portfolio)
+    account = _broker_account(session, portfolio)
+    transaction = _add_transaction(
+        session,
+        account,
+        TransactionType.CONVERSION,
+        as_of,
+        foreign_amount,
+        currency=currency,
+        conversion_from_amount=base_amount,
+        conversion_from_currency="EUR",
+    )
+    entry = JournalEntry(
+        portfolio_id=portfolio.id,
+        entry_number=1,
+        entry_date=as_of,
+        posting_date=as_of,
+        type=JournalEntryType.TRANSACTION,
+        status=JournalEntryStatus.POSTED,
+        description="Currency conversion",
+    )
+    entry.lines = [
+        JournalLine(
+            account_id=accounts["cash"].id,
+            line_number=1,
+            debit_amount=base_amount,
+            credit_amount=Decimal("0"),
+            currency="EUR",
+            foreign_amount=foreign_amount,
+            foreign_currency=currency,
+        ),
+        JournalLine(
+            account_id=accounts["capital"].id,
+            line_number=2,
+            debit_amount=Decimal("0"),
+            credit_amount=base_amount,
+            currency="EUR",
+        ),
+    ]
+    session.add(entry)
+    session.add(
+        CurrencyLot(
+            account_id=account.id,
+            conversion_transaction_id=transaction.id,
+            from_currency="EUR",
+            to_currency=currency,
+            from_amount=base_amount,
+            to_amount=foreign_amount,
+            remaining_amount=foreign_amount,
+            exchange_rate=foreign_amount / base_amount,
+            conversion_date=as_of,
+        )
+    )
+    session.flush()
+    return accounts
+
+
+@pytest.mark.unit
+class TestAllocateLotsFifo:
+    """Tests for FIFO lot allocation."""
+
+    def test_allocates_oldest_lots_first(self, session, portfolio):
+        """Sale consumes the oldest lot fully before touching newer lots."""
+        _, holding = _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "EUR",
+            [
+                (date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1")),
+                (date(2024, 2, 1), Decimal("10"), Decimal("120"), Decimal("1")),
+            ],
+        )
+
+        allocations = allocate_lots_fifo(session, holding.id, Decimal("15"), date(2024, 3, 1))
+
+        assert [qty for _, qty, _ in allocations] == [Decimal("10"), Decimal("5")]
+        assert [cost for _, _, cost in allocations] == [Decimal("1000"), Decimal("600")]
+        first_lot, second_lot = (lot for lot, _, _ in allocations)
+        assert first_lot.is_closed is True
+        assert first_lot.remaining_quantity == Decimal("0")
+        assert second_lot.is_closed is False
+        assert second_lot.remaining_quantity == Decimal("5")
+
+    def test_insufficient_lots_raises(self, session, portfolio):
+        """Selling more than is held raises ValueError."""
+        _, holding = _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+
+        with pytest.raises(ValueError, match="Insufficient lots"):
+            allocate_lots_fifo(session, holding.id, Decimal("11"), date(2024, 3, 1))
+
+
+@pytest.mark.unit
+class TestApplySplitToExistingLots:
+    """Tests for applying stock splits to lots."""
+
+    def test_split_adjusts_pre_split_lots_only(self, session, portfolio):
+        """Lots bought before the split are scaled; later lots are untouched."""
+        security, holding = _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "EUR",
+            [
+                (date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1")),
+                (date(2024, 6, 1), Decimal("4"), Decimal("60"), Decimal("1")),
+            ],
+        )
+        split = StockSplit(
+            security_id=security.id,
+            split_date=date(2024, 3, 1),
+            split_ratio=Decimal("2"),
+            split_from=1,
+            split_to=2,
+        )
+
+        updated = apply_split_to_existing_lots(session, security.id, split)
+
+        assert updated == 1
+        lots = (
+            session.query(SecurityLot)
+            .filter(SecurityLot.holding_id == holding.id)
+            .order_by(SecurityLot.purchase_date)
+            .all()
+        )
+        assert lots[0].quantity == Decimal("20")
+        assert lots[0].remaining_quantity == Decimal("20")
+        assert lots[0].cost_per_share == Decimal("50")
+        assert lots[0].total_cost == Decimal("1000")
+        assert lots[1].quantity == Decimal("4")
+        assert lots[1].cost_per_share == Decimal("60")
+
+
+@pytest.mark.unit
+class TestMarkSecuritiesToMarket:
+    """Tests for securities mark-to-market."""
+
+    def test_no_open_lots_returns_none(self, session, portfolio):
+        """Nothing to mark when the portfolio holds no lots."""
+        assert mark_securities_to_market(session, portfolio.id, date(2024, 6, 30)) is None
+
+    def test_base_currency_gain(self, session, portfolio):
+        """Price increase on base-currency security debits fair value adjustment."""
+        _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.MarketDataFetcher.get_current_prices",
+            return_value={"AAPL": 110.0},
+        ):
+            entry = mark_securities_to_market(session, portfolio.id, date(2024, 6, 30))
+
+        assert entry is not None
+        assert entry.is_balanced
+        accounts = _accounts(session, portfolio)
+        fva_line = next(
+            line for line in entry.lines if line.account_id == accounts["fair_value_adjustment"].id
+        )
+        assert fva_line.debit_amount == Decimal("100")
+
+    def test_manual_price_fallback(self, session, portfolio):
+        """Securities without a fetched price use the latest MarketData row."""
+        security, _ = _add_holding_with_lots(
+            session,
+            portfolio,
+            "BOND1",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+        session.add(
+            MarketData(
+                security_id=security.id,
+                timestamp=datetime(2024, 6, 28),
+                price=Decimal("105"),
+                data_source="manual",
+                is_latest=True,
+            )
+        )
+        session.flush()
+
+        with patch(
+            "src.services.lot_tracking_service.MarketDataFetcher.get_current_prices",
+            return_value={},
+        ):
+            entry = mark_securities_to_market(session, portfolio.id, date(2024, 6, 30))
+
+        assert entry is not None
+        accounts = _accounts(session, portfolio)
+        fva_line = next(
+            line for line in entry.lines if line.account_id == accounts["fair_value_adjustment"].id
+        )
+        assert fva_line.debit_amount == Decimal("50")
+
+    def test_foreign_currency_splits_price_and_fx(self, session, portfolio):
+        """Foreign-currency security separates price and FX unrealized G/L."""
+        _add_holding_with_lots(
+            session,
+            portfolio,
+            "MSFT",
+            "USD",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("0.9"))],
+        )
+
+        with (
+            patch(
+                "src.services.lot_tracking_service.MarketDataFetcher.get_current_prices",
+                return_value={"MSFT": 110.0},
+            ),
+            patch(
+                "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+                new_callable=AsyncMock,
+                return_value=0.8,
+            ),
+        ):
+            entry = mark_securities_to_market(session, portfolio.id, date(2024, 6, 30))
+
+        assert entry is not None
+        assert entry.is_balanced
+        accounts = _accounts(session, portfolio)
+        by_account = {line.account_id: line for line in entry.lines}
+        # Price effect: (1100 - 1000) USD * 0.8 = 80 EUR gain
+        assert by_account[accounts["unrealized_investment_gl"].id].credit_amount == Decimal("80")
+        # FX effect: 1000 USD * (0.8 - 0.9) = -100 EUR loss
+        assert by_account[accounts["unrealized_currency_gl"].id].debit_amount == Decimal("100")
+        # Net: 880 - 900 = -20 EUR
+        assert by_account[accounts["fair_value_adjustment"].id].credit_amount == Decimal("20")
+
+    def test_repeat_mark_is_incremental(self, session, portfolio):
+        """Marking twice at the same price creates no second entry."""
+        _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.MarketDataFetcher.get_current_prices",
+            return_value={"AAPL": 110.0},
+        ):
+            first = mark_securities_to_market(session, portfolio.id, date(2024, 6, 30))
+            second = mark_securities_to_market(session, portfolio.id, date(2024, 6, 30))
+
+        assert first is not None
+        assert second is None
+
+
+@pytest.mark.unit
+class TestMarkCurrencyToMarket:
+    """Tests for foreign currency cash mark-to-market."""
+
+    def test_no_foreign_cash_returns_none(self, session, portfolio):
+        """Nothing to mark without foreign currency cash."""
+        accounts = _accounts(session, portfolio)
+
+        entry = mark_currency_to_market(
+            session, portfolio.id, accounts["cash"].id, "EUR", date(2024, 6, 30)
+        )
+
+        assert entry is None
+
+    def test_unrealized_fx_gain(self, session, portfolio):
+        """Stronger foreign currency creates DR Cash / CR Unrealized Currency G/L."""
+        accounts = _add_foreign_cash(
+            session, portfolio, "USD", Decimal("1000"), Decimal("900"), date(2024, 1, 1)
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+            new_callable=AsyncMock,
+            return_value=1.0,
+        ):
+            entry = mark_currency_to_market(
+                session, portfolio.id, accounts["cash"].id, "EUR", date(2024, 6, 30)
+            )
+
+        assert entry is not None
+        assert entry.is_balanced
+        by_account = {line.account_id: line for line in entry.lines}
+        assert by_account[accounts["cash"].id].debit_amount == Decimal("100")
+        assert by_account[accounts["unrealized_currency_gl"].id].credit_amount == Decimal("100")
+
+    def test_prior_adjustment_is_netted(self, session, portfolio):
+        """A second mark at a lower rate only books the incremental loss."""
+        accounts = _add_foreign_cash(
+            session, portfolio, "USD", Decimal("1000"), Decimal("900"), date(2024, 1, 1)
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+            new_callable=AsyncMock,
+            side_effect=[1.0, 0.95],
+        ):
+            mark_currency_to_market(
+                session, portfolio.id, accounts["cash"].id, "EUR", date(2024, 6, 30)
+            )
+            entry = mark_currency_to_market(
+                session, portfolio.id, accounts["cash"].id, "EUR", date(2024, 7, 31)
+            )
+
+        assert entry is not None
+        by_account = {line.account_id: line for line in entry.lines}
+        assert by_account[accounts["unrealized_currency_gl"].id].debit_amount == Decimal("50")
+        assert by_account[accounts["cash"].id].credit_amount == Decimal("50")
+
+    def test_unchanged_rate_without_history_returns_none(self, session, portfolio):
+        """No unrealized FX and no prior adjustments short-circuits to None."""
+        accounts = _add_foreign_cash(
+            session, portfolio, "USD", Decimal("1000"), Decimal("900"), date(2024, 1, 1)
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+            new_callable=AsyncMock,
+            return_value=0.9,
+        ):
+            entry = mark_currency_to_market(
+                session, portfolio.id, accounts["cash"].id, "EUR", date(2024, 6, 30)
+            )
+
+        assert entry is None
+
+    def test_ignores_other_portfolios_lots(self, session, portfolio):
+        """Only lots held through the portfolio's own accounts are revalued."""
+        other = _create_portfolio(session, "Lot Test 2")
+        accounts = _add_foreign_cash(
+            session, portfolio, "USD", Decimal("1000"), Decimal("900"), date(2024, 1, 1)
+        )
+        _add_foreign_cash(session, other, "USD", Decimal("500"), Decimal("400"), date(2024, 1, 1))
+
+        with patch(
+            "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+            new_callable=AsyncMock,
+            return_value=1.0,
+        ):
+            entry = mark_currency_to_market(
+                session, portfolio.id, accounts["cash"].id, "EUR", date(2024, 6, 30)
+            )
+
+        assert entry is not None
+        by_account = {line.account_id: line for line in entry.lines}
+        assert by_account[accounts["cash"].id].debit_amount == Decimal("100")
+
+    def test_uses_the_given_cash_account(self, session, portfolio):
+        """Balances are read from the cash account passed in, not the chart's Cash."""
+        accounts = _add_foreign_cash(
+            session, portfolio, "USD", Decimal("1000"), Decimal("900"), date(2024, 1, 1)
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+            new_callable=AsyncMock,
+            return_value=1.0,
+        ):
+            entry = mark_currency_to_market(
+                session, portfolio.id, accounts["bank"].id, "EUR", date(2024, 6, 30)
+            )
+
+        assert entry is None
+
+
+@pytest.mark.unit
+class TestBulkMarkCurrencyToMarket:
+    """Tests for batched foreign currency cash mark-to-market."""
+
+    def test_marks_each_portfolio_with_its_own_lots(self, session, portfolio):
+        """Each portfolio gets one entry based only on its own lots and history."""
+        other = _create_portfolio(session, "Lot Test 2")
+        accounts = _add_foreign_cash(
+            session, portfolio, "USD", Decimal("1000"), Decimal("900"), date(2024, 1, 1)
+        )
+        other_accounts = _add_foreign_cash(
+            session, other, "USD", Decimal("500"), Decimal("400"), date(2024, 1, 1)
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+            new_callable=AsyncMock,
+            return_value=1.0,
+        ) as get_rate:
+            entries = bulk_mark_currency_to_market(
+                session, [portfolio.id, other.id], date(2024, 6, 30)
+            )
+
+        # One rate lookup shared by both portfolios
+        assert get_rate.await_count == 1
+        assert set(entries) == {portfolio.id, other.id}
+        assert all(entry.is_balanced for entry in entries.values())
+
+        by_account = {line.account_id: line for line in entries[portfolio.id].lines}
+        assert by_account[accounts["cash"].id].debit_amount == Decimal("100")
+        other_by_account = {line.account_id: line for line in entries[other.id].lines}
+        assert other_by_account[other_accounts["cash"].id].debit_amount == Decimal("100")
+        assert entries[other.id].entry_number == 2
+
+    def test_matches_single_portfolio_netting(self, session, portfolio):
+        """Prior single-portfolio adjustments are netted in the bulk run."""
+        accounts = _add_foreign_cash(
+            session, portfolio, "USD", Decimal("1000"), Decimal("900"), date(2024, 1, 1)
+        )
+
+        with patch(
+            "src.services.lot_tracking_service.CurrencyConverter.get_rate",
+            new_callable=AsyncMock,
+            side_effect=[1.0, 0.95],
+        ):
+            mark_currency_to_market(
+                session, portfolio.id, accounts["cash"].id, "EUR", date(2024, 6, 30)
+            )
+            entries = bulk_mark_currency_to_market(session, [portfolio.id], date(2024, 7, 31))
+
+        by_account = {line.account_id: line for line in entries[portfolio.id].lines}
+        assert by_account[accounts["unrealized_currency_gl"].id].debit_amount == Decimal("50")
+
+    def test_unknown_portfolio_raises(self, session, portfolio):
+        """Missing portfolios are rejected before anything is posted."""
+        with pytest.raises(ValueError, match="not found"):
+            bulk_mark_currency_to_market(session, [portfolio.id, "missing"], date(2024, 6, 30))
+
+
+@pytest.mark.unit
+class TestGetChartAccounts:
+    """Tests for per-session chart account caching."""
+
+    def test_accounts_are_cached_per_session(self, session, portfolio):
+        """Repeated lookups in one session reuse the resolved accounts."""
+        assert _accounts(session, portfolio) is _accounts(session, portfolio)
+
+    def test_account_change_invalidates_cache(self, session, portfolio):
+        """Flushing a change to a portfolio's accounts drops its cached mapping."""
+        accounts = _accounts(session, portfolio)
+
+        accounts["cash"].description = "Renamed"
+        session.flush()
+
+        refreshed = _accounts(session, portfolio)
+        assert refreshed is not accounts
+        assert refreshed["cash"].id == accounts["cash"].id
+
+
+@pytest.mark.unit
+class TestPositionSummaries:
+    """Tests for materialized open-lot totals."""
+
+    def _summary(self, session, holding):
+        return session.get(PositionSummary, holding.id, populate_existing=True)
+
+    def test_summary_follows_lot_changes(self, session, portfolio):
+        """Creating, selling and splitting lots keeps the summary current."""
+        security, holding = _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "USD",
+            [
+                (date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("0.9")),
+                (date(2024, 2, 1), Decimal("10"), Decimal("120"), Decimal("0.9")),
+            ],
+        )
+
+        summary = self._summary(session, holding)
+        assert summary.portfolio_id == portfolio.id
+        assert summary.total_quantity == Decimal("20")
+        assert summary.cost_basis_local == Decimal("2200")
+        assert summary.cost_basis_base == Decimal("1980")
+
+        allocate_lots_fifo(session, holding.id, Decimal("15"), date(2024, 3, 1))
+        summary = self._summary(session, holding)
+        assert summary.total_quantity == Decimal("5")
+        assert summary.cost_basis_local == Decimal("600")
+
+        split = StockSplit(
+            security_id=security.id,
+            split_date=date(2024, 6, 1),
+            split_ratio=Decimal("2"),
+            split_from=1,
+            split_to=2,
+        )
+        apply_split_to_existing_lots(session, security.id, split)
+        summary = self._summary(session, holding)
+        assert summary.total_quantity == Decimal("10")
+        assert summary.cost_basis_local == Decimal("600")
+
+    def test_summary_follows_lot_edits_outside_the_service(self, session, portfolio):
+        """Summaries are rebuilt by a models-level hook, not the service import."""
+        assert event.contains(Session, "after_flush", _rebuild_position_summaries_after_flush)
+        _, holding = _add_holding_with_lots(
+            session,
+            portfolio,
+            "OLD",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+
+        lot = session.query(SecurityLot).filter(SecurityLot.holding_id == holding.id).one()
+        lot.security_ticker = "NEW"
+        lot.remaining_quantity = Decimal("4")
+        session.flush()
+
+        summary = self._summary(session, holding)
+        assert summary.security_ticker == "NEW"
+        assert summary.total_quantity == Decimal("4")
+
+    def test_fully_sold_holding_has_no_summary(self, session, portfolio):
+        """Closing every lot removes the holding's summary row."""
+        _, holding = _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+
+        allocate_lots_fifo(session, holding.id, Decimal("10"), date(2024, 3, 1))
+
+        assert self._summary(session, holding) is None
+
+    def test_mark_to_market_backfills_missing_summaries(self, session, portfolio):
+        """Portfolios without summary rows are backfilled before valuation."""
+        _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAPL",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+        session.execute(delete(PositionSummary))
+
+        with patch(
+            "src.services.lot_tracking_service.MarketDataFetcher.get_current_prices",
+            return_value={"AAPL": 110.0},
+        ):
+            entry = mark_securities_to_market(session, portfolio.id, date(2024, 6, 30))
+
+        assert entry is not None
+        accounts = _accounts(session, portfolio)
+        fva_line = next(
+            line for line in entry.lines if line.account_id == accounts["fair_value_adjustment"].id
+        )
+        assert fva_line.debit_amount == Decimal("100")
+
+    def test_mark_to_market_backfills_holdings_without_summary(self, session, portfolio):
+        """A holding missing its summary is backfilled even when others have one."""
+        _add_holding_with_lots(
+            session,
+            portfolio,
+            "AAA",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("10"), Decimal("100"), Decimal("1"))],
+        )
+        _, bbb = _add_holding_with_lots(
+            session,
+            portfolio,
+            "BBB",
+            "EUR",
+            [(date(2024, 1, 1), Decimal("5"), Decimal("50"), Decimal("1"))],
+        )
+        session.execute(delete(PositionSummary).where(PositionSummary.holding_id == bbb.id))
+
+        with patch(
+            "src.services.lot_tracking_service.MarketDataFetcher.get_current_prices",
+            return_value={"AAA": 110.0, "BBB": 60.0},
+        ) as get_prices:
+            entry = mark_securities_to_market(session, portfolio.id, date(2024, 6, 30))
+
+        assert sorted(get_prices.call_args.args[0]) == ["AAA", "BBB"]
+        assert self._summary(session, bbb).total_quantity == Decimal("5")
+        accounts = _accounts(session, portfolio)
+        fva_line = next(
+            line for line in entry.lines if line.account_id == accounts["fair_value_adjustment"].id
+        )
+        # (1100 - 1000) + (300 - 250)
+        assert fva_line.debit_amount == Decimal("150")
@@ -1,21 +1,28 @@
 """Unit tests for MarketDataFetcher."""
 
+import asyncio
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import pytest_asyncio
 
+from src.lib.cache import CacheManager
 from src.services.market_data_fetcher import MarketDataFetcher
 
 
-@pytest.fixture
-def market_data_fetcher():
-    """Provide MarketDataFetcher instance."""
+@pytest_asyncio.fixture
+async def market_data_fetcher():
+    """Provide MarketDataFetcher instance, closing its HTTP session afterwards."""
     with patch.dict("os.environ", {"ALPHA_VANTAGE_API_KEY": "test_key"}):
         fetcher = MarketDataFetcher()
         # Reset quota tracker for each test
         fetcher.quota_tracker.reset()
-        return fetcher
+    yield fetcher
+    await fetcher.aclose()
 
 
 @pytest.fixture
@@ -80,12 +87,35 @@ class TestMarketDataFetcher:
             result = await market_data_fetcher.fetch_daily_data("AAPL")
 
             assert result is not None
-            assert "historical" in result
+            assert "columns" in result
             assert "latest" in result
-            assert len(result["historical"]) == 2
+            assert len(result["columns"]["timestamp"]) == 2
             assert result["latest"]["ticker"] == "AAPL"
             assert result["latest"]["source"] == "yahoo_finance"
 
+    @pytest.mark.asyncio
+    async def test_fetch_daily_data_coalesces_concurrent_calls(self, market_data_fetcher):
+        """Concurrent fetches of one ticker share a single upstream request."""
+        payload = {"historical": [], "latest": {"ticker": "AAPL"}}
+
+        with patch.object(
+            market_data_fetcher, "_fetch_yahoo_finance", new_callable=AsyncMock
+        ) as mock_yahoo:
+            mock_yahoo.return_value = payload
+
+            results = await asyncio.gather(
+                *(market_data_fetcher.fetch_daily_data("AAPL") for _ in range(5)),
+                market_data_fetcher.fetch_daily_data("MSFT"),
+            )
+
+            assert results[:5] == [payload] * 5
+            assert mock_yahoo.await_count == 2  # Once for AAPL, once for MSFT
+            assert market_data_fetcher._inflight == {}
+
+            # A later call starts a new fetch
+            await market_data_fetcher.fetch_daily_data("AAPL")
+            assert mock_yahoo.await_count == 3
+
     @pytest.mark.asyncio
     async def test_fetch_daily_data_fallback_to_alpha_vantage(
         self, market_data_fetcher, mock_alpha_vantage_response
@@ -106,7 +136,7 @@ class TestMarketDataFetcher:
 
             # Should have fallen back to Alpha Vantage
             assert result is not None
-            assert "historical" in result
+            assert "columns" in result
             assert result["latest"]["source"] == "alpha_vantage"
 
     @pytest.mark.asyncio
@@ -129,7 +159,10 @@ class TestMarketDataFetcher:
     async def test_alpha_vantage_quota_check(self, market_data_fetcher):
         """Alpha Vantage respects quota limits."""
         with (
-            patch.object(market_data_fetcher.quota_tracker, "can_make_request") as mock_quota,
+            patch.object(
+                market_data_fetcher.quota_tracker, "acquire", new_callable=AsyncMock
+            ) as mock_quota,
+            patch.object(market_data_fetcher.api_client, "get", new_callable=AsyncMock) as mock_get,
             patch.object(market_data_fetcher.cache, "get", return_value=None),
         ):
             mock_quota.return_value = False
@@ -138,12 +171,31 @@ class TestMarketDataFetcher:
             result = await market_data_fetcher._fetch_alpha_vantage("AAPL")
 
             assert result is None
+            mock_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_alpha_vantage_skipped_after_daily_quota_exhausted(self, market_data_fetcher):
+        """Once the daily quota is used up, later tickers skip Alpha Vantage unchecked."""
+        tracker = market_data_fetcher.quota_tracker
+        tracker.daily_count = tracker.daily_limit
+
+        with (
+            patch.object(tracker, "acquire", wraps=tracker.acquire) as mock_acquire,
+            patch.object(market_data_fetcher.api_client, "get", new_callable=AsyncMock) as mock_get,
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+        ):
+            assert await market_data_fetcher._fetch_alpha_vantage("AAPL") is None
+            assert await market_data_fetcher._fetch_alpha_vantage("MSFT") is None
+
+        mock_acquire.assert_called_once()
+        mock_get.assert_not_called()
+        assert market_data_fetcher._alpha_vantage_cooldown_until > time.monotonic()
 
     @pytest.mark.asyncio
     async def test_alpha_vantage_quota_tracking(
         self, market_data_fetcher, mock_alpha_vantage_response
     ):
-        """Alpha Vantage quota counter increments after successful request."""
+        """Alpha Vantage quota counter increments for each request made."""
         with (
             patch.object(market_data_fetcher.api_client, "get", new_callable=AsyncMock) as mock_get,
             patch.object(market_data_fetcher.quota_tracker, "record_request") as mock_record,
@@ -196,6 +248,36 @@ class TestMarketDataFetcher:
             assert result == cached_data
             mock_yf.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_cache_hit_near_expiry_refreshes_in_background(
+        self, market_data_fetcher, tmp_path
+    ):
+        """A cached history about to expire is served and refetched in the background."""
+        cache = CacheManager(cache_dir=tmp_path, use_market_hours=False, ttl_jitter=0)
+        market_data_fetcher.cache = cache
+        market_data_fetcher._yahoo_fetch_seconds.extend([2.0, 10.0])
+        cache.set("yahoo_finance", "AAPL", {"ticker": "AAPL"})
+        cache.set("yahoo_finance", "MSFT", {"ticker": "MSFT"})
+
+        # AAPL expires in 5 seconds, less than 1.5 x the 10 second p95
+        path = cache._get_cache_path("yahoo_finance_AAPL_latest")
+        old = time.time() - 15 * 60 + 5
+        os.utime(path, (old, old))
+        CacheManager._memory.clear()
+
+        with patch.object(
+            market_data_fetcher, "_download_yahoo_history", new_callable=AsyncMock
+        ) as mock_download:
+            assert await market_data_fetcher._fetch_yahoo_finance("AAPL") == {"ticker": "AAPL"}
+            assert await market_data_fetcher._fetch_yahoo_finance("AAPL") == {"ticker": "AAPL"}
+            assert await market_data_fetcher._fetch_yahoo_finance("MSFT") == {"ticker": "MSFT"}
+            # Let the refresh task and its done callback run
+            for _ in range(2):
+                await asyncio.sleep(0)
+
+        mock_download.assert_awaited_once_with("AAPL")
+        assert not market_data_fetcher._refreshing
+
     @pytest.mark.asyncio
     async def test_alpha_vantage_error_handling(self, market_data_fetcher):
         """Alpha Vantage API errors are handled gracefully."""
@@ -212,6 +294,27 @@ class TestMarketDataFetcher:
             # Should return None on error
             assert result is None
 
+    @pytest.mark.asyncio
+    async def test_alpha_vantage_rejects_invalid_data_point(
+        self, market_data_fetcher, mock_alpha_vantage_response
+    ):
+        """A non-positive price in the time series rejects the whole response."""
+        mock_alpha_vantage_response["Time Series (Daily)"]["2025-10-04"]["3. low"] = "0"
+
+        with (
+            patch.object(market_data_fetcher.api_client, "get", new_callable=AsyncMock) as mock_get,
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(market_data_fetcher.cache, "set") as mock_set,
+        ):
+            mock_get.return_value = mock_alpha_vantage_response
+
+            result = await market_data_fetcher._fetch_alpha_vantage("AAPL")
+
+            # Only the negative entry is cached, never the rejected history
+            assert result is None
+            mock_set.assert_called_once()
+            assert mock_set.call_args.args[:2] == ("alpha_vantage_empty", "AAPL")
+
     @pytest.mark.asyncio
     async def test_alpha_vantage_rate_limit_response(self, market_data_fetcher):
         """Alpha Vantage rate limit response is handled."""
@@ -228,6 +331,39 @@ class TestMarketDataFetcher:
             # Should return None on rate limit
             assert result is None
 
+    @pytest.mark.asyncio
+    async def test_alpha_vantage_empty_response_is_not_refetched(
+        self, market_data_fetcher, tmp_path
+    ):
+        """A response without data is cached briefly so the ticker is not asked again."""
+        market_data_fetcher.cache = CacheManager(cache_dir=tmp_path)
+
+        with patch.object(
+            market_data_fetcher.api_client, "get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = {"Note": "API call frequency is too high"}
+
+            assert await market_data_fetcher._fetch_alpha_vantage("AAPL") is None
+            assert await market_data_fetcher._fetch_alpha_vantage("AAPL") is None
+
+            mock_get.assert_awaited_once()
+            assert market_data_fetcher.quota_tracker.get_remaining_quota()["daily_used"] == 1
+
+    @pytest.mark.asyncio
+    async def test_yahoo_finance_caches_full_history(self, market_data_fetcher, mock_yahoo_history):
+        """The whole Yahoo payload is cached so a cache hit can restore all bars."""
+        with (
+            patch("yfinance.Ticker") as mock_yf,
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(market_data_fetcher.cache, "set") as mock_set,
+        ):
+            mock_yf.return_value.history.return_value = mock_yahoo_history
+
+            result = await market_data_fetcher._fetch_yahoo_finance("AAPL")
+
+        mock_set.assert_called_once_with("yahoo_finance", "AAPL", result)
+        assert len(result["columns"]["close"]) == 2
+
     @pytest.mark.asyncio
     async def test_yahoo_finance_empty_data(self, market_data_fetcher):
         """Yahoo Finance empty DataFrame is handled gracefully."""
@@ -263,8 +399,159 @@ class TestMarketDataFetcher:
             result = await market_data_fetcher.update_market_data("AAPL")
 
             assert result is True
-            # Should have added data to session
-            assert mock_session.add.call_count > 0
+            # All historical points are written with one upsert, not row by row
+            upserts = [
+                call.args
+                for call in mock_session.execute.call_args_list
+                if getattr(call.args[0], "is_insert", False)
+            ]
+            assert len(upserts) == 1
+            assert len(upserts[0][1]) == 2
+
+    @pytest.mark.asyncio
+    async def test_update_market_data_upserts_existing_rows(self, market_data_fetcher):
+        """Re-storing a date updates the existing row and moves the latest flag."""
+        from sqlalchemy import select
+
+        from src.lib.db import db_session
+        from src.models import MarketData, Security, SecurityType
+
+        with db_session() as session:
+            session.add(
+                Security(
+                    ticker="UPSRT",
+                    name="Upsert Corp",
+                    security_type=SecurityType.STOCK,
+                    currency="USD",
+                )
+            )
+
+        def point(timestamp, close, is_latest):
+            return {
+                "ticker": "UPSRT",
+                "timestamp": timestamp,
+                "open": close,
+                "high": close,
+                "low": close,
+                "close": close,
+                "volume": 1000,
+                "source": "yahoo_finance",
+                "is_latest": is_latest,
+            }
+
+        first = [point("2025-10-03", 100.0, False), point("2025-10-04", 101.0, True)]
+        second = [point("2025-10-04", 102.0, False), point("2025-10-05", 103.0, True)]
+
+        # Storing the second payload twice leaves the flag where it is
+        for historical in (first, second, second):
+            stored = await market_data_fetcher.update_market_data(
+                "UPSRT", prefetched={"historical": historical, "latest": historical[-1]}
+            )
+            assert stored is True
+
+        with db_session() as session:
+            rows = session.execute(select(MarketData).order_by(MarketData.timestamp)).scalars()
+            stored_rows = [(row.timestamp.day, float(row.price), row.is_latest) for row in rows]
+
+        assert stored_rows == [(3, 100.0, False), (4, 102.0, False), (5, 103.0, True)]
+
+    @pytest.mark.asyncio
+    async def test_update_market_data_statement_count_is_constant(self, market_data_fetcher):
+        """Storing a history issues the same statements however many points it has."""
+        from sqlalchemy import event
+
+        from src.lib.db import db_session, get_engine
+        from src.models import Security, SecurityType
+
+        with db_session() as session:
+            session.add(
+                Security(
+                    ticker="BULK",
+                    name="Bulk Corp",
+                    security_type=SecurityType.STOCK,
+                    currency="USD",
+                )
+            )
+
+        def payload(days):
+            historical = [
+                {
+                    "ticker": "BULK",
+                    "timestamp": f"2025-{month:02d}-{day:02d}",
+                    "open": 10.0 + day,
+                    "high": 10.0 + day,
+                    "low": 10.0 + day,
+                    "close": 10.0 + day,
+                    "volume": 1000,
+                    "source": "yahoo_finance",
+                    "is_latest": False,
+                }
+                for month in range(1, 13)
+                for day in range(1, 29)
+            ][:days]
+            return {"historical": historical, "latest": historical[-1]}
+
+        statements: list[str] = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = get_engine()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            counts = []
+            for days in (2, 180):
+                statements.clear()
+                assert await market_data_fetcher.update_market_data(
+                    "BULK", prefetched=payload(days)
+                )
+                counts.append(len(statements))
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        # No per-point existence lookups: the statement count does not grow with N
+        assert counts[0] == counts[1]
+
+    @pytest.mark.asyncio
+    async def test_update_market_data_skips_unchanged_latest(self, market_data_fetcher):
+        """No rows are written when the stored latest date and close are unchanged."""
+        from src.lib.db import db_session
+        from src.models import Security, SecurityType
+
+        with db_session() as session:
+            session.add(
+                Security(
+                    ticker="SAME",
+                    name="Same Corp",
+                    security_type=SecurityType.STOCK,
+                    currency="USD",
+                )
+            )
+
+        def payload(close):
+            columns = {
+                "timestamp": ["2025-10-02", "2025-10-03"],
+                "open": [99.0, close],
+                "high": [99.0, close],
+                "low": [99.0, close],
+                "close": [99.0, close],
+                "volume": [1000, 1000],
+            }
+            return market_data_fetcher._history_payload("SAME", "yahoo_finance", columns)
+
+        assert await market_data_fetcher.update_market_data("SAME", prefetched=payload(100.0))
+
+        with patch.object(
+            market_data_fetcher,
+            "_upsert_market_data",
+            wraps=market_data_fetcher._upsert_market_data,
+        ) as mock_upsert:
+            assert await market_data_fetcher.update_market_data("SAME", prefetched=payload(100.0))
+            mock_upsert.assert_not_called()
+
+            # An intraday price change on the same date is still written
+            assert await market_data_fetcher.update_market_data("SAME", prefetched=payload(101.5))
+            mock_upsert.assert_called_once()
 
     @pytest.mark.asyncio
     @patch("src.services.market_data_fetcher.db_session")
@@ -300,20 +587,214 @@ class TestMarketDataFetcher:
         assert "daily_remaining" in quota
 
     @pytest.mark.asyncio
-    async def test_batch_update_rate_limiting(self, market_data_fetcher, mock_yahoo_history):
-        """Batch update respects rate limiting between requests."""
+    async def test_batch_update_runs_tickers_concurrently(self, market_data_fetcher):
+        """Batch update dispatches all tickers at once without fixed delays."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_update(ticker, prefetched=None, security_id=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if ticker == "BAD":
+                raise RuntimeError("boom")
+            return True
+
         with (
-            patch("yfinance.Ticker") as mock_yf,
-            patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+            patch.object(market_data_fetcher, "update_market_data", side_effect=fake_update),
+            patch.object(
+                market_data_fetcher, "_fetch_yahoo_finance_batch", new_callable=AsyncMock
+            ) as mock_batch,
         ):
-            mock_yf.return_value.history.return_value = mock_yahoo_history
+            mock_batch.return_value = {}
+            tickers = ["AAPL", "GOOGL", "MSFT", "BAD"]
+            # A failing ticker must not abort the rest of the batch
+            await market_data_fetcher.batch_update(tickers)
+            assert max_in_flight == len(tickers)
+
+            # The worker limit caps how many tickers are in flight
+            max_in_flight = 0
+            await market_data_fetcher.batch_update(tickers, max_workers=2)
+            assert max_in_flight == 2
 
-            tickers = ["AAPL", "GOOGL", "MSFT"]
+            with pytest.raises(ValueError):
+                await market_data_fetcher.batch_update(tickers, max_workers=0)
+
+    @pytest.mark.asyncio
+    async def test_yahoo_finance_batch_splits_download(
+        self, market_data_fetcher, mock_yahoo_history
+    ):
+        """One yf.download call yields a payload per ticker from its column group."""
+        import numpy as np
+        import pandas as pd
+
+        sparse_history = mock_yahoo_history.copy()
+        sparse_history.iloc[0] = np.nan  # Not traded on the first date
+        download = pd.concat({"AAPL": mock_yahoo_history, "NOVO": sparse_history}, axis=1)
+
+        with (
+            patch("yfinance.download", return_value=download) as mock_download,
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(market_data_fetcher.cache, "set"),
+        ):
+            result = await market_data_fetcher._fetch_yahoo_finance_batch(
+                ["AAPL", "NOVO", "MISSING"]
+            )
+
+        mock_download.assert_called_once()
+        assert set(result) == {"AAPL", "NOVO"}
+        assert len(result["AAPL"]["columns"]["timestamp"]) == 2
+        assert len(result["NOVO"]["columns"]["timestamp"]) == 1
+        assert result["NOVO"]["latest"]["close"] == 150.00
+        assert result["NOVO"]["latest"]["source"] == "yahoo_finance"
+
+    @pytest.mark.asyncio
+    async def test_yahoo_finance_batch_skips_unusable_ticker(
+        self, market_data_fetcher, mock_yahoo_history
+    ):
+        """A ticker whose frame cannot be converted is skipped, not fatal."""
+        import numpy as np
+        import pandas as pd
+
+        bad_history = mock_yahoo_history.copy()
+        bad_history["Volume"] = np.nan  # Close present, volume missing
+        download = pd.concat({"AAPL": mock_yahoo_history, "BAD": bad_history}, axis=1)
+
+        with (
+            patch("yfinance.download", return_value=download),
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(market_data_fetcher.cache, "set"),
+        ):
+            result = await market_data_fetcher._fetch_yahoo_finance_batch(["AAPL", "BAD"])
+
+        assert set(result) == {"AAPL"}
+
+    @pytest.mark.asyncio
+    async def test_batch_update_uses_batched_yahoo_data(self, market_data_fetcher):
+        """Batch update downloads in chunks and hands prefetched data to each update."""
+        tickers = [f"T{i}" for i in range(25)]
+        prefetched = {"T0": {"historical": [], "latest": {}}}
+
+        with (
+            patch.object(
+                market_data_fetcher, "_fetch_yahoo_finance_batch", new_callable=AsyncMock
+            ) as mock_batch,
+            patch.object(
+                market_data_fetcher, "update_market_data", new_callable=AsyncMock
+            ) as mock_update,
+        ):
+            mock_batch.side_effect = [prefetched, {}]
+            mock_update.return_value = True
+
+            await market_data_fetcher.batch_update(tickers)
+
+        # 25 tickers -> chunks of 20 and 5
+        assert [len(call.args[0]) for call in mock_batch.call_args_list] == [20, 5]
+        mock_update.assert_any_call("T0", prefetched=prefetched["T0"], security_id=None)
+        mock_update.assert_any_call("T1", prefetched=None, security_id=None)
+
+    @pytest.mark.asyncio
+    async def test_batch_update_prefetches_every_chunk(
+        self, market_data_fetcher, mock_yahoo_history
+    ):
+        """Concurrent chunk downloads each keep their own tickers (yf.download shares state)."""
+        tickers = [f"T{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(160)]
+
+        class FakeTicker:
+            def __init__(self, ticker):
+                pass
+
+            def history(self, **kwargs):
+                time.sleep(0.001)
+                return mock_yahoo_history.copy()
+
+        with (
+            patch("yfinance.multi.Ticker", FakeTicker),
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(market_data_fetcher.cache, "set"),
+            patch.object(
+                market_data_fetcher, "update_market_data", new_callable=AsyncMock
+            ) as mock_update,
+        ):
+            mock_update.return_value = True
             await market_data_fetcher.batch_update(tickers)
 
-            # Should have enforced rate limiting between requests
-            # (sleep called between tickers, not after last one)
-            assert mock_sleep.call_count == len(tickers) - 1
+        prefetched = {
+            call.args[0] for call in mock_update.call_args_list if call.kwargs["prefetched"]
+        }
+        assert prefetched == set(tickers)
+
+    @pytest.mark.asyncio
+    async def test_batch_update_looks_up_security_ids_once(self, market_data_fetcher):
+        """Security ids for the whole batch are fetched up front and passed on."""
+        from src.lib.db import db_session
+        from src.models import Security, SecurityType
+
+        with db_session() as session:
+            security = Security(
+                ticker="KNOWN", name="Known", security_type=SecurityType.STOCK, currency="USD"
+            )
+            session.add(security)
+            session.flush()
+            known_id = security.id
+
+        with (
+            patch.object(
+                market_data_fetcher, "_fetch_yahoo_finance_batch", new_callable=AsyncMock
+            ) as mock_batch,
+            patch.object(
+                market_data_fetcher, "update_market_data", new_callable=AsyncMock
+            ) as mock_update,
+        ):
+            mock_batch.return_value = {}
+            mock_update.return_value = True
+
+            await market_data_fetcher.batch_update(["KNOWN", "NEW"])
+
+        mock_update.assert_any_call("KNOWN", prefetched=None, security_id=known_id)
+        mock_update.assert_any_call("NEW", prefetched=None, security_id=None)
+
+    @pytest.mark.asyncio
+    async def test_alpha_vantage_reuses_http_session(
+        self, market_data_fetcher, mock_alpha_vantage_response
+    ):
+        """Alpha Vantage requests share one HTTP session until the fetcher is closed."""
+        with (
+            patch.object(market_data_fetcher.api_client, "get", new_callable=AsyncMock) as mock_get,
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(market_data_fetcher.cache, "set"),
+        ):
+            mock_get.return_value = mock_alpha_vantage_response
+
+            async with market_data_fetcher:
+                await market_data_fetcher._fetch_alpha_vantage("AAPL")
+                session = market_data_fetcher.api_client.session
+                await market_data_fetcher._fetch_alpha_vantage("MSFT")
+
+                assert market_data_fetcher.api_client.session is session
+                assert not session.closed
+
+            assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_alpha_vantage_uses_rate_limiter(
+        self, market_data_fetcher, mock_alpha_vantage_response
+    ):
+        """Alpha Vantage requests take a token from the fetcher's limiter."""
+        with (
+            patch.object(market_data_fetcher.api_client, "get", new_callable=AsyncMock) as mock_get,
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(
+                market_data_fetcher.alpha_vantage_limiter, "acquire", new_callable=AsyncMock
+            ) as mock_acquire,
+        ):
+            mock_get.return_value = mock_alpha_vantage_response
+
+            await market_data_fetcher._fetch_alpha_vantage("AAPL")
+
+            mock_acquire.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_data_source_preference_order(self, market_data_fetcher, mock_yahoo_history):
@@ -372,6 +853,28 @@ class TestMarketDataFetcher:
             # Should return cached data
             assert result == cached_data
 
+    @pytest.mark.asyncio
+    async def test_fallback_to_stale_cache(self, market_data_fetcher):
+        """Cached data of any age is served, flagged stale, when nothing fresher exists."""
+        stale_data = {"historical": [], "latest": {"ticker": "AAPL", "close": 140.0}}
+
+        with (
+            patch.object(market_data_fetcher, "_fetch_yahoo_finance", return_value=None),
+            patch.object(market_data_fetcher, "_fetch_alpha_vantage", return_value=None),
+            patch.object(market_data_fetcher.cache, "get", return_value=None),
+            patch.object(market_data_fetcher.cache, "get_stale", return_value=stale_data),
+            patch("src.services.market_data_fetcher.db_session") as mock_db,
+        ):
+            result = await market_data_fetcher.fetch_daily_data("AAPL")
+            assert result == {**stale_data, "stale": True}
+
+            # Stale data is not written back to the database
+            assert await market_data_fetcher.update_market_data("AAPL") is False
+            mock_db.assert_not_called()
+
+            market_data_fetcher.serve_stale_cache = False
+            assert await market_data_fetcher.fetch_daily_data("AAPL") is None
+
     @pytest.mark.asyncio
     async def test_alpha_vantage_parses_all_historical_data(
         self, market_data_fetcher, mock_alpha_vantage_response
@@ -386,12 +889,103 @@ class TestMarketDataFetcher:
             result = await market_data_fetcher._fetch_alpha_vantage("AAPL")
 
             assert result is not None
-            assert "historical" in result
-            assert len(result["historical"]) == 2
-            # Latest should be marked
-            latest_items = [item for item in result["historical"] if item["is_latest"]]
-            assert len(latest_items) == 1
-            assert latest_items[0]["timestamp"] == "2025-10-05"
+            # Columns are in date order and the newest point is the latest
+            assert result["columns"]["timestamp"] == ["2025-10-04", "2025-10-05"]
+            assert result["latest"]["timestamp"] == "2025-10-05"
+            assert result["latest"]["is_latest"] is True
+
+    @pytest.mark.parametrize(
+        "ticker,expected",
+        [
+            ("AAPL", True),
+            ("BRK-B", True),
+            ("3M", True),  # Leading digit only
+            ("NOKIA.HE", True),
+            ("TKM1T.TL", True),  # Digits allowed with a European suffix
+            ("EE3100034653", False),  # ISIN
+            ("LHV2033X", False),  # Bond code
+            ("ABCDEFGHIJKLMNOP", False),  # Too long
+        ],
+    )
+    def test_is_yahoo_ticker(self, ticker, expected):
+        """Bonds and ISINs are filtered out before bulk price requests."""
+        assert MarketDataFetcher._is_yahoo_ticker(ticker) is expected
+
+    def test_price_cache_is_bounded_lru_with_ttl(self, market_data_fetcher, monkeypatch):
+        """In-memory prices expire after the TTL and the least recently used are evicted."""
+        monkeypatch.setattr(MarketDataFetcher, "_price_cache", OrderedDict())
+        monkeypatch.setattr(MarketDataFetcher, "PRICE_CACHE_MAX_ENTRIES", 2)
+
+        market_data_fetcher._remember_price("AAPL", 150.0)
+        market_data_fetcher._remember_price("MSFT", 400.0)
+        assert market_data_fetcher._get_cached_price("AAPL") == 150.0  # Now most recent
+        market_data_fetcher._remember_price("NOVO", 90.0)
+
+        assert list(MarketDataFetcher._price_cache) == ["AAPL", "NOVO"]
+
+        # Age AAPL past the TTL
+        price, stored_at = MarketDataFetcher._price_cache["AAPL"]
+        MarketDataFetcher._price_cache["AAPL"] = (price, stored_at - 901)
+        assert market_data_fetcher._get_cached_price("AAPL") is None
+        assert "AAPL" not in MarketDataFetcher._price_cache
+
+    def test_get_current_prices_downloads_in_parallel_chunks(
+        self, market_data_fetcher, monkeypatch
+    ):
+        """Prices are downloaded per chunk; a failed chunk falls back to single requests."""
+        import pandas as pd
+
+        monkeypatch.setattr(MarketDataFetcher, "_price_cache", OrderedDict())
+        tickers = [f"T{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(25)]
+
+        def fake_download(chunk, **kwargs):
+            if "TAA" in chunk:
+                raise RuntimeError("chunk failed")
+            return pd.concat({"Close": pd.DataFrame({t: [1.0, 2.0] for t in chunk})}, axis=1)
+
+        with (
+            patch("yfinance.download", side_effect=fake_download) as mock_download,
+            patch("yfinance.Ticker") as mock_ticker,
+            patch.object(market_data_fetcher.cache, "get_many", return_value={}),
+            patch.object(market_data_fetcher.cache, "set"),
+        ):
+            mock_ticker.return_value.info = {"currentPrice": 3.0}
+            prices = market_data_fetcher.get_current_prices(tickers)
+
+        assert mock_download.call_count == 2
+        assert {len(call.args[0]) for call in mock_download.call_args_list} == {20, 5}
+        # Second chunk from the download, first chunk from individual requests
+        assert prices == {t: 3.0 for t in tickers[:20]} | {t: 2.0 for t in tickers[20:]}
+        assert mock_ticker.call_count == 20
+
+    def test_get_current_prices_keeps_every_chunk(self, market_data_fetcher, monkeypatch):
+        """Chunks outnumbering the workers all keep their prices (yf.download shares state)."""
+        import pandas as pd
+
+        monkeypatch.setattr(MarketDataFetcher, "_price_cache", OrderedDict())
+        tickers = [f"T{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(300)]
+
+        class FakeTicker:
+            def __init__(self, ticker):
+                self.ticker = ticker
+
+            def history(self, **kwargs):
+                time.sleep(0.001)
+                return pd.DataFrame(
+                    {"Close": [float(len(self.ticker))]},
+                    index=pd.DatetimeIndex([datetime(2025, 10, 1)]),
+                )
+
+        with (
+            patch("yfinance.multi.Ticker", FakeTicker),
+            patch("yfinance.Ticker") as mock_ticker,
+            patch.object(market_data_fetcher.cache, "get_many", return_value={}),
+            patch.object(market_data_fetcher.cache, "set"),
+        ):
+            prices = market_data_fetcher.get_current_prices(tickers)
+
+        assert prices == {t: 3.0 for t in tickers}
+        mock_ticker.assert_not_called()
 
     def test_get_current_price_from_bulk(self, market_data_fetcher):
         """Get current price uses bulk fetch with caching."""
@@ -0,0 +1,102 @@
+"""Unit tests for QuotaTracker."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.lib.quota_tracker import QuotaTracker
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    """Provide QuotaTracker storing its counters in a temporary directory."""
+    return QuotaTracker(
+        api_name="test_api", daily_limit=25, per_minute_limit=2, storage_dir=tmp_path
+    )
+
+
+@pytest.mark.unit
+class TestQuotaTracker:
+    """Test suite for QuotaTracker."""
+
+    def test_per_minute_limit_blocks_until_window_passes(self, tracker):
+        """Requests older than a minute no longer count against the limit."""
+        tracker.record_request()
+        tracker.record_request()
+        assert tracker.can_make_request() is False
+
+        # Age the first request past the 60-second window
+        tracker.minute_requests[0] -= timedelta(seconds=61)
+
+        assert tracker.can_make_request() is True
+        assert len(tracker.minute_requests) == 1
+        assert tracker.get_remaining_quota()["per_minute_remaining"] == 1
+
+    def test_minute_requests_survive_reload(self, tracker, tmp_path):
+        """Recent requests are persisted and restored oldest first."""
+        now = datetime.now(timezone.utc)
+        tracker.minute_requests.extend([now - timedelta(seconds=5), now - timedelta(seconds=30)])
+        tracker.record_request()
+
+        reloaded = QuotaTracker(
+            api_name="test_api", daily_limit=25, per_minute_limit=2, storage_dir=tmp_path
+        )
+
+        assert list(reloaded.minute_requests) == sorted(tracker.minute_requests)
+        assert reloaded.daily_count == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_only_for_full_minute_window(self, tracker):
+        """acquire records immediately when there is room and sleeps until a slot opens."""
+        assert await tracker.acquire() is True
+        assert tracker.daily_count == 1
+
+        # Fill the window with requests that leave it in 58 and 59 seconds
+        now = datetime.now(timezone.utc)
+        tracker.minute_requests.clear()
+        tracker.minute_requests.extend([now - timedelta(seconds=2), now - timedelta(seconds=1)])
+
+        with patch("src.lib.quota_tracker.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+
+            async def expire_oldest(seconds):
+                tracker.minute_requests[0] -= timedelta(seconds=60)
+
+            mock_sleep.side_effect = expire_oldest
+            assert await tracker.acquire() is True
+
+        mock_sleep.assert_awaited_once()
+        assert 57 < mock_sleep.await_args.args[0] <= 58
+        assert tracker.daily_count == 2
+
+    @pytest.mark.asyncio
+    async def test_acquire_fails_fast_when_daily_quota_is_used(self, tracker):
+        """An exhausted daily quota is reported without waiting or recording."""
+        tracker.daily_count = tracker.daily_limit
+
+        assert await tracker.acquire() is False
+        assert tracker.daily_count == tracker.daily_limit
+
+    def test_record_request_adopts_count_from_other_process(self, tracker, tmp_path):
+        """Requests recorded by another tracker on the same storage count toward the limit."""
+        other = QuotaTracker(
+            api_name="test_api", daily_limit=25, per_minute_limit=2, storage_dir=tmp_path
+        )
+        other.record_request()
+        other.record_request()
+
+        tracker.record_request()
+
+        assert tracker.daily_count == 3
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_retry_after_seconds(self, tracker):
+        """Zero with room, the minute window wait when full, midnight once the day is used."""
+        assert tracker.retry_after_seconds() == 0
+
+        tracker.record_request()
+        tracker.record_request()
+        assert 0 < tracker.retry_after_seconds() <= 60
+
+        tracker.daily_count = tracker.daily_limit
+        assert 0 < tracker.retry_after_seconds() <= 24 * 3600
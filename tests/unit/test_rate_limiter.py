@@ -0,0 +1,45 @@
+"""Unit tests for TokenBucket rate limiter."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.lib.rate_limiter import TokenBucket
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    def test_rejects_non_positive_settings(self):
+        """Capacity and refill interval must be positive."""
+        with pytest.raises(ValueError):
+            TokenBucket(max_tokens=0, refill_interval=60)
+        with pytest.raises(ValueError):
+            TokenBucket(max_tokens=5, refill_interval=0)
+
+    @pytest.mark.asyncio
+    async def test_burst_within_capacity_does_not_wait(self):
+        """Up to max_tokens acquisitions proceed immediately."""
+        limiter = TokenBucket(max_tokens=5, refill_interval=60)
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            for _ in range(5):
+                async with limiter:
+                    pass
+
+            mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill_when_empty(self):
+        """Acquiring from an empty bucket waits for one token to refill."""
+        limiter = TokenBucket(max_tokens=5, refill_interval=60)
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            for _ in range(6):
+                await limiter.acquire()
+
+            mock_sleep.assert_awaited_once()
+            # One token refills every 60 / 5 = 12 seconds
+            wait = mock_sleep.await_args.args[0]
+            assert 11.9 < wait <= 12
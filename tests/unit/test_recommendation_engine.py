@@ -1,10 +1,17 @@
 """Unit tests for RecommendationEngine."""
 
+import threading
+from datetime import datetime
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.models.recommendation import ConfidenceLevel, RecommendationType
+from src.lib.db import db_session
+from src.models.fundamental_data import FundamentalData
+from src.models.portfolio import Portfolio
+from src.models.recommendation import ConfidenceLevel, RecommendationType, StockRecommendation
+from src.models.security import Security, SecurityType
 from src.services.recommendation_engine import RecommendationEngine
 
 
@@ -167,6 +174,65 @@ class TestRecommendationEngine:
         assert score > 50  # Should be above neutral with good fundamentals
         assert len(signals) > 0
 
+    def test_calculate_fundamental_score_reuses_score_for_same_snapshot(
+        self, recommendation_engine
+    ):
+        """A fundamentals snapshot seen before is scored without running the analyzers."""
+        RecommendationEngine._fundamental_scores.clear()
+        analyzer = recommendation_engine.fundamental_analyzer
+        analyzer.get_latest_fundamentals = MagicMock(
+            return_value=MagicMock(
+                security_id="sec-1", timestamp=datetime(2025, 10, 1), dividend_yield=None
+            )
+        )
+        analyzer.analyze_valuation = MagicMock(return_value={"score": 70, "signals": ["Cheap"]})
+        analyzer.analyze_growth = MagicMock(return_value={"score": 60, "signals": []})
+        analyzer.analyze_profitability = MagicMock(return_value={"score": 80, "signals": []})
+        analyzer.analyze_financial_health = MagicMock(return_value={"score": 75, "signals": []})
+
+        first = recommendation_engine.calculate_fundamental_score("AAPL")
+        first[1].append("mutated by caller")
+        second = recommendation_engine.calculate_fundamental_score("AAPL")
+
+        assert second == (first[0], ["Cheap"])
+        analyzer.analyze_valuation.assert_called_once()
+        assert analyzer.get_latest_fundamentals.call_count == 2
+
+    def test_calculate_fundamental_score_caches_stored_snapshot(self, recommendation_engine):
+        """Fundamentals loaded from the database are scored once per snapshot."""
+        RecommendationEngine._fundamental_scores.clear()
+        with db_session() as session:
+            security = Security(
+                ticker="AAPL", name="Apple", security_type=SecurityType.STOCK, currency="USD"
+            )
+            session.add(security)
+            session.flush()
+            for day, pe_ratio in ((1, Decimal("40")), (2, Decimal("12"))):
+                session.add(
+                    FundamentalData(
+                        security_id=security.id,
+                        timestamp=datetime(2025, 10, day),
+                        pe_ratio=pe_ratio,
+                        data_source="alpha_vantage",
+                    )
+                )
+
+        analyzer = recommendation_engine.fundamental_analyzer
+        with patch.object(
+            analyzer, "analyze_valuation", wraps=analyzer.analyze_valuation
+        ) as valuation:
+            first = recommendation_engine.calculate_fundamental_score("AAPL")
+            second = recommendation_engine.calculate_fundamental_score("AAPL")
+
+        assert first == second
+        valuation.assert_called_once()
+        # The newest snapshot is scored, read from a detached row
+        assert valuation.call_args.args[0].pe_ratio == Decimal("12")
+        assert recommendation_engine.calculate_fundamental_score("MSFT") == (
+            50,
+            ["No fundamental data available"],
+        )
+
     def test_determine_recommendation_buy_threshold(self, recommendation_engine):
         """Recommendation is BUY when combined score exceeds threshold."""
         technical_score = 75
@@ -350,3 +416,94 @@ class TestRecommendationEngine:
 
             # Should still generate a recommendation (neutral)
             assert result is not None
+
+    @pytest.mark.asyncio
+    async def test_generate_recommendations_stores_batch_in_one_transaction(
+        self, recommendation_engine
+    ):
+        """Known tickers are stored together and stay readable; unknown ones are skipped."""
+        with db_session() as session:
+            portfolio = Portfolio(name="Batch", base_currency="USD")
+            session.add(portfolio)
+            for ticker in ("AAPL", "MSFT"):
+                session.add(
+                    Security(
+                        ticker=ticker,
+                        name=ticker,
+                        security_type=SecurityType.STOCK,
+                        currency="USD",
+                    )
+                )
+            session.flush()
+            portfolio_id = portfolio.id
+
+        recommendation_engine.indicator_calc.calculate_all_indicators = MagicMock(return_value=None)
+        recommendation_engine.fundamental_analyzer.get_latest_fundamentals = MagicMock(
+            return_value=None
+        )
+
+        with patch("src.services.recommendation_engine.db_session", wraps=db_session) as mock_db:
+            recs = await recommendation_engine.generate_recommendations(
+                ["AAPL", "MSFT", "AAPL", "UNKNOWN"], portfolio_id
+            )
+
+        mock_db.assert_called_once()
+        assert set(recs) == {"AAPL", "MSFT"}
+        assert recs["AAPL"].recommendation == RecommendationType.HOLD
+        assert recs["MSFT"].combined_score == 50
+
+        with db_session() as session:
+            assert session.query(StockRecommendation).count() == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_recommendation_requires_known_security(self, recommendation_engine):
+        """Only tickers with a security are stored; no placeholder security is created."""
+        recommendation_engine.indicator_calc.calculate_all_indicators = MagicMock(return_value=None)
+        recommendation_engine.fundamental_analyzer.get_latest_fundamentals = MagicMock(
+            return_value=None
+        )
+        with db_session() as session:
+            portfolio = Portfolio(name="Single", base_currency="USD")
+            session.add(portfolio)
+            session.flush()
+            portfolio_id = portfolio.id
+
+        assert await recommendation_engine.generate_recommendation("NOPE", portfolio_id) is None
+
+        with db_session() as session:
+            session.add(
+                Security(
+                    ticker="AAPL", name="Apple", security_type=SecurityType.STOCK, currency="USD"
+                )
+            )
+
+        # Readable after its session has committed and closed
+        rec = await recommendation_engine.generate_recommendation("AAPL", portfolio_id)
+        assert rec.recommendation == RecommendationType.HOLD
+        assert rec.id
+
+        with db_session() as session:
+            assert session.query(Security).count() == 1
+            assert session.query(StockRecommendation).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_build_recommendation_loads_inputs_concurrently(self, recommendation_engine):
+        """Indicators and fundamentals are loaded on worker threads at the same time."""
+        # Each loader waits for the other; run one after the other they would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def load_indicators(ticker):
+            barrier.wait()
+            return None
+
+        def load_fundamentals(ticker):
+            barrier.wait()
+            return None
+
+        recommendation_engine.indicator_calc.calculate_all_indicators = load_indicators
+        recommendation_engine.fundamental_analyzer.get_latest_fundamentals = load_fundamentals
+
+        rec = await recommendation_engine._build_recommendation("AAPL", "portfolio-123")
+
+        assert rec.technical_signals == ["No technical data available"]
+        assert rec.fundamental_signals == ["No fundamental data available"]